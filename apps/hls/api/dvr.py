@@ -0,0 +1,70 @@
+import datetime
+import hashlib
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.dateparse import parse_datetime
+
+from apps.hls.api.playlists import PLAYLIST_CONTENT_TYPE
+from apps.hls.logic.interactors.dvr import dvr__render_playlist
+from apps.hls.logic.interactors.playback_token import PLAYBACK_TOKEN_PARAM, playback_token__issue
+from apps.hls.logic.interactors.viewer import viewer__user_id
+from apps.hls.logic.selectors.segment import segment__archived_window
+from utils.asgi import Request, Response
+
+ARCHIVE_URI_PREFIX = '/hls/archive/'
+
+
+def dvr__parse_time(value: str) -> datetime.datetime:
+    """Unix timestamp or ISO 8601, raises ValueError."""
+    try:
+        return datetime.datetime.fromtimestamp(float(value), tz=datetime.timezone.utc)
+    except ValueError:
+        parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=datetime.timezone.utc)
+
+
+async def dvr_playlist(request: Request, stream: str) -> Response:
+    """
+    `?from=&to=` VOD playlist of the window, without `to` a sliding DVR playlist up to now.
+    """
+    user_id = await viewer__user_id(request=request)
+    if user_id is None:
+        return Response(status=401)
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
+    try:
+        started_from = dvr__parse_time(request.query['from'])
+        started_to = dvr__parse_time(request.query['to']) if 'to' in request.query else now
+    except (KeyError, ValueError, OverflowError):
+        return Response(status=400)
+    window = started_to - started_from
+    if window <= datetime.timedelta(0) or window.total_seconds() > settings.HLS_DVR_MAX_WINDOW:
+        return Response(status=400)
+    segments = await sync_to_async(segment__archived_window, thread_sensitive=False)(
+        stream=stream, started_from=started_from, started_to=started_to
+    )
+    ended = started_to < now
+    # a VOD playlist is not reloaded, its token has to outlive watching the whole window
+    token_ttl = settings.HLS_PLAYBACK_TOKEN_TTL + (int(window.total_seconds()) if ended else 0)
+    token = playback_token__issue(stream=stream, user_id=user_id, ttl=token_ttl)
+    body = dvr__render_playlist(
+        segments=segments,
+        uri_prefix=ARCHIVE_URI_PREFIX,
+        ended=ended,
+        uri_suffix=f'?{PLAYBACK_TOKEN_PARAM}={token}',
+    )
+    return Response(
+        body=body,
+        headers=[
+            ('etag', f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'),
+            ('cache-control', 'no-cache'),
+        ],
+        content_type=PLAYLIST_CONTENT_TYPE,
+    )
+
+
+dvr_routes = [
+    ('GET', r'/hls/dvr/(?P<stream>[^/]+)\.m3u8', dvr_playlist),
+]
@@ -0,0 +1,82 @@
+import time
+
+from asgiref.sync import sync_to_async
+
+from apps.hls.dto.health import StreamHealthDto
+from apps.hls.logic.selectors.health import health__stream, health__streams
+from apps.user.logic.interactors.internal import internal__authorized
+from utils.asgi import Request, Response, json_response
+
+METRICS_CONTENT_TYPE = 'text/plain; version=0.0.4'
+# (name, type, help, value of a snapshot entry)
+HEALTH_METRICS = [
+    ('hls_stream_bitrate_bps', 'gauge', 'Bitrate over the health window.', lambda health, now: health.bitrate),
+    (
+        'hls_stream_segment_duration_seconds', 'gauge', 'Mean segment duration over the health window.',
+        lambda health, now: health.duration_mean,
+    ),
+    (
+        'hls_stream_segment_duration_variance', 'gauge', 'Segment duration variance over the health window.',
+        lambda health, now: health.duration_variance,
+    ),
+    (
+        'hls_stream_arrival_jitter_seconds', 'gauge', 'Standard deviation of segment arrival lateness.',
+        lambda health, now: health.jitter,
+    ),
+    (
+        'hls_stream_last_segment_age_seconds', 'gauge', 'Seconds since the last segment was closed.',
+        lambda health, now: max(now - health.last_segment_at, 0),
+    ),
+    (
+        'hls_stream_stalled', 'gauge', '1 when the stream stopped producing segments.',
+        lambda health, now: int(health.stalled),
+    ),
+]
+
+
+def health__label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def health__render_metrics(*, snapshot: list[StreamHealthDto], now: float) -> bytes:
+    """Prometheus text exposition format of the health snapshot."""
+    lines = []
+    for name, metric_type, help_text, value in HEALTH_METRICS:
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {metric_type}')
+        lines.extend(
+            f'{name}{{stream="{health__label(health.stream)}"}} {value(health, now)}' for health in snapshot
+        )
+    return ('\n'.join(lines) + '\n').encode()
+
+
+async def stream_health_list(request: Request) -> Response:
+    if not await internal__authorized(request=request):
+        return Response(status=401)
+    snapshot = await sync_to_async(health__streams, thread_sensitive=False)()
+    return json_response({'data': [health.dict() for health in snapshot]})
+
+
+async def stream_health(request: Request, stream: str) -> Response:
+    if not await internal__authorized(request=request):
+        return Response(status=401)
+    health = await sync_to_async(health__stream, thread_sensitive=False)(stream=stream)
+    if health is None:
+        return Response(status=404)
+    return json_response({'data': health.dict()})
+
+
+async def stream_health_metrics(request: Request) -> Response:
+    if not await internal__authorized(request=request):
+        return Response(status=401)
+    snapshot = await sync_to_async(health__streams, thread_sensitive=False)()
+    return Response(
+        body=health__render_metrics(snapshot=snapshot, now=time.time()), content_type=METRICS_CONTENT_TYPE
+    )
+
+
+health_routes = [
+    ('GET', r'/hls/health/?', stream_health_list),
+    ('GET', r'/hls/health/(?P<stream>[^/]+)', stream_health),
+    ('GET', r'/hls/metrics', stream_health_metrics),
+]
@@ -0,0 +1,114 @@
+import hashlib
+from email.utils import parsedate_to_datetime
+
+from apps.hls.logic.interactors.playback_token import PLAYBACK_TOKEN_PARAM, playback_token__issue
+from apps.hls.logic.interactors.viewer import viewer__user_id
+from apps.hls.logic.playlist import RenderedPlaylist, playlist_service
+from utils.asgi import Request, Response
+
+PLAYLIST_CONTENT_TYPE = 'application/vnd.apple.mpegurl'
+# LL-HLS: a request more than two segments ahead of the live edge is answered with 400
+MAX_MSN_AHEAD = 2
+# LL-HLS: hold a blocking request for at most three target durations
+BLOCKING_RELOAD_TIMEOUT_FACTOR = 3
+
+
+def playlist__blocking_msn(request: Request) -> int | None:
+    """
+    Media sequence number awaited by a blocking reload, parts map onto segments one to one,
+    so `_HLS_part` above 0 waits for the next segment. Raises ValueError for malformed directives.
+    """
+    msn = request.query.get('_HLS_msn')
+    part = request.query.get('_HLS_part')
+    if msn is None:
+        if part is not None:
+            raise ValueError('_HLS_part without _HLS_msn')
+        return None
+    msn = int(msn)
+    part = int(part) if part is not None else 0
+    if msn < 0 or part < 0:
+        raise ValueError('negative _HLS_msn or _HLS_part')
+    return msn + 1 if part > 0 else msn
+
+
+def playlist__token_etag(*, etag: str, token: str) -> str:
+    return f'{etag[:-1]}.{hashlib.blake2b(token.encode(), digest_size=4).hexdigest()}"'
+
+
+def playlist__not_modified(*, request: Request, etag: str, updated_at: float) -> bool:
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        return etag in (tag.strip() for tag in if_none_match.split(','))
+    if_modified_since = request.headers.get('if-modified-since')
+    if if_modified_since is not None:
+        try:
+            return parsedate_to_datetime(if_modified_since).timestamp() >= int(updated_at)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def master_playlist(*, request: Request, rendered: RenderedPlaylist) -> Response:
+    """Renditions of a multi-bitrate stream, their URIs carry no token: each media playlist issues its own."""
+    headers = [
+        ('etag', rendered.etag),
+        ('last-modified', rendered.last_modified),
+        ('cache-control', 'no-cache'),
+    ]
+    if playlist__not_modified(request=request, etag=rendered.etag, updated_at=rendered.updated_at):
+        return Response(status=304, headers=headers)
+    return Response(body=rendered.body, headers=headers, content_type=PLAYLIST_CONTENT_TYPE)
+
+
+async def media_playlist(request: Request, stream: str) -> Response:
+    user_id = await viewer__user_id(request=request)
+    if user_id is None:
+        return Response(status=401)
+    try:
+        msn = playlist__blocking_msn(request)
+    except ValueError:
+        return Response(status=400)
+    playlist = playlist_service.get_playlist(stream)
+    if playlist is None:
+        master = playlist_service.get_master(stream)
+        if master is not None and msn is None:
+            return master_playlist(request=request, rendered=master)
+    if playlist is None or playlist.rendered is None:
+        return Response(status=404)
+    cache_control = 'no-cache'
+    if msn is None:
+        rendered = playlist.rendered
+    else:
+        if msn > playlist.last_sequence + MAX_MSN_AHEAD:
+            return Response(status=400)
+        rendered = await playlist_service.wait(
+            stream=stream,
+            msn=msn,
+            timeout=max(playlist.target_duration, 1) * BLOCKING_RELOAD_TIMEOUT_FACTOR,
+        )
+        if rendered is None:
+            return Response(status=503 if stream in playlist_service.playlists else 404)
+        # the answer to a given _HLS_msn never changes, but the body carries the viewer's playback token,
+        # so only the player's own cache may keep it
+        cache_control = f'private, max-age={max(playlist.target_duration, 1) * 6}'
+    # segment URIs carry the viewer's playback token, checked by nginx auth_request
+    token = playback_token__issue(stream=stream, user_id=user_id)
+    etag = playlist__token_etag(etag=rendered.etag, token=token)
+    headers = [
+        ('etag', etag),
+        ('last-modified', rendered.last_modified),
+        ('cache-control', cache_control),
+    ]
+    if playlist__not_modified(request=request, etag=etag, updated_at=rendered.updated_at):
+        return Response(status=304, headers=headers)
+    return Response(
+        body=rendered.with_uri_suffix(f'?{PLAYBACK_TOKEN_PARAM}={token}'.encode()),
+        headers=headers,
+        content_type=PLAYLIST_CONTENT_TYPE,
+    )
+
+
+playlist_routes = [
+    ('GET', r'/hls/(?P<stream>[^/]+)\.m3u8', media_playlist),
+    ('GET', r'/hls/(?P<stream>[^/]+)/index\.m3u8', media_playlist),
+]
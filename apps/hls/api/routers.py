@@ -0,0 +1,26 @@
+from apps.hls.api.dvr import dvr_routes
+from apps.hls.api.health import health_routes
+from apps.hls.api.playlists import playlist_routes
+from apps.hls.api.segments import segment_routes
+from apps.hls.logic.playlist import playlist_service
+from apps.hls.logic.segments import hot_segment_cache
+from apps.hls.logic.watcher import hls_watcher
+from utils.asgi import Router
+
+
+async def hls__startup() -> None:
+    hls_watcher.subscribe(playlist_service)
+    hls_watcher.subscribe(hot_segment_cache)
+    hls_watcher.start()
+
+
+async def hls__shutdown() -> None:
+    hls_watcher.stop()
+
+
+hls_router = Router([
+    *dvr_routes,
+    *health_routes,
+    *playlist_routes,
+    *segment_routes,
+])
@@ -0,0 +1,112 @@
+import os
+from urllib.parse import parse_qsl, urlsplit
+
+from django.conf import settings
+
+from apps.hls.logic.interactors.archive import archive__stream
+from apps.hls.logic.interactors.playback_token import PLAYBACK_TOKEN_PARAM, playback_token__verify
+from apps.hls.logic.interactors.viewer import viewer__user_id
+from apps.hls.logic.segments import hot_segment_cache
+from apps.hls.logic.watcher import hls__stream_name
+from utils.asgi import FileResponse, Request, Response
+
+SEGMENT_CONTENT_TYPE = 'video/mp2t'
+ZEROCOPY_EXTENSION = 'http.response.zerocopysend'
+
+
+def segment__stream(*, relative_path: str) -> str:
+    """Stream of a segment path relative to /hls/: live flat or nested layout, or `archive/<shard>/<stream>/...`."""
+    head, _, tail = relative_path.partition('/')
+    if head == 'archive':
+        return archive__stream(archive_path=tail)
+    return hls__stream_name(path=os.path.join(settings.HLS_PATH, relative_path))
+
+
+async def segment__authorized(*, request: Request, stream: str) -> bool:
+    token = request.query.get(PLAYBACK_TOKEN_PARAM)
+    if token is not None and playback_token__verify(stream=stream, token=token):
+        return True
+    return await viewer__user_id(request=request) is not None
+
+
+async def playback_auth(request: Request) -> Response:
+    """
+    nginx auth_request subrequest for segments served straight from disk,
+    the original request URI comes in X-Original-URI. Token verification only, no I/O.
+    """
+    uri = urlsplit(request.headers.get('x-original-uri', ''))
+    if not uri.path.startswith('/hls/'):
+        return Response(status=403)
+    token = dict(parse_qsl(uri.query)).get(PLAYBACK_TOKEN_PARAM)
+    stream = segment__stream(relative_path=uri.path[len('/hls/'):])
+    if token is None or not playback_token__verify(stream=stream, token=token):
+        return Response(status=403)
+    return Response(status=204)
+
+
+def segment__file_response(
+        *,
+        request: Request,
+        root: str,
+        relative_path: str,
+        accel_redirect: str,
+        headers: list[tuple[str, str]],
+) -> Response:
+    if accel_redirect:
+        # nginx serves the file itself (sendfile) from an internal location
+        return Response(
+            headers=[*headers, ('x-accel-redirect', f'{accel_redirect}{relative_path}')],
+            content_type=SEGMENT_CONTENT_TYPE,
+        )
+    path = os.path.join(root, relative_path)
+    if not os.path.isfile(path):
+        return Response(status=404)
+    return FileResponse(
+        path,
+        zerocopy=ZEROCOPY_EXTENSION in request.scope.get('extensions', {}),
+        headers=headers,
+        content_type=SEGMENT_CONTENT_TYPE,
+    )
+
+
+async def media_segment(request: Request, segment: str, stream: str | None = None) -> Response:
+    relative_path = os.path.join(stream, segment) if stream else segment
+    if not await segment__authorized(request=request, stream=segment__stream(relative_path=relative_path)):
+        return Response(status=401)
+    headers = [('cache-control', 'max-age=60')]
+    if not settings.HLS_SEGMENT_ACCEL_REDIRECT:
+        path = os.path.join(settings.HLS_PATH, relative_path)
+        body = hot_segment_cache.get(hls__stream_name(path=path), path)
+        if body is not None:
+            return Response(body=body, headers=headers, content_type=SEGMENT_CONTENT_TYPE)
+    return segment__file_response(
+        request=request,
+        root=settings.HLS_PATH,
+        relative_path=relative_path,
+        accel_redirect=settings.HLS_SEGMENT_ACCEL_REDIRECT,
+        headers=headers,
+    )
+
+
+async def archived_segment(request: Request, archive_path: str) -> Response:
+    if '..' in archive_path.split('/'):
+        return Response(status=404)
+    stream = segment__stream(relative_path=f'archive/{archive_path}')
+    if not await segment__authorized(request=request, stream=stream):
+        return Response(status=401)
+    return segment__file_response(
+        request=request,
+        root=settings.HLS_ARCHIVE_PATH,
+        relative_path=archive_path,
+        accel_redirect=settings.HLS_ARCHIVE_ACCEL_REDIRECT,
+        # archived segments never change
+        headers=[('cache-control', 'public, max-age=31536000, immutable')],
+    )
+
+
+segment_routes = [
+    ('GET', r'/hls/auth', playback_auth),
+    ('GET', r'/hls/archive/(?P<archive_path>[^/][^?#]*\.ts)', archived_segment),
+    ('GET', r'/hls/(?P<segment>[^/]+\.ts)', media_segment),
+    ('GET', r'/hls/(?P<stream>[^/]+)/(?P<segment>[^/]+\.ts)', media_segment),
+]
@@ -0,0 +1,14 @@
+HLS_HEALTH_KEY = 'hls:health'  # hash stream name -> StreamHealthDto json, replaced on every snapshot
+
+# delivery counters from the nginx access log, flushed into StreamDelivery as absolute values
+DELIVERY_MINUTES_KEY = 'hls:delivery:minutes'  # zset of minutes to flush, score = last record time
+DELIVERY_BYTES_KEY = 'hls:delivery:bytes:{minute}'  # hash stream -> bytes served in the minute
+DELIVERY_REQUESTS_KEY = 'hls:delivery:requests:{minute}'  # hash stream -> segment requests in the minute
+DELIVERY_VIEWERS_KEY = 'hls:delivery:viewers:{stream}:{minute}'  # HyperLogLog of viewers in the minute
+DELIVERY_LOG_OFFSETS_KEY = 'hls:delivery:log_offsets'  # hash log path -> `<inode>:<offset>` consumed
+
+# archive storage accounting by hourly bucket (`<shard>/<stream>/<YYYY>/<MM>/<DD>/<HH>`), kept without directory scans
+STORAGE_BUCKETS_KEY = 'hls:storage:buckets'  # zset bucket -> last access time, LRU order of the whole archive
+STORAGE_STREAM_BUCKETS_KEY = 'hls:storage:buckets:{stream}'  # zset bucket -> last access time, of one stream
+STORAGE_BUCKET_SIZES_KEY = 'hls:storage:bucket_sizes'  # hash bucket -> archived bytes
+STORAGE_STREAM_SIZES_KEY = 'hls:storage:stream_sizes'  # hash stream -> archived bytes
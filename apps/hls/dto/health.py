@@ -0,0 +1,12 @@
+from utils.dto import BaseDto
+
+
+class StreamHealthDto(BaseDto):
+    stream: str
+    segments: int  # segments in the window
+    bitrate: int  # bits per second over the window
+    duration_mean: float
+    duration_variance: float
+    jitter: float  # standard deviation of arrival interval minus segment duration, seconds
+    last_segment_at: float
+    stalled: bool
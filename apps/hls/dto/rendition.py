@@ -0,0 +1,9 @@
+from utils.dto import BaseDto
+
+
+class RenditionDto(BaseDto):
+    name: str  # stream name of the variant, `<stream><hls_variant suffix>`
+    bandwidth: int  # peak bits per second
+    average_bandwidth: int | None
+    resolution: str | None  # `<width>x<height>`
+    codecs: str | None  # RFC 6381 codecs list
@@ -0,0 +1,21 @@
+from utils.dto import BaseDto
+
+
+class SegmentIndexDto(BaseDto):
+    stream: str
+    sequence: int
+    name: str
+    size: int
+    duration: float
+    bitrate: int
+    first_pts: int
+    last_pts: int
+    closed_at: float
+    keyframe_offsets: list[int]
+    keyframe_pts: list[int]
+    packets: int
+    lost_sync: int
+
+    @property
+    def started_at(self) -> float:
+        return self.closed_at - self.duration
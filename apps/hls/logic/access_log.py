@@ -0,0 +1,97 @@
+import os
+import time
+import typing
+
+import structlog
+
+from apps.hls.logic.interactors.delivery import (
+    DeliveryCounters,
+    delivery__count_lines,
+    delivery__log_offset,
+    delivery__record,
+)
+
+logger = structlog.get_logger(__name__)
+
+
+class AccessLogTailer:
+    """
+    Follows an nginx access log like `tail -F`: large reads, complete lines only, counted in batches
+    and recorded with one redis transaction per batch together with the consumed offset.
+    Rotation is noticed by a new inode or a shrunk file, the rest of the old file is drained first.
+    """
+
+    read_size = 1 << 20
+    poll_interval = 0.2
+
+    def __init__(self, *, path: str, batch_lines: int = 50000, max_delay: float = 1.0) -> None:
+        self.path = path
+        self.batch_lines = batch_lines
+        self.max_delay = max_delay
+        self._file: typing.BinaryIO | None = None
+        self._inode = 0
+        self._offset = 0  # end of the last complete line read
+
+    def _open(self, *, resume: bool) -> bool:
+        try:
+            log_file = open(self.path, 'rb')
+        except FileNotFoundError:
+            return False
+        stat = os.fstat(log_file.fileno())
+        offset = 0
+        if resume:
+            saved = delivery__log_offset(log_path=self.path)
+            if saved is not None and saved[0] == stat.st_ino and saved[1] <= stat.st_size:
+                offset = saved[1]
+        log_file.seek(offset)
+        self._file, self._inode, self._offset = log_file, stat.st_ino, offset
+        return True
+
+    def _rotated(self) -> bool:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        return stat.st_ino != self._inode or stat.st_size < self._offset
+
+    def _record(self, counters: DeliveryCounters) -> None:
+        delivery__record(counters=counters, log_path=self.path, inode=self._inode, offset=self._offset)
+        logger.debug('access_log.batch_recorded', lines=counters.lines, skipped=counters.skipped)
+
+    def run_forever(self) -> None:
+        while not self._open(resume=True):
+            time.sleep(self.poll_interval)
+        counters = DeliveryCounters()
+        batch_started_at = time.monotonic()
+        pending = b''
+        while True:
+            chunk = self._file.read(self.read_size)
+            if chunk:
+                pending += chunk
+                end = pending.rfind(b'\n')
+                if end >= 0:
+                    lines = pending[:end].split(b'\n')
+                    self._offset += end + 1
+                    pending = pending[end + 1:]
+                    delivery__count_lines(lines=lines, counters=counters)
+            if counters.lines and (
+                counters.lines >= self.batch_lines or time.monotonic() - batch_started_at >= self.max_delay
+            ):
+                self._record(counters)
+                counters = DeliveryCounters()
+                batch_started_at = time.monotonic()
+            if chunk:
+                continue
+            if self._rotated():
+                # everything before the rotation has been read, a partial last line is dropped
+                if counters.lines:
+                    self._record(counters)
+                    counters = DeliveryCounters()
+                self._file.close()
+                while not self._open(resume=False):
+                    time.sleep(self.poll_interval)
+                pending = b''
+                continue
+            time.sleep(self.poll_interval)
+            if not counters.lines:
+                batch_started_at = time.monotonic()
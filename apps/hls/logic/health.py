@@ -0,0 +1,117 @@
+import threading
+import time
+
+import numpy as np
+import structlog
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+
+from apps.hls.constants import HLS_HEALTH_KEY
+from apps.hls.dto.health import StreamHealthDto
+from apps.hls.dto.segment import SegmentIndexDto
+
+logger = structlog.get_logger(__name__)
+
+
+class SegmentWindow:
+    """Fixed-size ring buffers of the last segments of one stream, memory does not grow with uptime."""
+
+    __slots__ = ('arrivals', 'durations', 'sizes', 'count', 'position')
+
+    def __init__(self, *, size: int) -> None:
+        self.arrivals = np.zeros(size, dtype=np.float64)
+        self.durations = np.zeros(size, dtype=np.float64)
+        self.sizes = np.zeros(size, dtype=np.int64)
+        self.count = 0
+        self.position = 0
+
+    def push(self, *, arrival: float, duration: float, size: int) -> None:
+        self.arrivals[self.position] = arrival
+        self.durations[self.position] = duration
+        self.sizes[self.position] = size
+        self.position = (self.position + 1) % len(self.arrivals)
+        self.count = min(self.count + 1, len(self.arrivals))
+
+    def ordered(self, values: np.ndarray) -> np.ndarray:
+        if self.count < len(values):
+            return values[:self.count]
+        return np.roll(values, -self.position)
+
+    @property
+    def last_arrival(self) -> float:
+        return float(self.arrivals[self.position - 1]) if self.count else 0.0
+
+
+class StreamHealthMonitor:
+    """
+    Rolling per-stream health from indexed segments: bitrate, segment duration variance and
+    arrival jitter. A stream is stalled when no segment arrived for stall_factor mean durations.
+    Streams silent for forget_after seconds are dropped.
+    """
+
+    def __init__(self, *, window: int, stall_factor: float, forget_after: float) -> None:
+        self.window = window
+        self.stall_factor = stall_factor
+        self.forget_after = forget_after
+        self._streams: dict[str, SegmentWindow] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, indexes: list[SegmentIndexDto]) -> None:
+        with self._lock:
+            for index in sorted(indexes, key=lambda index: index.closed_at):
+                window = self._streams.get(index.stream)
+                if window is None:
+                    window = self._streams[index.stream] = SegmentWindow(size=self.window)
+                window.push(arrival=index.closed_at, duration=index.duration, size=index.size)
+
+    def health(self, *, stream: str, window: SegmentWindow, now: float) -> StreamHealthDto:
+        arrivals = window.ordered(window.arrivals)
+        durations = window.ordered(window.durations)
+        sizes = window.ordered(window.sizes)
+        total_duration = float(durations.sum())
+        duration_mean = float(durations.mean())
+        # a segment should close one segment duration after the previous one
+        lateness = np.diff(arrivals) - durations[1:]
+        return StreamHealthDto(
+            stream=stream,
+            segments=window.count,
+            bitrate=int(sizes.sum() * 8 / total_duration) if total_duration > 0 else 0,
+            duration_mean=duration_mean,
+            duration_variance=float(durations.var()),
+            jitter=float(lateness.std()) if lateness.size else 0.0,
+            last_segment_at=window.last_arrival,
+            stalled=now - window.last_arrival > max(duration_mean, 1.0) * self.stall_factor,
+        )
+
+    def snapshot(self, now: float | None = None) -> list[StreamHealthDto]:
+        now = time.time() if now is None else now
+        with self._lock:
+            for stream in [
+                stream for stream, window in self._streams.items()
+                if now - window.last_arrival > self.forget_after
+            ]:
+                del self._streams[stream]
+            return [self.health(stream=stream, window=window, now=now) for stream, window in self._streams.items()]
+
+    def publish(self) -> None:
+        """Replaces the redis snapshot atomically, a reader never sees a half-written one."""
+        snapshot = self.snapshot()
+        try:
+            connection = get_redis_connection('redis')
+            if not snapshot:
+                connection.delete(HLS_HEALTH_KEY)
+                return
+            staging_key = f'{HLS_HEALTH_KEY}:staging'
+            pipeline = connection.pipeline()
+            pipeline.delete(staging_key)
+            pipeline.hset(staging_key, mapping={health.stream: health.json() for health in snapshot})
+            pipeline.rename(staging_key, HLS_HEALTH_KEY)
+            pipeline.execute()
+        except RedisError:
+            logger.warning('stream_health.publish_failed', streams=len(snapshot))
+
+    def publish_forever(self, *, interval: float) -> None:
+        while True:
+            started_at = time.monotonic()
+            self.publish()
+            time.sleep(max(interval - (time.monotonic() - started_at), 0))
@@ -0,0 +1,60 @@
+import queue
+import time
+import typing
+
+import structlog
+from django.db import close_old_connections
+
+from apps.hls.dto.segment import SegmentIndexDto
+from apps.hls.logic.interactors.segment import segment__index_many
+from apps.hls.logic.watcher import HlsListener
+
+logger = structlog.get_logger(__name__)
+
+
+class SegmentIndexer(HlsListener):
+    """
+    Collects closed segments from the watcher thread and indexes them in batches,
+    one upsert per batch keeps up with hundreds of streams cutting a segment every couple of seconds.
+    """
+
+    def __init__(
+            self,
+            *,
+            batch_size: int = 500,
+            max_delay: float = 1.0,
+            on_indexed: typing.Callable[[list[SegmentIndexDto]], None] | None = None,
+    ) -> None:
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.on_indexed = on_indexed
+        self._paths: queue.Queue[str] = queue.Queue()
+
+    def on_segment_closed(self, stream: str, path: str) -> None:
+        self._paths.put(path)
+
+    def next_batch(self) -> list[str]:
+        batch = [self._paths.get()]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self._paths.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def run_forever(self) -> None:
+        while True:
+            batch = self.next_batch()
+            close_old_connections()
+            try:
+                indexes = segment__index_many(paths=batch)
+            except Exception:
+                logger.exception('segment_indexer.batch_failed', size=len(batch))
+                continue
+            logger.debug('segment_indexer.batch_indexed', size=len(batch), indexed=len(indexes))
+            if self.on_indexed is not None and indexes:
+                self.on_indexed(indexes)
@@ -0,0 +1,79 @@
+import datetime
+import errno
+import hashlib
+import os
+import shutil
+
+import structlog
+from django.conf import settings
+
+logger = structlog.get_logger(__name__)
+
+
+def archive__shard(*, stream: str) -> str:
+    """One of 256 top-level directories, so no directory of the archive grows with the number of streams."""
+    return hashlib.blake2b(stream.encode(), digest_size=1).hexdigest()
+
+
+def archive__relative_path(*, stream: str, name: str, started_at: float) -> str:
+    """Hourly buckets per stream under its shard: `<shard>/<stream>/<YYYY>/<MM>/<DD>/<HH>/<name>`."""
+    started = datetime.datetime.fromtimestamp(started_at, tz=datetime.timezone.utc)
+    return os.path.join(archive__shard(stream=stream), stream, started.strftime('%Y/%m/%d/%H'), name)
+
+
+def archive__stream(*, archive_path: str) -> str:
+    """Stream of an archived segment or bucket path, segments archived before sharding have no shard in front."""
+    parts = archive_path.split('/')
+    # `<YYYY>` follows the stream, it is never the two hex digits of a shard
+    if len(parts) > 2 and len(parts[2]) == 4 and parts[2].isdigit():
+        return parts[1]
+    return parts[0]
+
+
+def archive__bucket(*, archive_path: str) -> str:
+    """The hourly directory of an archived segment, the unit of quotas and eviction."""
+    return archive_path.rpartition('/')[0]
+
+
+def archive__is_same(*, path: str, archive_path: str) -> bool:
+    """Whether the archived file is this segment: a hard link of it, or a copy2 keeping its size and mtime."""
+    try:
+        if os.path.samefile(path, archive_path):
+            return True
+        source, target = os.stat(path), os.stat(archive_path)
+    except OSError:
+        return False
+    return source.st_size == target.st_size and source.st_mtime == target.st_mtime
+
+
+def archive__segment(*, path: str, stream: str, name: str, started_at: float) -> tuple[str, bool] | None:
+    """
+    Keeps a segment past nginx-rtmp cleanup by hard-linking it into HLS_ARCHIVE_PATH,
+    nginx then only drops its own link. Falls back to a copy across filesystems.
+    Returns the path relative to the archive and whether the segment was archived just now.
+    """
+    if not settings.HLS_ARCHIVE_PATH:
+        return None
+    stem, extension = os.path.splitext(name)
+    # nginx-rtmp restarts sequence numbers, and so fragment names, when a stream is republished,
+    # a name taken by an earlier broadcast gets the start time appended
+    names = (name, f'{stem}-{int(started_at * 1000)}{extension}')
+    for candidate in names:
+        relative_path = archive__relative_path(stream=stream, name=candidate, started_at=started_at)
+        archive_path = os.path.join(settings.HLS_ARCHIVE_PATH, relative_path)
+        os.makedirs(os.path.dirname(archive_path), exist_ok=True)
+        if os.path.lexists(archive_path):
+            if archive__is_same(path=path, archive_path=archive_path):
+                # re-indexed, already accounted for by the storage
+                return relative_path, False
+            continue
+        try:
+            os.link(path, archive_path)
+        except OSError as error:
+            if error.errno != errno.EXDEV:
+                logger.warning('archive.segment_failed', path=path, error=str(error))
+                return None
+            shutil.copy2(path, archive_path)
+        return relative_path, True
+    logger.warning('archive.segment_name_taken', path=path, names=names)
+    return None
@@ -0,0 +1,179 @@
+import datetime
+import time
+
+import pgbulk
+from django.conf import settings
+from django_redis import get_redis_connection
+
+from apps.hls.constants import (
+    DELIVERY_BYTES_KEY,
+    DELIVERY_LOG_OFFSETS_KEY,
+    DELIVERY_MINUTES_KEY,
+    DELIVERY_REQUESTS_KEY,
+    DELIVERY_VIEWERS_KEY,
+)
+from apps.hls.logic.interactors.archive import archive__bucket, archive__stream
+from apps.hls.logic.interactors.storage import storage__touch
+from apps.hls.models import StreamDelivery
+
+# `log_format hls_delivery` in rtmp_server/nginx.conf: $msec $status $body_bytes_sent $request_uri $remote_addr $arg_t
+DELIVERY_LOG_FIELDS = 6
+DELIVERED_STATUSES = frozenset({b'200', b'206'})
+ARCHIVE_URI_PREFIX = b'/hls/archive/'
+
+
+class DeliveryCounters:
+    """Per (stream, minute) counters of a batch of log lines, merged in memory before one redis round trip."""
+
+    __slots__ = ('bytes_sent', 'requests', 'viewers', 'archive_accesses', 'lines', 'skipped')
+
+    def __init__(self) -> None:
+        self.bytes_sent: dict[tuple[str, int], int] = {}
+        self.requests: dict[tuple[str, int], int] = {}
+        self.viewers: dict[tuple[str, int], set[bytes]] = {}
+        # archive bucket -> last access, the LRU order of the archive storage
+        self.archive_accesses: dict[str, float] = {}
+        self.lines = 0
+        self.skipped = 0
+
+
+def delivery__stream(*, uri: bytes) -> str | None:
+    """Stream of a segment URI: `/hls/<stream>-<n>.ts`, `/hls/<stream>/<n>.ts` or `/hls/archive/...`."""
+    uri = uri.partition(b'?')[0]
+    if not uri.startswith(b'/hls/') or not uri.endswith(b'.ts'):
+        return None
+    if uri.startswith(ARCHIVE_URI_PREFIX):
+        return archive__stream(archive_path=uri[len(ARCHIVE_URI_PREFIX):].decode(errors='replace')) or None
+    relative = uri[5:]
+    if b'/' in relative:
+        stream = relative.partition(b'/')[0]
+    else:
+        stream = relative[:-3].rpartition(b'-')[0]
+    return stream.decode(errors='replace') if stream else None
+
+
+def delivery__viewer(*, addr: bytes, token: bytes) -> bytes:
+    """Playback tokens carry the user id (`<kid>.<expires>.<user id>.<signature>`), the address is the fallback."""
+    parts = token.split(b'.')
+    if len(parts) == 4 and parts[2]:
+        return b'u:' + parts[2]
+    return b'a:' + addr
+
+
+def delivery__count_lines(*, lines: list[bytes], counters: DeliveryCounters) -> None:
+    bytes_sent = counters.bytes_sent
+    requests = counters.requests
+    viewers = counters.viewers
+    archive_accesses = counters.archive_accesses
+    for line in lines:
+        fields = line.split(b'\t')
+        if len(fields) != DELIVERY_LOG_FIELDS:
+            counters.skipped += 1
+            continue
+        msec, status, body_bytes, uri, addr, token = fields
+        if status not in DELIVERED_STATUSES:
+            continue
+        stream = delivery__stream(uri=uri)
+        if stream is None:
+            continue
+        try:
+            delivered_at = float(msec)
+            size = int(body_bytes)
+        except ValueError:
+            counters.skipped += 1
+            continue
+        key = (stream, int(delivered_at) // 60 * 60)
+        if uri.startswith(ARCHIVE_URI_PREFIX):
+            archive_path = uri.partition(b'?')[0][len(ARCHIVE_URI_PREFIX):].decode(errors='replace')
+            bucket = archive__bucket(archive_path=archive_path)
+            if archive_accesses.get(bucket, 0) < delivered_at:
+                archive_accesses[bucket] = delivered_at
+        bytes_sent[key] = bytes_sent.get(key, 0) + size
+        requests[key] = requests.get(key, 0) + 1
+        key_viewers = viewers.get(key)
+        if key_viewers is None:
+            key_viewers = viewers[key] = set()
+        key_viewers.add(delivery__viewer(addr=addr, token=token))
+    counters.lines += len(lines)
+
+
+def delivery__record(*, counters: DeliveryCounters, log_path: str, inode: int, offset: int) -> None:
+    """
+    Adds the batch to the shared redis counters and the archive access times and moves the log offset
+    in the same transaction, a restarted tailer resumes right after the last recorded batch.
+    """
+    ttl = settings.HLS_DELIVERY_COUNTERS_TTL
+    recorded_at = time.time()
+    pipeline = get_redis_connection('redis').pipeline()
+    minutes = {}
+    for (stream, minute), size in counters.bytes_sent.items():
+        bytes_key = DELIVERY_BYTES_KEY.format(minute=minute)
+        requests_key = DELIVERY_REQUESTS_KEY.format(minute=minute)
+        viewers_key = DELIVERY_VIEWERS_KEY.format(stream=stream, minute=minute)
+        pipeline.hincrby(bytes_key, stream, size)
+        pipeline.hincrby(requests_key, stream, counters.requests[(stream, minute)])
+        pipeline.pfadd(viewers_key, *counters.viewers[(stream, minute)])
+        pipeline.expire(viewers_key, ttl)
+        if minute not in minutes:
+            minutes[minute] = recorded_at
+            pipeline.expire(bytes_key, ttl)
+            pipeline.expire(requests_key, ttl)
+    if minutes:
+        pipeline.zadd(DELIVERY_MINUTES_KEY, minutes)
+    storage__touch(pipeline=pipeline, accesses=counters.archive_accesses)
+    pipeline.hset(DELIVERY_LOG_OFFSETS_KEY, log_path, f'{inode}:{offset}')
+    pipeline.execute()
+
+
+def delivery__log_offset(*, log_path: str) -> tuple[int, int] | None:
+    """(inode, offset) consumed of the log, None for a log never read."""
+    value = get_redis_connection('redis').hget(DELIVERY_LOG_OFFSETS_KEY, log_path)
+    if value is None:
+        return None
+    inode, _, offset = value.decode().partition(':')
+    return int(inode), int(offset)
+
+
+def delivery__flush(*, settle: int = 300, now: float | None = None) -> int:
+    """
+    Writes the redis counters of every pending minute into StreamDelivery. Rows are upserted with
+    absolute values, so a minute can be flushed any number of times while late lines still arrive;
+    it leaves the pending set once no line was recorded for it in settle seconds.
+    """
+    now = time.time() if now is None else now
+    connection = get_redis_connection('redis')
+    minutes = [int(minute) for minute in connection.zrange(DELIVERY_MINUTES_KEY, 0, -1)]
+    if not minutes:
+        return 0
+    pipeline = connection.pipeline(transaction=False)
+    for minute in minutes:
+        pipeline.hgetall(DELIVERY_BYTES_KEY.format(minute=minute))
+        pipeline.hgetall(DELIVERY_REQUESTS_KEY.format(minute=minute))
+    counters = pipeline.execute()
+    rows = []
+    for index, minute in enumerate(minutes):
+        bytes_sent, requests = counters[2 * index], counters[2 * index + 1]
+        for stream, size in bytes_sent.items():
+            rows.append((stream.decode(), minute, int(size), int(requests.get(stream, 0))))
+    pipeline = connection.pipeline(transaction=False)
+    for stream, minute, _, _ in rows:
+        pipeline.pfcount(DELIVERY_VIEWERS_KEY.format(stream=stream, minute=minute))
+    viewers = pipeline.execute()
+    if rows:
+        pgbulk.upsert(
+            queryset=StreamDelivery,
+            model_objs=[
+                StreamDelivery(
+                    stream=stream,
+                    minute=datetime.datetime.fromtimestamp(minute, tz=datetime.timezone.utc),
+                    bytes_sent=size,
+                    requests=requests,
+                    viewers=minute_viewers,
+                )
+                for (stream, minute, size, requests), minute_viewers in zip(rows, viewers)
+            ],
+            unique_fields=['stream', 'minute'],
+            update_fields=['bytes_sent', 'requests', 'viewers'],
+        )
+    connection.zremrangebyscore(DELIVERY_MINUTES_KEY, '-inf', now - settle)
+    return len(rows)
@@ -0,0 +1,33 @@
+import math
+
+
+def dvr__render_playlist(
+        *,
+        segments: list[tuple[int, float, str]],
+        uri_prefix: str,
+        ended: bool,
+        uri_suffix: str = '',
+) -> bytes:
+    """
+    VOD (ended) or sliding DVR playlist over archived segments,
+    gaps in the sequence numbers (publisher reconnects) are marked as discontinuities.
+    """
+    target_duration = math.ceil(max((duration for _, duration, _ in segments), default=0)) or 1
+    lines = [
+        '#EXTM3U',
+        '#EXT-X-VERSION:3',
+        f'#EXT-X-TARGETDURATION:{target_duration}',
+        f'#EXT-X-MEDIA-SEQUENCE:{segments[0][0] if segments else 0}',
+    ]
+    if ended:
+        lines.append('#EXT-X-PLAYLIST-TYPE:VOD')
+    previous_sequence = None
+    for sequence, duration, archive_path in segments:
+        if previous_sequence is not None and sequence != previous_sequence + 1:
+            lines.append('#EXT-X-DISCONTINUITY')
+        lines.append(f'#EXTINF:{duration:.3f},')
+        lines.append(f'{uri_prefix}{archive_path}{uri_suffix}')
+        previous_sequence = sequence
+    if ended:
+        lines.append('#EXT-X-ENDLIST')
+    return ('\n'.join(lines) + '\n').encode()
@@ -0,0 +1,72 @@
+import base64
+import hashlib
+import hmac
+import time
+
+from django.conf import settings
+
+from apps.user.logic.selectors.stream_key import stream_key__signing_keys
+from utils.cache import LRUCache
+
+# tokens are valid for the stream they were issued for, `<kid>.<expires>.<user id>.<signature>`
+PLAYBACK_TOKEN_PARAM = 't'
+PLAYBACK_TOKEN_SIGNATURE_SIZE = 16
+
+# (stream, token) -> expires, only valid tokens are cached
+playback_token_cache = LRUCache(
+    max_size=settings.HLS_PLAYBACK_TOKEN_CACHE_SIZE, ttl=settings.HLS_PLAYBACK_TOKEN_TTL
+)
+_derived_keys: dict[str, bytes] = {}
+
+
+def playback_token__key(*, kid: str) -> bytes | None:
+    """Per-kid key derived from the stream key secrets, so playback tokens never validate as stream keys."""
+    key = _derived_keys.get(kid)
+    if key is None:
+        secret = stream_key__signing_keys().get(kid)
+        if secret is None:
+            return None
+        key = _derived_keys[kid] = hmac.new(secret.encode(), b'hls-playback', hashlib.sha256).digest()
+    return key
+
+
+def playback_token__signature(*, key: bytes, stream: str, expires: str, user_id: str) -> str:
+    digest = hmac.new(key, f'{stream}:{expires}:{user_id}'.encode(), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest[:PLAYBACK_TOKEN_SIGNATURE_SIZE]).rstrip(b'=').decode()
+
+
+def playback_token__issue(*, stream: str, user_id: int, ttl: int | None = None, now: float | None = None) -> str:
+    """
+    Expiry is rounded up to a quarter of the TTL: a viewer keeps the same token across
+    playlist reloads for a while, so rewritten playlists and verdicts stay cacheable.
+    """
+    ttl = settings.HLS_PLAYBACK_TOKEN_TTL if ttl is None else ttl
+    bucket = max(ttl // 4, 1)
+    now = time.time() if now is None else now
+    expires = str((int(now) // bucket + 1) * bucket + ttl)
+    kid = settings.STREAM_KEY_ACTIVE_KID
+    signature = playback_token__signature(
+        key=playback_token__key(kid=kid), stream=stream, expires=expires, user_id=str(user_id)
+    )
+    return f'{kid}.{expires}.{user_id}.{signature}'
+
+
+def playback_token__verify(*, stream: str, token: str, now: float | None = None) -> bool:
+    now = time.time() if now is None else now
+    expires = playback_token_cache.get((stream, token))
+    if expires is not None:
+        return expires > now
+    parts = token.split('.')
+    if len(parts) != 4 or not parts[1].isdigit():
+        return False
+    kid, expires, user_id, signature = parts
+    if int(expires) <= now:
+        return False
+    key = playback_token__key(kid=kid)
+    if key is None:
+        return False
+    expected = playback_token__signature(key=key, stream=stream, expires=expires, user_id=user_id)
+    if not hmac.compare_digest(expected, signature):
+        return False
+    playback_token_cache.set((stream, token), int(expires), ttl=int(expires) - now)
+    return True
@@ -0,0 +1,20 @@
+import pgbulk
+from django.utils import timezone
+
+from apps.hls.dto.rendition import RenditionDto
+from apps.hls.models import Rendition
+
+
+def rendition__sync(*, stream: str, renditions: list[RenditionDto]) -> None:
+    """Replaces the stored renditions of a stream, called only when its rendition set changed."""
+    if renditions:
+        updated_at = timezone.now()
+        pgbulk.upsert(
+            queryset=Rendition,
+            model_objs=[
+                Rendition(stream=stream, updated_at=updated_at, **rendition.dict()) for rendition in renditions
+            ],
+            unique_fields=['stream', 'name'],
+            update_fields=['bandwidth', 'average_bandwidth', 'resolution', 'codecs', 'updated_at'],
+        )
+    Rendition.objects.filter(stream=stream).exclude(name__in=[rendition.name for rendition in renditions]).delete()
@@ -0,0 +1,91 @@
+import datetime
+import typing
+
+import pgbulk
+import structlog
+from django.utils import timezone
+
+from apps.hls.dto.segment import SegmentIndexDto
+from apps.hls.logic.interactors.archive import archive__segment
+from apps.hls.logic.interactors.storage import storage__record
+from apps.hls.logic.ts import TsParseError, ts__index
+from apps.hls.logic.watcher import hls__segment_sequence, hls__stream_name
+from apps.hls.models import Segment
+
+logger = structlog.get_logger(__name__)
+
+SEGMENT_INDEX_FIELDS = [
+    'sequence', 'name', 'size', 'duration', 'bitrate', 'first_pts', 'last_pts', 'archive_path',
+    'keyframe_offsets', 'keyframe_pts', 'lost_sync', 'indexed_at',
+]
+
+
+def segment__from_dto(*, index: SegmentIndexDto, archive_path: str | None = None) -> Segment:
+    return Segment(
+        stream=index.stream,
+        sequence=index.sequence,
+        name=index.name,
+        size=index.size,
+        duration=index.duration,
+        bitrate=index.bitrate,
+        first_pts=index.first_pts,
+        last_pts=index.last_pts,
+        started_at=datetime.datetime.fromtimestamp(index.started_at, tz=datetime.timezone.utc),
+        archive_path=archive_path,
+        keyframe_offsets=index.keyframe_offsets,
+        keyframe_pts=index.keyframe_pts,
+        lost_sync=index.lost_sync,
+        indexed_at=timezone.now(),
+    )
+
+
+def segment__archive(*, path: str, index: SegmentIndexDto) -> tuple[str, bool] | None:
+    try:
+        return archive__segment(path=path, stream=index.stream, name=index.name, started_at=index.started_at)
+    except OSError as error:
+        logger.warning('segment.archive_failed', path=path, error=str(error))
+        return None
+
+
+def segment__index(*, path: str) -> SegmentIndexDto | None:
+    sequence = hls__segment_sequence(path=path)
+    if sequence is None:
+        return None
+    try:
+        return ts__index(path=path, stream=hls__stream_name(path=path), sequence=sequence)
+    except (OSError, TsParseError, IndexError) as error:
+        # nginx may already have cleaned the segment up, or it is truncated
+        logger.warning('segment.index_failed', path=path, error=str(error))
+        return None
+
+
+def segment__index_many(*, paths: typing.Iterable[str]) -> list[SegmentIndexDto]:
+    """
+    Indexes and archives segments and writes them with one multi-row upsert,
+    re-indexing a segment overwrites it. Returns the indexes written.
+    """
+    # one row per key, ON CONFLICT cannot touch the same row twice in a statement
+    indexes = {}
+    segments = {}
+    archived = []
+    for path in paths:
+        index = segment__index(path=path)
+        if index is None:
+            continue
+        # sequence numbers restart when a stream is republished, the start time does not repeat
+        key = (index.stream, index.started_at)
+        indexes[key] = index
+        archive = segment__archive(path=path, index=index)
+        segments[key] = segment__from_dto(index=index, archive_path=archive[0] if archive else None)
+        if archive is not None and archive[1]:
+            archived.append((archive[0], index.size))
+    if not segments:
+        return []
+    pgbulk.upsert(
+        queryset=Segment,
+        model_objs=list(segments.values()),
+        unique_fields=['stream', 'started_at'],
+        update_fields=SEGMENT_INDEX_FIELDS,
+    )
+    storage__record(archived=archived)
+    return list(indexes.values())
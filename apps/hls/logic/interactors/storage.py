@@ -0,0 +1,202 @@
+import datetime
+import os
+import shutil
+import time
+import typing
+
+import structlog
+from django.conf import settings
+from django.db import connection as db_connection
+from django_redis import get_redis_connection
+
+from apps.hls.constants import (
+    STORAGE_BUCKET_SIZES_KEY,
+    STORAGE_BUCKETS_KEY,
+    STORAGE_STREAM_BUCKETS_KEY,
+    STORAGE_STREAM_SIZES_KEY,
+)
+from apps.hls.logic.interactors.archive import archive__bucket, archive__stream
+from apps.hls.models import Segment
+
+logger = structlog.get_logger(__name__)
+
+# (bucket, archived bytes, last segment start) of the archive, from the segment table
+REBUILD_SQL = f"""
+SELECT
+    left(archive_path, length(archive_path) - strpos(reverse(archive_path), '/')) AS bucket,
+    sum(size),
+    extract(epoch FROM max(started_at))
+FROM {Segment._meta.db_table}
+WHERE archive_path IS NOT NULL
+GROUP BY 1
+"""
+
+
+def storage__bucket_hour(*, bucket: str) -> datetime.datetime:
+    year, month, day, hour = bucket.split('/')[-4:]
+    return datetime.datetime(int(year), int(month), int(day), int(hour), tzinfo=datetime.timezone.utc)
+
+
+def storage__record(*, archived: typing.Iterable[tuple[str, int]], now: float | None = None) -> None:
+    """Accounts segments archived just now, (archive path, size), a written bucket counts as accessed."""
+    now = time.time() if now is None else now
+    sizes: dict[str, int] = {}
+    for archive_path, size in archived:
+        bucket = archive__bucket(archive_path=archive_path)
+        sizes[bucket] = sizes.get(bucket, 0) + size
+    if not sizes:
+        return
+    pipeline = get_redis_connection('redis').pipeline()
+    for bucket, size in sizes.items():
+        stream = archive__stream(archive_path=bucket)
+        pipeline.hincrby(STORAGE_BUCKET_SIZES_KEY, bucket, size)
+        pipeline.hincrby(STORAGE_STREAM_SIZES_KEY, stream, size)
+        pipeline.zadd(STORAGE_BUCKETS_KEY, {bucket: now}, gt=True)
+        pipeline.zadd(STORAGE_STREAM_BUCKETS_KEY.format(stream=stream), {bucket: now}, gt=True)
+    pipeline.execute()
+
+
+def storage__touch(*, pipeline: typing.Any, accesses: dict[str, float]) -> None:
+    """
+    Queues last access times of buckets, bucket -> time, on a redis pipeline. Only buckets
+    still archived are touched and a time never moves back, log lines may be replayed late.
+    """
+    for bucket, accessed_at in accesses.items():
+        stream = archive__stream(archive_path=bucket)
+        pipeline.zadd(STORAGE_BUCKETS_KEY, {bucket: accessed_at}, xx=True, gt=True)
+        pipeline.zadd(STORAGE_STREAM_BUCKETS_KEY.format(stream=stream), {bucket: accessed_at}, xx=True, gt=True)
+
+
+def storage__remove_bucket(*, bucket: str) -> None:
+    """Deletes the files of a bucket and the directories it leaves empty, down to its shard."""
+    directory = os.path.join(settings.HLS_ARCHIVE_PATH, bucket)
+    shutil.rmtree(directory, ignore_errors=True)
+    root = os.path.normpath(settings.HLS_ARCHIVE_PATH)
+    directory = os.path.dirname(directory)
+    while os.path.normpath(directory) != root:
+        try:
+            os.rmdir(directory)
+        except OSError:
+            # not empty, or gone already
+            break
+        directory = os.path.dirname(directory)
+
+
+def storage__evict_bucket(*, bucket: str) -> int:
+    """
+    Drops a bucket from the archive and returns the bytes freed. Segments stop being listed
+    by DVR playlists before their files go away.
+    """
+    stream = archive__stream(archive_path=bucket)
+    hour = storage__bucket_hour(bucket=bucket)
+    Segment.objects.filter(
+        stream=stream,
+        started_at__gte=hour,
+        started_at__lt=hour + datetime.timedelta(hours=1),
+        archive_path__startswith=f'{bucket}/',
+    ).update(archive_path=None)
+    storage__remove_bucket(bucket=bucket)
+    connection = get_redis_connection('redis')
+    size = int(connection.hget(STORAGE_BUCKET_SIZES_KEY, bucket) or 0)
+    pipeline = connection.pipeline()
+    pipeline.hdel(STORAGE_BUCKET_SIZES_KEY, bucket)
+    pipeline.hincrby(STORAGE_STREAM_SIZES_KEY, stream, -size)
+    pipeline.zrem(STORAGE_BUCKETS_KEY, bucket)
+    pipeline.zrem(STORAGE_STREAM_BUCKETS_KEY.format(stream=stream), bucket)
+    pipeline.execute()
+    logger.info('storage.bucket_evicted', bucket=bucket, size=size)
+    return size
+
+
+def storage__evict_lru(*, key: str, used: int, quota: int, idle_before: float, batch_size: int) -> list[str]:
+    """Evicts the least recently accessed buckets of a zset until usage fits the quota."""
+    connection = get_redis_connection('redis')
+    evicted = []
+    while used > quota:
+        buckets = connection.zrangebyscore(key, '-inf', idle_before, start=0, num=batch_size)
+        if not buckets:
+            # whatever is left was accessed too recently, the bucket being written among them
+            break
+        for bucket in buckets:
+            bucket = bucket.decode()
+            used -= storage__evict_bucket(bucket=bucket)
+            evicted.append(bucket)
+            if used <= quota:
+                break
+    return evicted
+
+
+def storage__evict(
+        *,
+        quota: int,
+        stream_quota: int,
+        min_idle: int,
+        batch_size: int = 100,
+        now: float | None = None,
+) -> list[str]:
+    """
+    Enforces the per stream and then the global archive quota in bytes (0 - unlimited), evicting
+    whole hourly buckets in LRU order. Usage comes from the counters, nothing is listed on disk.
+    Buckets accessed in the last min_idle seconds are kept.
+    """
+    if not quota and not stream_quota:
+        return []
+    idle_before = (time.time() if now is None else now) - min_idle
+    connection = get_redis_connection('redis')
+    sizes = {
+        stream.decode(): int(size) for stream, size in connection.hgetall(STORAGE_STREAM_SIZES_KEY).items()
+    }
+    evicted = []
+    if stream_quota:
+        for stream, used in sizes.items():
+            if used > stream_quota:
+                evicted += storage__evict_lru(
+                    key=STORAGE_STREAM_BUCKETS_KEY.format(stream=stream),
+                    used=used,
+                    quota=stream_quota,
+                    idle_before=idle_before,
+                    batch_size=batch_size,
+                )
+    if quota:
+        used = sum(int(size) for size in connection.hvals(STORAGE_STREAM_SIZES_KEY))
+        evicted += storage__evict_lru(
+            key=STORAGE_BUCKETS_KEY, used=used, quota=quota, idle_before=idle_before, batch_size=batch_size
+        )
+    return evicted
+
+
+def storage__evict_forever(*, interval: float, quota: int, stream_quota: int, min_idle: int) -> None:
+    while True:
+        started_at = time.monotonic()
+        try:
+            storage__evict(quota=quota, stream_quota=stream_quota, min_idle=min_idle)
+        except Exception:
+            logger.exception('storage.evict_failed')
+        time.sleep(max(interval - (time.monotonic() - started_at), 0))
+
+
+def storage__rebuild() -> int:
+    """
+    Recomputes the counters from the segment table, for an archive predating them or after
+    redis lost them; the last access of a bucket becomes its last write. Returns the buckets counted.
+    """
+    with db_connection.cursor() as cursor:
+        cursor.execute(REBUILD_SQL)
+        rows = cursor.fetchall()
+    connection = get_redis_connection('redis')
+    streams = {stream.decode() for stream in connection.hkeys(STORAGE_STREAM_SIZES_KEY)}
+    stream_sizes: dict[str, int] = {}
+    pipeline = connection.pipeline()
+    pipeline.delete(STORAGE_BUCKETS_KEY, STORAGE_BUCKET_SIZES_KEY, STORAGE_STREAM_SIZES_KEY)
+    for stream in streams | {archive__stream(archive_path=bucket) for bucket, _, _ in rows}:
+        pipeline.delete(STORAGE_STREAM_BUCKETS_KEY.format(stream=stream))
+    for bucket, size, written_at in rows:
+        stream = archive__stream(archive_path=bucket)
+        stream_sizes[stream] = stream_sizes.get(stream, 0) + int(size)
+        pipeline.hset(STORAGE_BUCKET_SIZES_KEY, bucket, int(size))
+        pipeline.zadd(STORAGE_BUCKETS_KEY, {bucket: float(written_at or 0)})
+        pipeline.zadd(STORAGE_STREAM_BUCKETS_KEY.format(stream=stream), {bucket: float(written_at or 0)})
+    for stream, size in stream_sizes.items():
+        pipeline.hset(STORAGE_STREAM_SIZES_KEY, stream, size)
+    pipeline.execute()
+    return len(rows)
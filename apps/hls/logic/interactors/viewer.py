@@ -0,0 +1,21 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http.cookie import parse_cookie
+
+from apps.user.logic.selectors.session import session__user_id
+from utils.asgi import Request
+from utils.cache import MISSING, LRUCache
+
+# session key -> user id, 0 for sessions without an active user
+viewer_cache = LRUCache(max_size=settings.HLS_VIEWER_CACHE_SIZE, ttl=settings.HLS_VIEWER_CACHE_TTL)
+
+
+async def viewer__user_id(*, request: Request) -> int | None:
+    session_key = parse_cookie(request.headers.get('cookie', '')).get(settings.SESSION_COOKIE_NAME)
+    if not session_key:
+        return None
+    user_id = viewer_cache.get(session_key, MISSING)
+    if user_id is MISSING:
+        user_id = await sync_to_async(session__user_id, thread_sensitive=False)(session_key=session_key) or 0
+        viewer_cache.set(session_key, user_id)
+    return user_id or None
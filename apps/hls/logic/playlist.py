@@ -0,0 +1,415 @@
+import asyncio
+import collections
+import hashlib
+import os
+import re
+import threading
+import time
+import typing
+from email.utils import formatdate
+
+from django.conf import settings
+
+from apps.hls.dto.rendition import RenditionDto
+from apps.hls.logic.watcher import PLAYLIST_EXTENSION, HlsListener, hls__stream_name
+
+LL_HLS_VERSION = 6
+URI_SUFFIX_MARKER = b'\x00'
+STREAM_INF_TAG = '#EXT-X-STREAM-INF:'
+ATTRIBUTE_PATTERN = re.compile(r'([A-Z0-9-]+)=("[^"]*"|[^,]*)')
+
+
+class Segment:
+    __slots__ = ('sequence', 'duration', 'uri', 'discontinuity')
+
+    def __init__(self, *, sequence: int, duration: float, uri: str, discontinuity: bool = False) -> None:
+        self.sequence = sequence
+        self.duration = duration
+        self.uri = uri
+        self.discontinuity = discontinuity
+
+
+class RenderedPlaylist:
+    """
+    Playlist bytes rendered once per update. Segment URIs are followed by a marker,
+    so per-viewer playback tokens are spliced in with a single bytes.replace.
+    """
+
+    __slots__ = ('template', 'body', 'etag', 'last_modified', 'updated_at')
+
+    def __init__(self, *, template: bytes, updated_at: float) -> None:
+        self.template = template
+        self.body = template.replace(URI_SUFFIX_MARKER, b'')
+        self.etag = f'"{hashlib.blake2b(self.body, digest_size=8).hexdigest()}"'
+        self.last_modified = formatdate(updated_at, usegmt=True)
+        self.updated_at = updated_at
+
+    def with_uri_suffix(self, suffix: bytes) -> bytes:
+        return self.template.replace(URI_SUFFIX_MARKER, suffix)
+
+
+class MediaPlaylist:
+    """
+    Parsed live media playlist of one stream.
+    Updates only append segments newer than the last known media sequence number
+    and drop the ones that slid out of the window, the rendered bytes are rebuilt once per update.
+    """
+
+    def __init__(self, *, stream: str) -> None:
+        self.stream = stream
+        self.version = 3
+        self.target_duration = 0
+        self.media_sequence = 0
+        self.discontinuity_sequence = 0
+        self.ended = False
+        self.segments: collections.deque[Segment] = collections.deque()
+        self.rendered: RenderedPlaylist | None = None
+
+    @property
+    def last_sequence(self) -> int:
+        return self.segments[-1].sequence if self.segments else -1
+
+    def update(self, text: str) -> bool:
+        media_sequence = 0
+        ended = False
+        entries = []
+        duration = 0.0
+        discontinuity = False
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith('#EXTINF:'):
+                duration = float(line[8:].split(',', 1)[0])
+            elif line.startswith('#EXT-X-MEDIA-SEQUENCE:'):
+                media_sequence = int(line[22:])
+            elif line.startswith('#EXT-X-TARGETDURATION:'):
+                self.target_duration = int(line[22:])
+            elif line.startswith('#EXT-X-VERSION:'):
+                self.version = int(line[15:])
+            elif line.startswith('#EXT-X-DISCONTINUITY-SEQUENCE:'):
+                self.discontinuity_sequence = int(line[30:])
+            elif line == '#EXT-X-DISCONTINUITY':
+                discontinuity = True
+            elif line == '#EXT-X-ENDLIST':
+                ended = True
+            elif not line.startswith('#'):
+                entries.append((duration, line, discontinuity))
+                discontinuity = False
+
+        if media_sequence < self.media_sequence:
+            # nginx-rtmp restarted the numbering, e.g. a republish without hls_continuous
+            self.segments.clear()
+        last_sequence = self.last_sequence
+        changed = ended != self.ended or media_sequence != self.media_sequence
+        for offset, (duration, uri, discontinuity) in enumerate(entries):
+            sequence = media_sequence + offset
+            if sequence > last_sequence:
+                self.segments.append(
+                    Segment(sequence=sequence, duration=duration, uri=uri, discontinuity=discontinuity)
+                )
+                changed = True
+        while self.segments and self.segments[0].sequence < media_sequence:
+            self.segments.popleft()
+        self.media_sequence = media_sequence
+        self.ended = ended
+        if changed or self.rendered is None:
+            # a single attribute swap, readers on the event loop never see a half-built playlist
+            self.rendered = RenderedPlaylist(
+                template=self.render(uri_suffix=URI_SUFFIX_MARKER.decode()), updated_at=time.time()
+            )
+        return changed
+
+    def render_lines(self, uri_suffix: str = '') -> list[str]:
+        """
+        Low-Latency HLS playlist: nginx-rtmp does not cut partial segments,
+        so every segment is announced as its own single independent part.
+        """
+        lines = [
+            '#EXTM3U',
+            f'#EXT-X-VERSION:{max(self.version, LL_HLS_VERSION)}',
+            f'#EXT-X-TARGETDURATION:{self.target_duration}',
+            f'#EXT-X-SERVER-CONTROL:CAN-BLOCK-RELOAD=YES,PART-HOLD-BACK={self.target_duration * 3:.3f}',
+            f'#EXT-X-PART-INF:PART-TARGET={self.target_duration:.3f}',
+            f'#EXT-X-MEDIA-SEQUENCE:{self.media_sequence}',
+        ]
+        if self.discontinuity_sequence:
+            lines.append(f'#EXT-X-DISCONTINUITY-SEQUENCE:{self.discontinuity_sequence}')
+        for segment in self.segments:
+            if segment.discontinuity:
+                lines.append('#EXT-X-DISCONTINUITY')
+            uri = f'{segment.uri}{uri_suffix}'
+            lines.append(f'#EXT-X-PART:DURATION={segment.duration:.3f},URI="{uri}",INDEPENDENT=YES')
+            lines.append(f'#EXTINF:{segment.duration:.3f},')
+            lines.append(uri)
+        # no EXT-X-PRELOAD-HINT: nginx serves segments from disk and answers 404 until the next one is written
+        if self.ended:
+            lines.append('#EXT-X-ENDLIST')
+        return lines
+
+    def render(self, uri_suffix: str = '') -> bytes:
+        return ('\n'.join(self.render_lines(uri_suffix=uri_suffix)) + '\n').encode()
+
+
+def playlist__variant_base(*, stream: str, suffixes: typing.Iterable[str]) -> str | None:
+    """Stream a hls_variant rendition belongs to, `alice_hi` -> `alice` for the `_hi` suffix."""
+    for suffix in suffixes:
+        if stream.endswith(suffix) and len(stream) > len(suffix):
+            return stream[:-len(suffix)]
+    return None
+
+
+def playlist__parse_master(*, text: str, directory: str) -> dict[str, dict[str, str]]:
+    """Rendition stream name -> EXT-X-STREAM-INF attributes of a master playlist written by nginx-rtmp."""
+    variants = {}
+    attributes = None
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith(STREAM_INF_TAG):
+            attributes = {
+                name: value.strip('"') for name, value in ATTRIBUTE_PATTERN.findall(line[len(STREAM_INF_TAG):])
+            }
+        elif line and not line.startswith('#') and attributes is not None:
+            variants[hls__stream_name(path=os.path.normpath(os.path.join(directory, line)))] = attributes
+            attributes = None
+    return variants
+
+
+def playlist__declared_rendition(*, name: str, attributes: dict[str, str]) -> RenditionDto | None:
+    try:
+        bandwidth = int(attributes['BANDWIDTH'])
+        average_bandwidth = int(attributes['AVERAGE-BANDWIDTH']) if 'AVERAGE-BANDWIDTH' in attributes else None
+    except (KeyError, ValueError):
+        return None
+    return RenditionDto(
+        name=name,
+        bandwidth=bandwidth,
+        average_bandwidth=average_bandwidth,
+        resolution=attributes.get('RESOLUTION'),
+        codecs=attributes.get('CODECS'),
+    )
+
+
+def playlist__measured_rendition(*, name: str, playlist: MediaPlaylist, directory: str) -> RenditionDto | None:
+    """Bandwidth of a rendition nginx did not declare, from the sizes of the segments in its playlist."""
+    bitrates = []
+    for segment in playlist.segments:
+        if segment.duration <= 0:
+            continue
+        try:
+            size = os.path.getsize(os.path.join(directory, segment.uri))
+        except OSError:
+            continue
+        bitrates.append(size * 8 / segment.duration)
+    if not bitrates:
+        return None
+    return RenditionDto(
+        name=name,
+        bandwidth=int(max(bitrates)),
+        average_bandwidth=int(sum(bitrates) / len(bitrates)),
+        resolution=None,
+        codecs=None,
+    )
+
+
+class MasterPlaylist:
+    """Renditions of one stream, the rendered bytes only change with the rendition set."""
+
+    def __init__(self, *, stream: str) -> None:
+        self.stream = stream
+        self.renditions: dict[str, RenditionDto] = {}
+        self.rendered: RenderedPlaylist | None = None
+
+    def update(self, renditions: dict[str, RenditionDto]) -> bool:
+        if renditions == self.renditions and self.rendered is not None:
+            return False
+        self.renditions = renditions
+        self.rendered = RenderedPlaylist(template=self.render(), updated_at=time.time())
+        return True
+
+    def render(self) -> bytes:
+        lines = ['#EXTM3U', '#EXT-X-INDEPENDENT-SEGMENTS']
+        for rendition in sorted(self.renditions.values(), key=lambda rendition: rendition.bandwidth):
+            attributes = [f'BANDWIDTH={rendition.bandwidth}']
+            if rendition.average_bandwidth is not None:
+                attributes.append(f'AVERAGE-BANDWIDTH={rendition.average_bandwidth}')
+            if rendition.resolution:
+                attributes.append(f'RESOLUTION={rendition.resolution}')
+            if rendition.codecs:
+                attributes.append(f'CODECS="{rendition.codecs}"')
+            lines.append(f'{STREAM_INF_TAG}{",".join(attributes)}')
+            # relative to /hls/<stream>.m3u8, every rendition is served as /hls/<rendition>.m3u8
+            lines.append(f'{rendition.name}{PLAYLIST_EXTENSION}')
+        return ('\n'.join(lines) + '\n').encode()
+
+
+def _resolve(future: asyncio.Future, rendered: RenderedPlaylist | None) -> None:
+    if not future.done():
+        future.set_result(rendered)
+
+
+class PlaylistService(HlsListener):
+    """
+    In-memory playlists of every live stream, kept up to date from the hls_path watcher.
+    Blocking reloads park a future per request, the watcher thread resolves them
+    on the owning event loop as soon as the awaited media sequence number is published.
+    """
+
+    def __init__(
+            self,
+            *,
+            variant_suffixes: typing.Iterable[str] = (),
+            on_renditions_changed: typing.Callable[[str, list[RenditionDto]], None] | None = None,
+    ) -> None:
+        self.variant_suffixes = tuple(variant_suffixes)
+        self.on_renditions_changed = on_renditions_changed
+        self.playlists: dict[str, MediaPlaylist] = {}
+        self.masters: dict[str, MasterPlaylist] = {}
+        # stream -> rendition name -> attributes declared in the master playlist nginx-rtmp wrote
+        self._declared: dict[str, dict[str, dict[str, str]]] = {}
+        self._declared_bases: dict[str, str] = {}  # rendition name -> stream
+        self._waiters: dict[str, list[tuple[int, asyncio.Future]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, stream: str) -> RenderedPlaylist | None:
+        playlist = self.playlists.get(stream)
+        return playlist.rendered if playlist is not None else None
+
+    def get_playlist(self, stream: str) -> MediaPlaylist | None:
+        return self.playlists.get(stream)
+
+    def get_master(self, stream: str) -> RenderedPlaylist | None:
+        master = self.masters.get(stream)
+        return master.rendered if master is not None else None
+
+    async def wait(self, *, stream: str, msn: int, timeout: float) -> RenderedPlaylist | None:
+        """Rendered playlist containing segment `msn`, None on timeout or when the stream is gone."""
+        future = asyncio.get_running_loop().create_future()
+        with self._lock:
+            playlist = self.playlists.get(stream)
+            if playlist is None:
+                return None
+            if playlist.last_sequence >= msn or playlist.ended:
+                return playlist.rendered
+            self._waiters.setdefault(stream, []).append((msn, future))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            with self._lock:
+                waiters = self._waiters.get(stream)
+                if waiters is not None:
+                    waiters[:] = [waiter for waiter in waiters if waiter[1] is not future]
+                    if not waiters:
+                        del self._waiters[stream]
+
+    def _wake(self, stream: str, playlist: MediaPlaylist | None) -> None:
+        # called with the lock held
+        waiters = self._waiters.get(stream)
+        if not waiters:
+            return
+        if playlist is None or playlist.ended:
+            ready, waiting = waiters, []
+        else:
+            last_sequence = playlist.last_sequence
+            ready = [waiter for waiter in waiters if waiter[0] <= last_sequence]
+            waiting = [waiter for waiter in waiters if waiter[0] > last_sequence]
+        rendered = playlist.rendered if playlist is not None else None
+        for _, future in ready:
+            future.get_loop().call_soon_threadsafe(_resolve, future, rendered)
+        if waiting:
+            self._waiters[stream] = waiting
+        else:
+            del self._waiters[stream]
+
+    def _base(self, name: str) -> str | None:
+        base = self._declared_bases.get(name)
+        if base is None:
+            base = playlist__variant_base(stream=name, suffixes=self.variant_suffixes)
+        return base
+
+    def _declare(self, stream: str, variants: dict[str, dict[str, str]] | None) -> None:
+        for name in self._declared.pop(stream, {}):
+            self._declared_bases.pop(name, None)
+        if variants:
+            self._declared[stream] = variants
+            self._declared_bases.update((name, stream) for name in variants)
+
+    def _refresh_master(self, stream: str, *, measure: tuple[str, str] | None = None) -> list[RenditionDto] | None:
+        """
+        Rebuilds the rendition set of a stream from its live rendition playlists, called with the lock held.
+        Measured bandwidths are kept once known, so the set only changes when renditions come and go.
+        Returns the new set when it changed.
+        """
+        master = self.masters.get(stream) or MasterPlaylist(stream=stream)
+        declared = self._declared.get(stream, {})
+        names = {*declared, *master.renditions}
+        if measure is not None:
+            names.add(measure[0])
+        renditions = {}
+        for name in names:
+            playlist = self.playlists.get(name)
+            if playlist is None or not playlist.segments:
+                continue
+            rendition = None
+            if name in declared:
+                rendition = playlist__declared_rendition(name=name, attributes=declared[name])
+            if rendition is None:
+                rendition = master.renditions.get(name)
+            if rendition is None and measure is not None and measure[0] == name:
+                rendition = playlist__measured_rendition(name=name, playlist=playlist, directory=measure[1])
+            if rendition is not None:
+                renditions[name] = rendition
+        if not renditions:
+            if self.masters.pop(stream, None) is None:
+                return None
+            return []
+        self.masters[stream] = master
+        return list(renditions.values()) if master.update(renditions) else None
+
+    def _renditions_changed(self, stream: str, renditions: list[RenditionDto] | None) -> None:
+        if renditions is not None and self.on_renditions_changed is not None:
+            self.on_renditions_changed(stream, renditions)
+
+    def on_playlist_updated(self, stream: str, path: str) -> None:
+        try:
+            with open(path, encoding='utf-8') as playlist_file:
+                text = playlist_file.read()
+        except FileNotFoundError:
+            return
+        if STREAM_INF_TAG in text:
+            # the master playlist nginx-rtmp writes for hls_variant, a source of declared attributes only
+            with self._lock:
+                self._declare(stream, playlist__parse_master(text=text, directory=os.path.dirname(path)))
+                renditions = self._refresh_master(stream)
+            self._renditions_changed(stream, renditions)
+            return
+        renditions = None
+        with self._lock:
+            base = self._base(stream)
+            playlist = self.playlists.get(stream)
+            if playlist is None:
+                playlist = self.playlists[stream] = MediaPlaylist(stream=stream)
+            if playlist.update(text):
+                self._wake(stream, playlist)
+            if base is not None:
+                renditions = self._refresh_master(base, measure=(stream, os.path.dirname(path)))
+        if base is not None:
+            self._renditions_changed(base, renditions)
+
+    def on_playlist_removed(self, stream: str, path: str) -> None:
+        renditions = None
+        with self._lock:
+            base = self._base(stream)
+            if self.playlists.pop(stream, None) is None:
+                # not a media playlist, the nginx-rtmp master playlist of a stream that is over
+                self._declare(stream, None)
+            self._wake(stream, None)
+            if base is not None:
+                renditions = self._refresh_master(base)
+        if base is not None:
+            self._renditions_changed(base, renditions)
+
+
+playlist_service = PlaylistService(variant_suffixes=settings.HLS_VARIANT_SUFFIXES)
@@ -0,0 +1,52 @@
+import threading
+from collections import OrderedDict
+
+import structlog
+from django.conf import settings
+
+from apps.hls.logic.watcher import HlsListener
+
+logger = structlog.get_logger(__name__)
+
+
+class HotSegmentCache(HlsListener):
+    """
+    The most recent closed segments of every stream, read into memory once.
+    Live viewers all fetch the last few segments, so a handful per stream absorbs nearly every read;
+    responses share the cached bytes, ASGI servers take bytes bodies only.
+    """
+
+    def __init__(self, *, per_stream: int) -> None:
+        self.per_stream = per_stream
+        self._streams: dict[str, OrderedDict[str, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, stream: str, path: str) -> bytes | None:
+        with self._lock:
+            segments = self._streams.get(stream)
+            return segments.get(path) if segments is not None else None
+
+    def on_segment_closed(self, stream: str, path: str) -> None:
+        try:
+            with open(path, 'rb') as segment_file:
+                data = segment_file.read()
+        except OSError:
+            logger.warning('hot_segment_cache.read_failed', path=path)
+            return
+        with self._lock:
+            segments = self._streams.setdefault(stream, OrderedDict())
+            segments.pop(path, None)
+            segments[path] = data
+            while len(segments) > self.per_stream:
+                segments.popitem(last=False)
+
+    def on_segment_removed(self, stream: str, path: str) -> None:
+        with self._lock:
+            segments = self._streams.get(stream)
+            if segments is not None:
+                segments.pop(path, None)
+                if not segments:
+                    del self._streams[stream]
+
+
+hot_segment_cache = HotSegmentCache(per_stream=settings.HLS_HOT_SEGMENTS)
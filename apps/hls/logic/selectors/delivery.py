@@ -0,0 +1,18 @@
+import datetime
+
+from django_redis import get_redis_connection
+
+from apps.hls.constants import DELIVERY_VIEWERS_KEY
+
+
+def delivery__unique_viewers(*, stream: str, started_from: datetime.datetime, started_to: datetime.datetime) -> int:
+    """
+    Unique viewers of the window, PFCOUNT over several HyperLogLogs estimates their union.
+    Only minutes within HLS_DELIVERY_COUNTERS_TTL are still in redis.
+    """
+    first = int(started_from.timestamp()) // 60 * 60
+    last = int(started_to.timestamp())
+    keys = [DELIVERY_VIEWERS_KEY.format(stream=stream, minute=minute) for minute in range(first, last, 60)]
+    if not keys:
+        return 0
+    return get_redis_connection('redis').pfcount(*keys)
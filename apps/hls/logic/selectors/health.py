@@ -0,0 +1,14 @@
+from django_redis import get_redis_connection
+
+from apps.hls.constants import HLS_HEALTH_KEY
+from apps.hls.dto.health import StreamHealthDto
+
+
+def health__streams() -> list[StreamHealthDto]:
+    snapshot = get_redis_connection('redis').hgetall(HLS_HEALTH_KEY)
+    return [StreamHealthDto.parse_raw(snapshot[stream]) for stream in sorted(snapshot)]
+
+
+def health__stream(*, stream: str) -> StreamHealthDto | None:
+    raw_health = get_redis_connection('redis').hget(HLS_HEALTH_KEY, stream)
+    return StreamHealthDto.parse_raw(raw_health) if raw_health is not None else None
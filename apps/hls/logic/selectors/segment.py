@@ -0,0 +1,29 @@
+import datetime
+
+from django.db.models import QuerySet
+
+from apps.hls.models import Segment
+
+
+def segment__all() -> QuerySet[Segment]:
+    return Segment.objects.all()
+
+
+def segment__archived_window(
+        *,
+        stream: str,
+        started_from: datetime.datetime,
+        started_to: datetime.datetime,
+        queryset: QuerySet[Segment] | None = None,
+) -> list[tuple[int, float, str]]:
+    """(sequence, duration, archive_path) of archived segments in the window, one range scan on (stream, started_at)."""
+    if queryset is None:
+        queryset = segment__all()
+    return list(
+        queryset.filter(
+            stream=stream,
+            started_at__gte=started_from,
+            started_at__lt=started_to,
+            archive_path__isnull=False,
+        ).order_by('started_at').values_list('sequence', 'duration', 'archive_path')
+    )
@@ -0,0 +1,177 @@
+import mmap
+import os
+
+import numpy as np
+
+from apps.hls.dto.segment import SegmentIndexDto
+
+TS_PACKET_SIZE = 188
+TS_SYNC_BYTE = 0x47
+TS_PAT_PID = 0x0000
+PTS_CLOCK = 90000
+PTS_WRAP = 1 << 33
+# H.264, HEVC, MPEG-2 and MPEG-1 video
+VIDEO_STREAM_TYPES = frozenset({0x1B, 0x24, 0x02, 0x01})
+
+
+class TsParseError(ValueError):
+    pass
+
+
+def _section_payload(packet: np.ndarray) -> bytes:
+    """PSI section of a packet that starts one, the pointer field is skipped."""
+    offset = _payload_offsets(packet[np.newaxis])[0]
+    pointer = int(packet[offset])
+    return packet[offset + 1 + pointer:].tobytes()
+
+
+def _payload_offsets(packets: np.ndarray) -> np.ndarray:
+    adaptation_field_control = (packets[:, 3] >> 4) & 0x3
+    has_adaptation = (adaptation_field_control & 0x2).astype(bool)
+    return np.where(has_adaptation, 5 + packets[:, 4].astype(np.int64), 4)
+
+
+def _first_section(packets: np.ndarray, pids: np.ndarray, starts: np.ndarray, pid: int) -> bytes:
+    candidates = np.flatnonzero((pids == pid) & starts)
+    if not candidates.size:
+        raise TsParseError(f'no section on pid {pid:#x}')
+    return _section_payload(packets[candidates[0]])
+
+
+def ts__pmt_pid(section: bytes) -> int:
+    section_length = ((section[1] & 0x0F) << 8) | section[2]
+    # programs follow the 8 byte header, the 4 byte crc closes the section
+    for offset in range(8, min(3 + section_length - 4, len(section) - 3), 4):
+        program_number = (section[offset] << 8) | section[offset + 1]
+        if program_number != 0:
+            return ((section[offset + 2] & 0x1F) << 8) | section[offset + 3]
+    raise TsParseError('no program in PAT')
+
+
+def ts__elementary_pid(section: bytes) -> int:
+    """Video elementary stream pid of the PMT, the first stream when there is no video."""
+    section_length = ((section[1] & 0x0F) << 8) | section[2]
+    program_info_length = ((section[10] & 0x0F) << 8) | section[11]
+    offset = 12 + program_info_length
+    end = min(3 + section_length - 4, len(section))
+    first_pid = None
+    while offset + 5 <= end:
+        stream_type = section[offset]
+        pid = ((section[offset + 1] & 0x1F) << 8) | section[offset + 2]
+        if stream_type in VIDEO_STREAM_TYPES:
+            return pid
+        if first_pid is None:
+            first_pid = pid
+        offset += 5 + (((section[offset + 3] & 0x0F) << 8) | section[offset + 4])
+    if first_pid is None:
+        raise TsParseError('no elementary stream in PMT')
+    return first_pid
+
+
+def _timestamps(packets: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """33-bit PES timestamps from the 5 bytes at offsets, gathered for all rows at once."""
+    rows = np.arange(len(packets))
+    b = [packets[rows, offsets + i].astype(np.int64) for i in range(5)]
+    return (
+        ((b[0] >> 1) & 0x7) << 30
+        | b[1] << 22
+        | (b[2] >> 1) << 15
+        | b[3] << 7
+        | b[4] >> 1
+    )
+
+
+def _unwrap(timestamps: np.ndarray) -> np.ndarray:
+    if timestamps.size < 2:
+        return timestamps
+    wraps = np.concatenate(([0], np.cumsum(np.diff(timestamps) < -(PTS_WRAP // 2))))
+    return timestamps + wraps * PTS_WRAP
+
+
+def ts__index_buffer(buffer: memoryview | bytes) -> dict:
+    """
+    Index of a complete MPEG-TS segment. Packets are a (n, 188) uint8 view over the buffer,
+    header fields are computed column-wise, only the PAT and PMT sections are parsed one by one.
+    """
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    packets = data[:len(data) - len(data) % TS_PACKET_SIZE].reshape(-1, TS_PACKET_SIZE)
+    if not len(packets):
+        raise TsParseError('empty segment')
+    synced = packets[:, 0] == TS_SYNC_BYTE
+    packets = packets[synced]
+    positions = np.flatnonzero(synced)
+
+    pids = ((packets[:, 1].astype(np.int64) & 0x1F) << 8) | packets[:, 2]
+    starts = (packets[:, 1] & 0x40).astype(bool)
+
+    pmt_pid = ts__pmt_pid(_first_section(packets, pids, starts, TS_PAT_PID))
+    pid = ts__elementary_pid(_first_section(packets, pids, starts, pmt_pid))
+
+    is_pes_start = (pids == pid) & starts
+    pes_packets = packets[is_pes_start]
+    pes_positions = positions[is_pes_start]
+    offsets = _payload_offsets(pes_packets)
+    # PES header: start code (3), stream id, length (2), flags (2), header length, then PTS and DTS
+    fits = offsets + 19 <= TS_PACKET_SIZE
+    pes_packets, pes_positions, offsets = pes_packets[fits], pes_positions[fits], offsets[fits]
+    rows = np.arange(len(pes_packets))
+    has_start_code = (
+        (pes_packets[rows, offsets] == 0)
+        & (pes_packets[rows, offsets + 1] == 0)
+        & (pes_packets[rows, offsets + 2] == 1)
+    )
+    pts_dts_flags = pes_packets[rows, offsets + 7] >> 6
+    has_pts = has_start_code & ((pts_dts_flags & 0x2) != 0)
+    pes_packets, pes_positions, offsets = pes_packets[has_pts], pes_positions[has_pts], offsets[has_pts]
+    pts_dts_flags = pts_dts_flags[has_pts]
+    if not len(pes_packets):
+        raise TsParseError('no timestamped PES packets')
+
+    raw_pts = _timestamps(pes_packets, offsets + 9)
+    pts = _unwrap(raw_pts)
+    dts = _unwrap(np.where(pts_dts_flags == 3, _timestamps(pes_packets, offsets + 14), raw_pts))
+
+    has_adaptation = ((pes_packets[:, 3] >> 4) & 0x2).astype(bool) & (pes_packets[:, 4] > 0)
+    random_access = has_adaptation & ((pes_packets[:, 5] & 0x40) != 0)
+
+    # frames are decoded in dts order, the last one lasts as long as the typical frame
+    frame_durations = np.diff(dts)
+    frame_duration = int(np.median(frame_durations)) if frame_durations.size else 0
+    duration = (int(dts[-1] - dts[0]) + frame_duration) / PTS_CLOCK
+    return {
+        'first_pts': int(pts.min() % PTS_WRAP),
+        'last_pts': int((pts.max() + frame_duration) % PTS_WRAP),
+        'duration': duration,
+        'keyframe_offsets': (pes_positions[random_access] * TS_PACKET_SIZE).tolist(),
+        'keyframe_pts': (pts[random_access] % PTS_WRAP).tolist(),
+        'packets': int(len(packets)),
+        'lost_sync': int(len(synced) - len(packets)),
+    }
+
+
+def ts__index(*, path: str, stream: str, sequence: int) -> SegmentIndexDto:
+    with open(path, 'rb') as segment_file:
+        stat = os.fstat(segment_file.fileno())
+        size = stat.st_size
+        if not size:
+            raise TsParseError('empty segment')
+        mapped = mmap.mmap(segment_file.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        index = ts__index_buffer(mapped)
+    finally:
+        try:
+            mapped.close()
+        except BufferError:
+            # arrays still referenced from a traceback, the mapping goes away with them
+            pass
+    duration = index.pop('duration')
+    return SegmentIndexDto(
+        stream=stream,
+        sequence=sequence,
+        name=os.path.basename(path),
+        size=size,
+        closed_at=stat.st_mtime,
+        duration=duration,
+        bitrate=int(size * 8 / duration) if duration > 0 else 0,
+        **index,
+    )
@@ -0,0 +1,127 @@
+import os
+import re
+import threading
+
+import structlog
+from django.conf import settings
+from watchdog.events import FileSystemEvent, FileSystemEventHandler
+from watchdog.observers import Observer
+
+logger = structlog.get_logger(__name__)
+
+PLAYLIST_EXTENSION = '.m3u8'
+SEGMENT_EXTENSION = '.ts'
+SEGMENT_SEQUENCE_PATTERN = re.compile(r'(\d+)$')
+
+
+def hls__stream_name(*, path: str) -> str:
+    """
+    Stream name of a playlist or segment path, both for the flat nginx-rtmp layout
+    (`<stream>.m3u8`, `<stream>-<n>.ts`) and for `hls_nested on` (`<stream>/index.m3u8`, `<stream>/<n>.ts`).
+    """
+    directory, filename = os.path.split(path)
+    stem, extension = os.path.splitext(filename)
+    if os.path.normpath(directory) != os.path.normpath(settings.HLS_PATH):
+        return os.path.basename(directory)
+    if extension == SEGMENT_EXTENSION:
+        return stem.rpartition('-')[0] or stem
+    return stem
+
+
+def hls__segment_sequence(*, path: str) -> int | None:
+    """Media sequence number of a segment, nginx-rtmp names fragments after it."""
+    match = SEGMENT_SEQUENCE_PATTERN.search(os.path.splitext(os.path.basename(path))[0])
+    return int(match.group(1)) if match else None
+
+
+class HlsListener:
+    """Receives segment and playlist events of the hls_path, called from the watcher thread."""
+
+    def on_playlist_updated(self, stream: str, path: str) -> None:
+        ...
+
+    def on_playlist_removed(self, stream: str, path: str) -> None:
+        ...
+
+    def on_segment_closed(self, stream: str, path: str) -> None:
+        ...
+
+    def on_segment_removed(self, stream: str, path: str) -> None:
+        ...
+
+
+class HlsDirectoryWatcher(FileSystemEventHandler):
+    """
+    Follows the nginx-rtmp hls_path with inotify (watchdog) and fans events out to listeners.
+    nginx-rtmp writes a segment and closes it once the fragment is complete, and replaces
+    a playlist by renaming `<stream>.m3u8.bak` over it.
+    """
+
+    def __init__(self, *, path: str) -> None:
+        self.path = path
+        self.listeners: list[HlsListener] = []
+        self._observer: Observer | None = None
+        self._lock = threading.Lock()
+
+    def subscribe(self, listener: HlsListener) -> None:
+        if listener not in self.listeners:
+            self.listeners.append(listener)
+
+    def start(self) -> None:
+        with self._lock:
+            if self._observer is not None:
+                return
+            if not os.path.isdir(self.path):
+                logger.warning('hls_watcher.path_missing', path=self.path)
+                return
+            self._observer = Observer()
+            self._observer.schedule(self, self.path, recursive=True)
+            self._observer.daemon = True
+            self._observer.start()
+        self.scan()
+
+    def stop(self) -> None:
+        with self._lock:
+            if self._observer is None:
+                return
+            self._observer.stop()
+            self._observer = None
+
+    def scan(self) -> None:
+        """Replays the current directory state, used once on start."""
+        for directory, _, filenames in os.walk(self.path):
+            for filename in sorted(filenames):
+                path = os.path.join(directory, filename)
+                if filename.endswith(SEGMENT_EXTENSION):
+                    self._dispatch('on_segment_closed', path)
+            for filename in filenames:
+                if filename.endswith(PLAYLIST_EXTENSION):
+                    self._dispatch('on_playlist_updated', os.path.join(directory, filename))
+
+    def _dispatch(self, method: str, path: str) -> None:
+        stream = hls__stream_name(path=path)
+        for listener in self.listeners:
+            try:
+                getattr(listener, method)(stream, path)
+            except Exception:
+                logger.exception('hls_watcher.listener_failed', listener=type(listener).__name__, path=path)
+
+    def on_closed(self, event: FileSystemEvent) -> None:
+        if not event.is_directory and event.src_path.endswith(SEGMENT_EXTENSION):
+            self._dispatch('on_segment_closed', event.src_path)
+
+    def on_moved(self, event: FileSystemEvent) -> None:
+        if not event.is_directory and event.dest_path.endswith(PLAYLIST_EXTENSION):
+            self._dispatch('on_playlist_updated', event.dest_path)
+
+    def on_deleted(self, event: FileSystemEvent) -> None:
+        if event.is_directory:
+            return
+        if event.src_path.endswith(SEGMENT_EXTENSION):
+            self._dispatch('on_segment_removed', event.src_path)
+        elif event.src_path.endswith(PLAYLIST_EXTENSION):
+            # hls_cleanup removes the playlist once the stream is over
+            self._dispatch('on_playlist_removed', event.src_path)
+
+
+hls_watcher = HlsDirectoryWatcher(path=settings.HLS_PATH)
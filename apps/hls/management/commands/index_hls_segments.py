@@ -0,0 +1,66 @@
+import threading
+import typing
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.hls.logic.health import StreamHealthMonitor
+from apps.hls.logic.indexer import SegmentIndexer
+from apps.hls.logic.interactors.rendition import rendition__sync
+from apps.hls.logic.interactors.storage import storage__evict_forever
+from apps.hls.logic.playlist import PlaylistService
+from apps.hls.logic.watcher import hls_watcher
+
+
+class Command(BaseCommand):
+    help = (
+        'Индексирует MPEG-TS сегменты hls_path (PTS, ключевые кадры, длительность, битрейт) по мере их записи '
+        'публикует здоровье трансляций в redis, сохраняет найденные качества (hls_variant) '
+        'и удерживает архив в пределах квот'
+    )
+
+    def add_arguments(self, parser: typing.Any) -> None:
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--max-delay', type=float, default=1.0, help='Секунд ожидания неполной пачки')
+
+    def handle(self, *args: typing.Any, **options: typing.Any) -> None:
+        monitor = StreamHealthMonitor(
+            window=settings.HLS_HEALTH_WINDOW,
+            stall_factor=settings.HLS_HEALTH_STALL_FACTOR,
+            forget_after=settings.HLS_HEALTH_FORGET_AFTER,
+        )
+        indexer = SegmentIndexer(
+            batch_size=options['batch_size'], max_delay=options['max_delay'], on_indexed=monitor.observe
+        )
+        threading.Thread(
+            target=monitor.publish_forever,
+            kwargs={'interval': settings.HLS_HEALTH_INTERVAL},
+            name='stream-health',
+            daemon=True,
+        ).start()
+        # the indexer is the only archive writer, eviction runs next to it
+        threading.Thread(
+            target=storage__evict_forever,
+            kwargs={
+                'interval': settings.HLS_ARCHIVE_EVICT_INTERVAL,
+                'quota': settings.HLS_ARCHIVE_QUOTA,
+                'stream_quota': settings.HLS_ARCHIVE_STREAM_QUOTA,
+                'min_idle': settings.HLS_ARCHIVE_EVICT_MIN_IDLE,
+            },
+            name='archive-storage',
+            daemon=True,
+        ).start()
+        hls_watcher.subscribe(indexer)
+        # one writer for the rendition table, the web workers only keep master playlists in memory
+        hls_watcher.subscribe(PlaylistService(
+            variant_suffixes=settings.HLS_VARIANT_SUFFIXES,
+            on_renditions_changed=lambda stream, renditions: rendition__sync(stream=stream, renditions=renditions),
+        ))
+        # existing segments are replayed on start, upserts make re-indexing harmless
+        hls_watcher.start()
+        try:
+            indexer.run_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            hls_watcher.stop()
@@ -0,0 +1,13 @@
+import typing
+
+from django.core.management.base import BaseCommand
+
+from apps.hls.logic.interactors.storage import storage__rebuild
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает занятое архивом место по трансляциям и часам из таблицы сегментов, без обхода диска'
+
+    def handle(self, *args: typing.Any, **options: typing.Any) -> None:
+        buckets = storage__rebuild()
+        self.stdout.write(f'Учтено часов архива: {buckets}')
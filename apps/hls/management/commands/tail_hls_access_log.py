@@ -0,0 +1,24 @@
+import typing
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.hls.logic.access_log import AccessLogTailer
+
+
+class Command(BaseCommand):
+    help = 'Читает access log nginx (log_format hls_delivery) и считает трафик и уникальных зрителей трансляций'
+
+    def add_arguments(self, parser: typing.Any) -> None:
+        parser.add_argument('--path', default=settings.HLS_ACCESS_LOG_PATH)
+        parser.add_argument('--batch-lines', type=int, default=50000)
+        parser.add_argument('--max-delay', type=float, default=1.0, help='Секунд ожидания неполной пачки')
+
+    def handle(self, *args: typing.Any, **options: typing.Any) -> None:
+        tailer = AccessLogTailer(
+            path=options['path'], batch_lines=options['batch_lines'], max_delay=options['max_delay']
+        )
+        try:
+            tailer.run_forever()
+        except KeyboardInterrupt:
+            pass
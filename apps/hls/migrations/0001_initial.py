@@ -0,0 +1,125 @@
+# Generated by Django 4.2.8 on 2026-10-18 12:00
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="Segment",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "stream",
+                    models.CharField(
+                        help_text="Имя потока nginx-rtmp",
+                        max_length=512,
+                        verbose_name="Трансляция",
+                    ),
+                ),
+                (
+                    "sequence",
+                    models.BigIntegerField(
+                        help_text="Media sequence number сегмента, сквозной при hls_continuous on",
+                        verbose_name="Номер",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        help_text="Имя файла сегмента в hls_path",
+                        max_length=255,
+                        verbose_name="Файл",
+                    ),
+                ),
+                (
+                    "size",
+                    models.PositiveBigIntegerField(
+                        help_text="Размер сегмента в байтах", verbose_name="Размер"
+                    ),
+                ),
+                (
+                    "duration",
+                    models.FloatField(
+                        help_text="Длительность сегмента в секундах",
+                        verbose_name="Длительность",
+                    ),
+                ),
+                (
+                    "bitrate",
+                    models.PositiveIntegerField(
+                        help_text="Средний битрейт сегмента, бит/с",
+                        verbose_name="Битрейт",
+                    ),
+                ),
+                (
+                    "first_pts",
+                    models.BigIntegerField(
+                        help_text="Наименьший PTS сегмента, 90 кГц",
+                        verbose_name="Первый PTS",
+                    ),
+                ),
+                (
+                    "keyframe_offsets",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.BigIntegerField(),
+                        blank=True,
+                        default=list,
+                        help_text="Смещения в байтах TS пакетов с random access indicator",
+                        size=None,
+                        verbose_name="Смещения ключевых кадров",
+                    ),
+                ),
+                (
+                    "keyframe_pts",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.BigIntegerField(),
+                        blank=True,
+                        default=list,
+                        help_text="PTS ключевых кадров, 90 кГц",
+                        size=None,
+                        verbose_name="PTS ключевых кадров",
+                    ),
+                ),
+                (
+                    "lost_sync",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Количество пакетов без sync byte",
+                        verbose_name="Потеря синхронизации",
+                    ),
+                ),
+                (
+                    "indexed_at",
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text="Время индексации",
+                        verbose_name="Проиндексирован",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Сегмент HLS",
+                "verbose_name_plural": "Сегменты HLS",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="segment",
+            constraint=models.UniqueConstraint(
+                fields=("stream", "sequence"), name="hls_segment_stream_sequence_unique"
+            ),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.8 on 2026-10-18 13:00
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("hls", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="segment",
+            name="last_pts",
+            field=models.BigIntegerField(
+                default=0,
+                help_text="PTS конца сегмента, 90 кГц",
+                verbose_name="Последний PTS",
+            ),
+        ),
+        migrations.AddField(
+            model_name="segment",
+            name="started_at",
+            field=models.DateTimeField(
+                help_text="Время начала сегмента по часам сервера",
+                null=True,
+                verbose_name="Начало",
+            ),
+        ),
+        migrations.AddField(
+            model_name="segment",
+            name="archive_path",
+            field=models.CharField(
+                blank=True,
+                help_text="Путь сегмента относительно HLS_ARCHIVE_PATH",
+                max_length=1024,
+                null=True,
+                verbose_name="Путь в архиве",
+            ),
+        ),
+        migrations.RemoveConstraint(
+            model_name="segment",
+            name="hls_segment_stream_sequence_unique",
+        ),
+        migrations.AddConstraint(
+            model_name="segment",
+            constraint=models.UniqueConstraint(
+                fields=("stream", "started_at"), name="hls_segment_stream_started_unique"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="segment",
+            index=django.contrib.postgres.indexes.BrinIndex(
+                fields=["started_at"], name="hls_segment_started_brin"
+            ),
+        ),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 4.2.8 on 2026-10-18 15:00
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("hls", "0002_segment_archive"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StreamDelivery",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "stream",
+                    models.CharField(
+                        help_text="Имя потока nginx-rtmp",
+                        max_length=512,
+                        verbose_name="Трансляция",
+                    ),
+                ),
+                (
+                    "minute",
+                    models.DateTimeField(
+                        help_text="Начало минуты по access log nginx",
+                        verbose_name="Минута",
+                    ),
+                ),
+                (
+                    "bytes_sent",
+                    models.BigIntegerField(
+                        default=0,
+                        help_text="Байт сегментов, отданных nginx за минуту",
+                        verbose_name="Отдано байт",
+                    ),
+                ),
+                (
+                    "requests",
+                    models.IntegerField(
+                        default=0,
+                        help_text="Успешных запросов сегментов за минуту",
+                        verbose_name="Запросы",
+                    ),
+                ),
+                (
+                    "viewers",
+                    models.IntegerField(
+                        default=0,
+                        help_text="Оценка уникальных зрителей за минуту (HyperLogLog)",
+                        verbose_name="Зрители",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Отдача трансляции",
+                "verbose_name_plural": "Отдача трансляций",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="streamdelivery",
+            constraint=models.UniqueConstraint(
+                fields=("stream", "minute"), name="hls_delivery_stream_minute_unique"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="streamdelivery",
+            index=django.contrib.postgres.indexes.BrinIndex(
+                fields=["minute"], name="hls_delivery_minute_brin"
+            ),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 4.2.8 on 2026-10-18 16:00
+
+from django.db import migrations
+
+# monthly partitions by minute, see stream/0002 for the conventions
+STREAM_DELIVERY_PARTITION_SQL = [
+    "ALTER TABLE hls_streamdelivery RENAME TO hls_streamdelivery_unpartitioned",
+    # the rename keeps constraint and index names, free them for the partitioned table
+    "ALTER TABLE hls_streamdelivery_unpartitioned RENAME CONSTRAINT hls_streamdelivery_pkey "
+    "TO hls_streamdelivery_unpartitioned_pkey",
+    "ALTER TABLE hls_streamdelivery_unpartitioned DROP CONSTRAINT hls_delivery_stream_minute_unique",
+    "DROP INDEX hls_delivery_minute_brin",
+    "CREATE SEQUENCE hls_streamdelivery_pk_seq",
+    """
+    CREATE TABLE hls_streamdelivery (
+        id bigint NOT NULL DEFAULT nextval('hls_streamdelivery_pk_seq'),
+        stream varchar(512) NOT NULL,
+        minute timestamptz NOT NULL,
+        bytes_sent bigint NOT NULL,
+        requests integer NOT NULL,
+        viewers integer NOT NULL,
+        PRIMARY KEY (id, minute),
+        CONSTRAINT hls_delivery_stream_minute_unique UNIQUE (stream, minute)
+    ) PARTITION BY RANGE (minute)
+    """,
+    "ALTER SEQUENCE hls_streamdelivery_pk_seq OWNED BY hls_streamdelivery.id",
+    "CREATE INDEX hls_delivery_minute_brin ON hls_streamdelivery USING brin (minute)",
+    """
+    DO $$
+    DECLARE
+        month timestamptz;
+    BEGIN
+        FOR month IN
+            SELECT generate_series(
+                date_trunc(
+                    'month', COALESCE((SELECT min(minute) FROM hls_streamdelivery_unpartitioned), now()) AT TIME ZONE 'UTC'
+                ) AT TIME ZONE 'UTC',
+                date_trunc('month', now() AT TIME ZONE 'UTC') AT TIME ZONE 'UTC' + interval '2 months',
+                interval '1 month'
+            )
+        LOOP
+            EXECUTE format(
+                'CREATE TABLE IF NOT EXISTS %I PARTITION OF hls_streamdelivery FOR VALUES FROM (%L) TO (%L)',
+                'hls_streamdelivery_p' || to_char(month AT TIME ZONE 'UTC', 'YYYYMM'),
+                month,
+                month + interval '1 month'
+            );
+        END LOOP;
+    END $$;
+    """,
+    "INSERT INTO hls_streamdelivery SELECT id, stream, minute, bytes_sent, requests, viewers "
+    "FROM hls_streamdelivery_unpartitioned",
+    "SELECT setval('hls_streamdelivery_pk_seq', COALESCE(max(id), 0) + 1, false) FROM hls_streamdelivery",
+    "DROP TABLE hls_streamdelivery_unpartitioned",
+]
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("hls", "0003_streamdelivery"),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=STREAM_DELIVERY_PARTITION_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
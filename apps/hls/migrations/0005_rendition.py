@@ -0,0 +1,96 @@
+# Generated by Django 4.2.8 on 2026-10-18 17:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("hls", "0004_partition_streamdelivery"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Rendition",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "stream",
+                    models.CharField(
+                        db_index=True,
+                        help_text="Имя потока, под которым отдаётся master playlist",
+                        max_length=512,
+                        verbose_name="Трансляция",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        help_text="Имя потока nginx-rtmp с суффиксом hls_variant",
+                        max_length=512,
+                        verbose_name="Поток качества",
+                    ),
+                ),
+                (
+                    "bandwidth",
+                    models.IntegerField(
+                        help_text="BANDWIDTH, бит/с", verbose_name="Пиковый битрейт"
+                    ),
+                ),
+                (
+                    "average_bandwidth",
+                    models.IntegerField(
+                        blank=True,
+                        help_text="AVERAGE-BANDWIDTH, бит/с",
+                        null=True,
+                        verbose_name="Средний битрейт",
+                    ),
+                ),
+                (
+                    "resolution",
+                    models.CharField(
+                        blank=True,
+                        help_text="RESOLUTION, <ширина>x<высота>",
+                        max_length=32,
+                        null=True,
+                        verbose_name="Разрешение",
+                    ),
+                ),
+                (
+                    "codecs",
+                    models.CharField(
+                        blank=True,
+                        help_text="CODECS по RFC 6381",
+                        max_length=255,
+                        null=True,
+                        verbose_name="Кодеки",
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text="Время последнего изменения набора качеств",
+                        verbose_name="Обновлено",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Качество трансляции",
+                "verbose_name_plural": "Качества трансляций",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="rendition",
+            constraint=models.UniqueConstraint(
+                fields=("stream", "name"), name="hls_rendition_stream_name_unique"
+            ),
+        ),
+    ]
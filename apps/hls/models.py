@@ -0,0 +1,181 @@
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import BrinIndex
+from django.db import models
+
+from utils.abstractions.model import AbstractBaseModel
+
+
+class Segment(AbstractBaseModel):
+    class Meta:
+        verbose_name = 'Сегмент HLS'
+        verbose_name_plural = 'Сегменты HLS'
+        constraints = [
+            # nginx-rtmp restarts sequence numbers on republish, the start time identifies a segment
+            # and the index serves DVR windows of one stream
+            models.UniqueConstraint(fields=['stream', 'started_at'], name='hls_segment_stream_started_unique'),
+        ]
+        indexes = [
+            # rows arrive in time order, a BRIN covers archive-wide time scans for a few pages
+            BrinIndex(fields=['started_at'], name='hls_segment_started_brin'),
+        ]
+
+    stream = models.CharField(
+        max_length=512,
+        verbose_name='Трансляция',
+        help_text='Имя потока nginx-rtmp'
+    )
+    sequence = models.BigIntegerField(
+        verbose_name='Номер',
+        help_text='Media sequence number сегмента, сквозной при hls_continuous on'
+    )
+    name = models.CharField(
+        max_length=255,
+        verbose_name='Файл',
+        help_text='Имя файла сегмента в hls_path'
+    )
+    size = models.PositiveBigIntegerField(
+        verbose_name='Размер',
+        help_text='Размер сегмента в байтах'
+    )
+    duration = models.FloatField(
+        verbose_name='Длительность',
+        help_text='Длительность сегмента в секундах'
+    )
+    bitrate = models.PositiveIntegerField(
+        verbose_name='Битрейт',
+        help_text='Средний битрейт сегмента, бит/с'
+    )
+    first_pts = models.BigIntegerField(
+        verbose_name='Первый PTS',
+        help_text='Наименьший PTS сегмента, 90 кГц'
+    )
+    last_pts = models.BigIntegerField(
+        default=0,
+        verbose_name='Последний PTS',
+        help_text='PTS конца сегмента, 90 кГц'
+    )
+    started_at = models.DateTimeField(
+        null=True,
+        verbose_name='Начало',
+        help_text='Время начала сегмента по часам сервера'
+    )
+    archive_path = models.CharField(
+        max_length=1024,
+        null=True,
+        blank=True,
+        verbose_name='Путь в архиве',
+        help_text='Путь сегмента относительно HLS_ARCHIVE_PATH'
+    )
+    keyframe_offsets = ArrayField(
+        models.BigIntegerField(),
+        default=list,
+        blank=True,
+        verbose_name='Смещения ключевых кадров',
+        help_text='Смещения в байтах TS пакетов с random access indicator'
+    )
+    keyframe_pts = ArrayField(
+        models.BigIntegerField(),
+        default=list,
+        blank=True,
+        verbose_name='PTS ключевых кадров',
+        help_text='PTS ключевых кадров, 90 кГц'
+    )
+    lost_sync = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Потеря синхронизации',
+        help_text='Количество пакетов без sync byte'
+    )
+    indexed_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Проиндексирован',
+        help_text='Время индексации'
+    )
+
+
+class StreamDelivery(AbstractBaseModel):
+    """Partitioned by month of minute (migration 0004), the primary key is (id, minute) in the database."""
+
+    class Meta:
+        verbose_name = 'Отдача трансляции'
+        verbose_name_plural = 'Отдача трансляций'
+        constraints = [
+            models.UniqueConstraint(fields=['stream', 'minute'], name='hls_delivery_stream_minute_unique'),
+        ]
+        indexes = [
+            BrinIndex(fields=['minute'], name='hls_delivery_minute_brin'),
+        ]
+
+    stream = models.CharField(
+        max_length=512,
+        verbose_name='Трансляция',
+        help_text='Имя потока nginx-rtmp'
+    )
+    minute = models.DateTimeField(
+        verbose_name='Минута',
+        help_text='Начало минуты по access log nginx'
+    )
+    bytes_sent = models.BigIntegerField(
+        default=0,
+        verbose_name='Отдано байт',
+        help_text='Байт сегментов, отданных nginx за минуту'
+    )
+    requests = models.IntegerField(
+        default=0,
+        verbose_name='Запросы',
+        help_text='Успешных запросов сегментов за минуту'
+    )
+    viewers = models.IntegerField(
+        default=0,
+        verbose_name='Зрители',
+        help_text='Оценка уникальных зрителей за минуту (HyperLogLog)'
+    )
+
+
+class Rendition(AbstractBaseModel):
+    class Meta:
+        verbose_name = 'Качество трансляции'
+        verbose_name_plural = 'Качества трансляций'
+        constraints = [
+            models.UniqueConstraint(fields=['stream', 'name'], name='hls_rendition_stream_name_unique'),
+        ]
+
+    stream = models.CharField(
+        max_length=512,
+        db_index=True,
+        verbose_name='Трансляция',
+        help_text='Имя потока, под которым отдаётся master playlist'
+    )
+    name = models.CharField(
+        max_length=512,
+        verbose_name='Поток качества',
+        help_text='Имя потока nginx-rtmp с суффиксом hls_variant'
+    )
+    bandwidth = models.IntegerField(
+        verbose_name='Пиковый битрейт',
+        help_text='BANDWIDTH, бит/с'
+    )
+    average_bandwidth = models.IntegerField(
+        null=True,
+        blank=True,
+        verbose_name='Средний битрейт',
+        help_text='AVERAGE-BANDWIDTH, бит/с'
+    )
+    resolution = models.CharField(
+        max_length=32,
+        null=True,
+        blank=True,
+        verbose_name='Разрешение',
+        help_text='RESOLUTION, <ширина>x<высота>'
+    )
+    codecs = models.CharField(
+        max_length=255,
+        null=True,
+        blank=True,
+        verbose_name='Кодеки',
+        help_text='CODECS по RFC 6381'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Обновлено',
+        help_text='Время последнего изменения набора качеств'
+    )
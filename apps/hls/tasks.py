@@ -0,0 +1,19 @@
+from django.conf import settings
+
+from config.celery import app
+from apps.hls.logic.interactors.delivery import delivery__flush
+from apps.hls.models import StreamDelivery
+from utils.celery.constant import QUEUE_HEAVY_LONG, QUEUE_LIGHT_LONG
+from utils.partitions import partition__maintain
+
+
+@app.task(queue=QUEUE_LIGHT_LONG, ignore_result=True)
+def delivery__flush_task() -> int:
+    return delivery__flush()
+
+
+@app.task(queue=QUEUE_HEAVY_LONG, ignore_result=True)
+def delivery_partitions__maintain_task() -> list[str]:
+    return partition__maintain(
+        table=StreamDelivery._meta.db_table, retention_months=settings.HLS_DELIVERY_RETENTION_MONTHS
+    )
@@ -0,0 +1,27 @@
+from apps.hls.logic.interactors.archive import archive__segment
+
+
+def test__archive__segment__republished_case(tmp_path, settings):
+    settings.HLS_ARCHIVE_PATH = str(tmp_path / 'archive')
+    first = tmp_path / 'first' / 'alice-3.ts'
+    second = tmp_path / 'second' / 'alice-3.ts'
+    first.parent.mkdir()
+    second.parent.mkdir()
+    first.write_bytes(b'first broadcast')
+    second.write_bytes(b'second broadcast')
+
+    first_path, first_archived = archive__segment(
+        path=str(first), stream='alice', name='alice-3.ts', started_at=1700000000
+    )
+    assert first_archived is True
+    assert archive__segment(path=str(first), stream='alice', name='alice-3.ts', started_at=1700000000) == (
+        first_path, False
+    )
+
+    second_path, second_archived = archive__segment(
+        path=str(second), stream='alice', name='alice-3.ts', started_at=1700000100
+    )
+    assert second_archived is True
+    assert second_path.endswith('/alice-3-1700000100000.ts')
+    assert (tmp_path / 'archive' / first_path).read_bytes() == b'first broadcast'
+    assert (tmp_path / 'archive' / second_path).read_bytes() == b'second broadcast'
@@ -0,0 +1,14 @@
+from apps.hls.logic.interactors.archive import archive__bucket, archive__relative_path, archive__shard, archive__stream
+
+
+def test__archive__stream__sharded_case():
+    archive_path = archive__relative_path(stream='alice', name='alice-3.ts', started_at=1700000000)
+
+    assert archive_path == f'{archive__shard(stream="alice")}/alice/2023/11/14/22/alice-3.ts'
+    assert archive__stream(archive_path=archive_path) == 'alice'
+    assert archive__stream(archive_path=archive__bucket(archive_path=archive_path)) == 'alice'
+
+
+def test__archive__stream__unsharded_case():
+    assert archive__stream(archive_path='alice/2023/11/14/22/alice-3.ts') == 'alice'
+    assert archive__stream(archive_path='2023/2023/11/14/22') == '2023'
@@ -0,0 +1,39 @@
+from apps.hls.logic.interactors.delivery import DeliveryCounters, delivery__count_lines
+
+
+def test__delivery__count_lines__success_case():
+    counters = DeliveryCounters()
+    lines = [
+        b'1700000000.120\t200\t1000\t/hls/alice-1.ts?t=k1.1700000100.7.sig\t10.0.0.2\tk1.1700000100.7.sig',
+        b'1700000010.500\t200\t3000\t/hls/alice-2.ts?t=k1.1700000100.7.sig\t10.0.0.3\tk1.1700000100.7.sig',
+        b'1700000020.000\t206\t500\t/hls/archive/alice/2023/11/14/22/alice-3.ts\t10.0.0.4\t-',
+        b'1700000030.000\t403\t150\t/hls/alice-3.ts\t10.0.0.5\t-',
+        b'1700000040.000\t200\t900\t/hls/alice.m3u8\t10.0.0.5\t-',
+        b'1700000061.000\t200\t700\t/hls/bob/5.ts\t10.0.0.2\t-',
+        b'garbage',
+    ]
+
+    delivery__count_lines(lines=lines, counters=counters)
+
+    assert counters.bytes_sent == {('alice', 1699999980): 4500, ('bob', 1700000040): 700}
+    assert counters.requests == {('alice', 1699999980): 3, ('bob', 1700000040): 1}
+    assert counters.viewers[('alice', 1699999980)] == {b'u:7', b'a:10.0.0.4'}
+    assert counters.lines == 7
+    assert counters.skipped == 1
+
+
+def test__delivery__count_lines__archive_access_case():
+    counters = DeliveryCounters()
+    lines = [
+        b'1700000020.000\t200\t500\t/hls/archive/3f/alice/2023/11/14/22/alice-3.ts?t=x\t10.0.0.4\tx',
+        b'1700000010.000\t200\t500\t/hls/archive/3f/alice/2023/11/14/22/alice-2.ts\t10.0.0.4\t-',
+        b'1700000030.000\t200\t500\t/hls/archive/alice/2023/11/14/21/alice-1.ts\t10.0.0.4\t-',
+    ]
+
+    delivery__count_lines(lines=lines, counters=counters)
+
+    assert counters.bytes_sent == {('alice', 1699999980): 1500}
+    assert counters.archive_accesses == {
+        '3f/alice/2023/11/14/22': 1700000020.0,
+        'alice/2023/11/14/21': 1700000030.0,
+    }
@@ -0,0 +1,26 @@
+from apps.hls.logic.interactors.dvr import dvr__render_playlist
+
+
+def test__dvr__render_playlist__vod_case():
+    segments = [
+        (10, 2.0, 'stream/2026/10/18/12/stream-10.ts'),
+        (11, 2.0, 'stream/2026/10/18/12/stream-11.ts'),
+        (15, 1.5, 'stream/2026/10/18/12/stream-15.ts'),
+    ]
+
+    body = dvr__render_playlist(segments=segments, uri_prefix='/hls/archive/', ended=True).decode()
+
+    assert '#EXT-X-MEDIA-SEQUENCE:10\n' in body
+    assert '#EXT-X-PLAYLIST-TYPE:VOD\n' in body
+    assert body.count('#EXT-X-DISCONTINUITY\n') == 1
+    assert '/hls/archive/stream/2026/10/18/12/stream-15.ts\n' in body
+    assert body.endswith('#EXT-X-ENDLIST\n')
+
+
+def test__dvr__render_playlist__sliding_case():
+    body = dvr__render_playlist(
+        segments=[(1, 2.0, 'stream/2026/10/18/12/stream-1.ts')], uri_prefix='/hls/archive/', ended=False
+    ).decode()
+
+    assert '#EXT-X-ENDLIST' not in body
+    assert '#EXT-X-PLAYLIST-TYPE' not in body
@@ -0,0 +1,27 @@
+from apps.hls.logic.segments import HotSegmentCache
+
+
+def test__hot_segment_cache__eviction_case(tmp_path):
+    cache = HotSegmentCache(per_stream=2)
+    paths = []
+    for sequence in range(3):
+        path = tmp_path / f'stream-{sequence}.ts'
+        path.write_bytes(bytes([sequence]) * 188)
+        paths.append(str(path))
+        cache.on_segment_closed('stream', str(path))
+
+    assert cache.get('stream', paths[0]) is None
+    assert cache.get('stream', paths[2]) == bytes([2]) * 188
+
+
+def test__hot_segment_cache__removed_case(tmp_path):
+    cache = HotSegmentCache(per_stream=2)
+    path = tmp_path / 'stream-0.ts'
+    path.write_bytes(b'\x47' * 188)
+    cache.on_segment_closed('stream', str(path))
+    body = cache.get('stream', str(path))
+
+    cache.on_segment_removed('stream', str(path))
+
+    assert cache.get('stream', str(path)) is None
+    assert body == b'\x47' * 188
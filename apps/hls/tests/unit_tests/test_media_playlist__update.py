@@ -0,0 +1,41 @@
+from apps.hls.logic.playlist import MediaPlaylist
+
+
+def _playlist_text(*, media_sequence: int, count: int) -> str:
+    lines = ['#EXTM3U', '#EXT-X-VERSION:3', f'#EXT-X-MEDIA-SEQUENCE:{media_sequence}', '#EXT-X-TARGETDURATION:2']
+    for sequence in range(media_sequence, media_sequence + count):
+        lines += ['#EXTINF:2.000,', f'stream-{sequence}.ts']
+    return '\n'.join(lines) + '\n'
+
+
+def test__media_playlist__update__incremental_case():
+    playlist = MediaPlaylist(stream='stream')
+    assert playlist.update(_playlist_text(media_sequence=0, count=3))
+    first = playlist.rendered
+
+    assert playlist.update(_playlist_text(media_sequence=1, count=3))
+
+    assert [segment.uri for segment in playlist.segments] == ['stream-1.ts', 'stream-2.ts', 'stream-3.ts']
+    assert b'#EXT-X-MEDIA-SEQUENCE:1\n' in playlist.rendered.body
+    assert b'stream-0.ts' not in playlist.rendered.body
+    assert playlist.rendered.body.endswith(b'stream-3.ts\n')
+    assert b'#EXT-X-PRELOAD-HINT' not in playlist.rendered.body
+    assert playlist.rendered.etag != first.etag
+
+
+def test__media_playlist__update__unchanged_case():
+    playlist = MediaPlaylist(stream='stream')
+    playlist.update(_playlist_text(media_sequence=5, count=2))
+    rendered = playlist.rendered
+
+    assert not playlist.update(_playlist_text(media_sequence=5, count=2))
+    assert playlist.rendered is rendered
+
+
+def test__media_playlist__update__restarted_sequence_case():
+    playlist = MediaPlaylist(stream='stream')
+    playlist.update(_playlist_text(media_sequence=10, count=2))
+
+    assert playlist.update(_playlist_text(media_sequence=0, count=1))
+
+    assert [segment.sequence for segment in playlist.segments] == [0]
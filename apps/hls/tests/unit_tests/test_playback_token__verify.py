@@ -0,0 +1,33 @@
+import time
+
+from apps.hls.logic.interactors.playback_token import (
+    playback_token__issue, playback_token__verify, playback_token_cache
+)
+
+
+def test__playback_token__verify__success_case():
+    token = playback_token__issue(stream='stream', user_id=1)
+
+    assert playback_token__verify(stream='stream', token=token)
+    # the second check is answered from the cache
+    assert playback_token__verify(stream='stream', token=token)
+
+
+def test__playback_token__verify__other_stream_case():
+    token = playback_token__issue(stream='stream', user_id=1)
+
+    assert not playback_token__verify(stream='other', token=token)
+
+
+def test__playback_token__verify__tampered_case():
+    kid, expires, user_id, signature = playback_token__issue(stream='stream', user_id=1).split('.')
+
+    assert not playback_token__verify(stream='stream', token=f'{kid}.{expires}.2.{signature}')
+    assert not playback_token__verify(stream='stream', token='garbage')
+
+
+def test__playback_token__verify__expired_case():
+    playback_token_cache.clear()
+    token = playback_token__issue(stream='stream', user_id=1, now=time.time() - 3600)
+
+    assert not playback_token__verify(stream='stream', token=token)
@@ -0,0 +1,61 @@
+from apps.hls.logic.playlist import PlaylistService
+
+MASTER = (
+    '#EXTM3U\n'
+    '#EXT-X-VERSION:3\n'
+    '#EXT-X-STREAM-INF:PROGRAM-ID=1,BANDWIDTH=3000000,RESOLUTION=1280x720,CODECS="avc1.64001f,mp4a.40.2"\n'
+    'alice_hi/index.m3u8\n'
+    '#EXT-X-STREAM-INF:PROGRAM-ID=1,BANDWIDTH=800000,RESOLUTION=640x360\n'
+    'alice_low/index.m3u8\n'
+)
+
+
+def _write_rendition(tmp_path, name: str, media_sequence: int = 0) -> str:
+    directory = tmp_path / name
+    directory.mkdir(exist_ok=True)
+    (directory / f'{media_sequence}.ts').write_bytes(b'\x47' * 188 * 100)
+    path = directory / 'index.m3u8'
+    path.write_text(
+        f'#EXTM3U\n#EXT-X-MEDIA-SEQUENCE:{media_sequence}\n#EXT-X-TARGETDURATION:2\n'
+        f'#EXTINF:2.000,\n{media_sequence}.ts\n'
+    )
+    return str(path)
+
+
+def test__playlist_service__renditions__declared_case(tmp_path, settings, mocker):
+    settings.HLS_PATH = str(tmp_path)
+    on_renditions_changed = mocker.Mock()
+    service = PlaylistService(on_renditions_changed=on_renditions_changed)
+    master_path = tmp_path / 'alice.m3u8'
+    master_path.write_text(MASTER)
+
+    service.on_playlist_updated('alice', str(master_path))
+    service.on_playlist_updated('alice_low', _write_rendition(tmp_path, 'alice_low'))
+    service.on_playlist_updated('alice_hi', _write_rendition(tmp_path, 'alice_hi'))
+    # new segments do not change the rendition set
+    service.on_playlist_updated('alice_hi', _write_rendition(tmp_path, 'alice_hi', media_sequence=1))
+
+    assert service.get_master('alice').body == (
+        b'#EXTM3U\n'
+        b'#EXT-X-INDEPENDENT-SEGMENTS\n'
+        b'#EXT-X-STREAM-INF:BANDWIDTH=800000,RESOLUTION=640x360\n'
+        b'alice_low.m3u8\n'
+        b'#EXT-X-STREAM-INF:BANDWIDTH=3000000,RESOLUTION=1280x720,CODECS="avc1.64001f,mp4a.40.2"\n'
+        b'alice_hi.m3u8\n'
+    )
+    assert on_renditions_changed.call_count == 2
+
+
+def test__playlist_service__renditions__measured_case(tmp_path, settings):
+    settings.HLS_PATH = str(tmp_path)
+    service = PlaylistService(variant_suffixes=['_low'])
+
+    service.on_playlist_updated('alice_low', _write_rendition(tmp_path, 'alice_low'))
+
+    assert service.get_master('alice').body.endswith(
+        b'#EXT-X-STREAM-INF:BANDWIDTH=75200,AVERAGE-BANDWIDTH=75200\nalice_low.m3u8\n'
+    )
+
+    service.on_playlist_removed('alice_low', str(tmp_path / 'alice_low' / 'index.m3u8'))
+
+    assert service.get_master('alice') is None
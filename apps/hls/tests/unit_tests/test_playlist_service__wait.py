@@ -0,0 +1,39 @@
+import asyncio
+
+from apps.hls.logic.playlist import PlaylistService
+
+
+def _playlist_text(*, media_sequence: int, count: int) -> str:
+    lines = ['#EXTM3U', f'#EXT-X-MEDIA-SEQUENCE:{media_sequence}', '#EXT-X-TARGETDURATION:2']
+    for sequence in range(media_sequence, media_sequence + count):
+        lines += ['#EXTINF:2.000,', f'stream-{sequence}.ts']
+    return '\n'.join(lines) + '\n'
+
+
+def test__playlist_service__wait__success_case(tmp_path):
+    path = tmp_path / 'stream.m3u8'
+    path.write_text(_playlist_text(media_sequence=0, count=2))
+    service = PlaylistService()
+    service.on_playlist_updated('stream', str(path))
+
+    async def wait_for_next_segment():
+        waiter = asyncio.create_task(service.wait(stream='stream', msn=2, timeout=1))
+        await asyncio.sleep(0)
+        path.write_text(_playlist_text(media_sequence=0, count=3))
+        # the watcher thread publishes the update
+        await asyncio.to_thread(service.on_playlist_updated, 'stream', str(path))
+        return await waiter
+
+    rendered = asyncio.run(wait_for_next_segment())
+
+    assert b'stream-2.ts' in rendered.body
+
+
+def test__playlist_service__wait__timeout_case(tmp_path):
+    path = tmp_path / 'stream.m3u8'
+    path.write_text(_playlist_text(media_sequence=0, count=2))
+    service = PlaylistService()
+    service.on_playlist_updated('stream', str(path))
+
+    assert asyncio.run(service.wait(stream='stream', msn=2, timeout=0.01)) is None
+    assert not service._waiters
@@ -0,0 +1,64 @@
+import pytest
+
+from apps.hls.dto.segment import SegmentIndexDto
+from apps.hls.logic.health import StreamHealthMonitor
+
+
+def make_index(*, sequence: int, closed_at: float, duration: float = 2.0, size: int = 250000) -> SegmentIndexDto:
+    return SegmentIndexDto(
+        stream='stream',
+        sequence=sequence,
+        name=f'stream-{sequence}.ts',
+        size=size,
+        duration=duration,
+        bitrate=int(size * 8 / duration),
+        first_pts=0,
+        last_pts=0,
+        closed_at=closed_at,
+        keyframe_offsets=[],
+        keyframe_pts=[],
+        packets=size // 188,
+        lost_sync=0,
+    )
+
+
+def test__stream_health_monitor__snapshot__steady_case():
+    monitor = StreamHealthMonitor(window=4, stall_factor=3, forget_after=60)
+    monitor.observe([make_index(sequence=sequence, closed_at=100 + sequence * 2) for sequence in range(6)])
+
+    health, = monitor.snapshot(now=111)
+
+    assert health.segments == 4
+    assert health.bitrate == 1000000
+    assert health.duration_variance == 0
+    assert health.jitter == 0
+    assert health.last_segment_at == 110
+    assert not health.stalled
+
+
+def test__stream_health_monitor__snapshot__jitter_case():
+    monitor = StreamHealthMonitor(window=4, stall_factor=3, forget_after=60)
+    monitor.observe([
+        make_index(sequence=sequence, closed_at=closed_at) for sequence, closed_at in enumerate([0, 1, 4, 6])
+    ])
+
+    health, = monitor.snapshot(now=6)
+
+    # arrival intervals 1, 3, 2 against 2 second segments
+    assert health.jitter == pytest.approx((2 / 3) ** 0.5)
+
+
+def test__stream_health_monitor__snapshot__stalled_case():
+    monitor = StreamHealthMonitor(window=4, stall_factor=3, forget_after=60)
+    monitor.observe([make_index(sequence=0, closed_at=100)])
+
+    health, = monitor.snapshot(now=107)
+
+    assert health.stalled
+
+
+def test__stream_health_monitor__snapshot__forgotten_case():
+    monitor = StreamHealthMonitor(window=4, stall_factor=3, forget_after=60)
+    monitor.observe([make_index(sequence=0, closed_at=100)])
+
+    assert monitor.snapshot(now=161) == []
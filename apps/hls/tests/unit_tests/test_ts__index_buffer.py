@@ -0,0 +1,69 @@
+import pytest
+
+from apps.hls.logic.ts import TsParseError, ts__index_buffer
+
+PMT_PID = 0x1000
+VIDEO_PID = 0x100
+
+
+def _packet(pid: int, payload: bytes, *, start: bool = False, random_access: bool = False) -> bytes:
+    header = bytes([0x47, (0x40 if start else 0) | (pid >> 8), pid & 0xFF])
+    room = 184 - len(payload)
+    if not room and not random_access:
+        return header + bytes([0x10]) + payload
+    # the adaptation field carries the random access indicator and stuffs the packet to 188 bytes
+    adaptation_length = room - 1
+    adaptation = bytes([adaptation_length])
+    if adaptation_length:
+        adaptation += bytes([0x40 if random_access else 0x00]) + b'\xff' * (adaptation_length - 1)
+    return header + bytes([0x30]) + adaptation + payload
+
+
+def _pts(pts: int) -> bytes:
+    return bytes([
+        0x21 | ((pts >> 29) & 0x0E),
+        (pts >> 22) & 0xFF,
+        0x01 | ((pts >> 14) & 0xFE),
+        (pts >> 7) & 0xFF,
+        0x01 | ((pts << 1) & 0xFE),
+    ])
+
+
+def _segment(*pts_values: int) -> bytes:
+    pat = bytes([0x00, 0xB0, 13, 0x00, 0x01, 0xC1, 0x00, 0x00, 0x00, 0x01, 0xE0 | PMT_PID >> 8, PMT_PID & 0xFF])
+    pmt = bytes([
+        0x02, 0xB0, 18, 0x00, 0x01, 0xC1, 0x00, 0x00, 0xE0 | VIDEO_PID >> 8, VIDEO_PID & 0xFF, 0xF0, 0x00,
+        0x1B, 0xE0 | VIDEO_PID >> 8, VIDEO_PID & 0xFF, 0xF0, 0x00,
+    ])
+    crc = b'\x00' * 4
+    packets = [
+        _packet(0, b'\x00' + pat + crc, start=True),
+        _packet(PMT_PID, b'\x00' + pmt + crc, start=True),
+    ]
+    for index, pts in enumerate(pts_values):
+        pes = b'\x00\x00\x01\xe0\x00\x00\x80\x80\x05' + _pts(pts) + b'\x00' * 32
+        packets.append(_packet(VIDEO_PID, pes, start=True, random_access=index == 0))
+    return b''.join(packets)
+
+
+def test__ts__index_buffer__success_case():
+    index = ts__index_buffer(_segment(90000, 93600, 97200))
+
+    assert index['first_pts'] == 90000
+    assert index['last_pts'] == 100800
+    assert index['duration'] == pytest.approx(0.12)
+    assert index['keyframe_offsets'] == [2 * 188]
+    assert index['keyframe_pts'] == [90000]
+    assert index['packets'] == 5
+
+
+def test__ts__index_buffer__pts_wrap_case():
+    index = ts__index_buffer(_segment(2 ** 33 - 3600, 0, 3600))
+
+    assert index['duration'] == pytest.approx(0.12)
+    assert index['first_pts'] == 2 ** 33 - 3600
+
+
+def test__ts__index_buffer__invalid_case():
+    with pytest.raises(TsParseError):
+        ts__index_buffer(b'\x00' * 188 * 3)
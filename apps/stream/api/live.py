@@ -0,0 +1,33 @@
+from asgiref.sync import sync_to_async
+
+from apps.stream.logic.selectors.live import live__streams
+from apps.stream.logic.selectors.stat import stat__snapshot
+from apps.user.logic.interactors.internal import internal__authorized
+from utils.asgi import Request, Response, Router, json_response
+
+
+async def live_streams(request: Request) -> Response:
+    if not await internal__authorized(request=request):
+        return Response(status=401)
+    streams = await sync_to_async(live__streams, thread_sensitive=False)()
+    return json_response({'data': [stream.dict() for stream in streams]})
+
+
+async def live_stat(request: Request) -> Response:
+    """Latest nginx-rtmp /stat snapshot, served as stored by the poller, nodes are never called from here."""
+    if not await internal__authorized(request=request):
+        return Response(status=401)
+    snapshot = await sync_to_async(stat__snapshot, thread_sensitive=False)()
+    if snapshot is None:
+        return Response(status=503)
+    version, body = snapshot
+    etag = f'"{version}"'
+    if etag == request.headers.get('if-none-match'):
+        return Response(status=304, headers=[('etag', etag)])
+    return Response(body=body, headers=[('etag', etag), ('cache-control', 'no-cache')], content_type='application/json')
+
+
+stream_router = Router([
+    ('GET', r'/streams/live/?', live_streams),
+    ('GET', r'/streams/stat/?', live_stat),
+])
@@ -0,0 +1,18 @@
+LIVE_STREAMS_KEY = 'live:streams'  # set of live stream names
+LIVE_VIEWERS_KEY = 'live:viewers'  # hash stream name -> RTMP players count
+LIVE_SESSIONS_KEY = 'live:sessions'  # hash session key -> LiveSessionDto json
+LIVE_FINISHED_KEY = 'live:finished'  # list of finished LiveSessionDto json, drained into postgres
+
+SESSION_KIND_PUBLISH = 'publish'
+SESSION_KIND_PLAY = 'play'
+
+INGEST_NODES_KEY = 'ingest:nodes'  # hash node name -> IngestNodeDto json, refreshed by heartbeats
+
+RTMP_STAT_VERSION_KEY = 'rtmp:stat:version'  # version of the latest /stat snapshot
+RTMP_STAT_SNAPSHOT_KEY = 'rtmp:stat:snapshot:{version}'  # snapshot json, expires once superseded
+
+# transaction advisory lock held while sessions are written and rolled up, so ids become visible in order
+STREAM_SESSION_LOCK_ID = 0x5E55_1017
+# session advisory lock of the single flusher moving finished sessions out of redis
+STREAM_SESSION_FLUSH_LOCK_ID = 0x5E55_1018
+STREAM_USAGE_WATERMARK = 'stream_usage'
@@ -0,0 +1,24 @@
+from utils.dto import BaseDto
+
+
+class IngestNodeDto(BaseDto):
+    node: str
+    url: str  # rtmp://host:port/app publishers are sent to
+    addr: str  # address the node calls the rtmp callbacks from
+    publishers: int
+    bandwidth: int  # incoming bits per second
+    cpu: float  # load average per core
+    heartbeat_at: float
+    stat_url: str = ''  # rtmp_stat location of the node
+
+
+class StreamStatDto(BaseDto):
+    node: str
+    app: str
+    stream: str
+    publishing: bool
+    clients: int  # players and the publisher
+    bytes_in: int
+    bytes_out: int
+    bw_in: int  # bits per second
+    bw_out: int
@@ -0,0 +1,25 @@
+from utils.dto import BaseDto
+
+
+class LiveSessionDto(BaseDto):
+    kind: str
+    stream: str
+    node: str
+    client_id: str
+    addr: str | None
+    user_id: int | None
+    started_at: float
+    finished_at: float | None
+
+    @property
+    def session_key(self) -> str:
+        return f'{self.node}:{self.client_id}'
+
+    @property
+    def session_id(self) -> str:
+        return f'{self.node}:{self.client_id}:{self.started_at:.3f}'
+
+
+class LiveStreamDto(BaseDto):
+    stream: str
+    viewers: int
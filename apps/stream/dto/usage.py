@@ -0,0 +1,10 @@
+import datetime
+
+from utils.dto import BaseDto
+
+
+class StreamUsageDto(BaseDto):
+    bucket: datetime.datetime | None  # None for totals of a window
+    publish_seconds: float
+    view_seconds: float
+    play_sessions: int
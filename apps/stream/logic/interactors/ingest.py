@@ -0,0 +1,115 @@
+import bisect
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+
+from apps.stream.constants import INGEST_NODES_KEY
+from apps.stream.dto.ingest import IngestNodeDto
+from utils.redis import PushedHashTable
+
+ingest_nodes = PushedHashTable(
+    name=INGEST_NODES_KEY,
+    alias='redis',
+    decode_key=str,
+    decode_value=IngestNodeDto.parse_raw,
+    encode_value=IngestNodeDto.json,
+)
+
+
+def ingest__hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), 'big')
+
+
+def ingest_node__heartbeat(*, node: IngestNodeDto) -> None:
+    ingest_nodes.set(node.node, node)
+
+
+class IngestPlacement:
+    """
+    Consistent hashing with bounded loads over the live ingest nodes.
+    A stream keeps landing on the same node across reconnects unless that node is above
+    balance_factor times the average load, then the next node on the ring takes it.
+    Everything is in memory: the ring is rebuilt only when the set of live nodes changes,
+    placements made since a node's last heartbeat are counted locally.
+    """
+
+    def __init__(self, *, virtual_nodes: int, balance_factor: float, node_ttl: float, max_cpu: float) -> None:
+        self.virtual_nodes = virtual_nodes
+        self.balance_factor = balance_factor
+        self.node_ttl = node_ttl
+        self.max_cpu = max_cpu
+        self._ring_nodes: frozenset[str] = frozenset()
+        self._ring_hashes: list[int] = []
+        self._ring_owners: list[str] = []
+        # node -> (heartbeat_at the count applies to, placements since that heartbeat)
+        self._pending: dict[str, tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def live_nodes(self, now: float | None = None) -> dict[str, IngestNodeDto]:
+        now = time.time() if now is None else now
+        return {
+            name: node for name, node in ingest_nodes.items()
+            if now - node.heartbeat_at <= self.node_ttl
+        }
+
+    def node_by_addr(self, addr: str) -> IngestNodeDto | None:
+        for node in self.live_nodes().values():
+            if node.addr == addr:
+                return node
+        return None
+
+    def _rebuild_ring(self, names: frozenset[str]) -> None:
+        points = sorted(
+            (ingest__hash(f'{name}#{replica}'), name)
+            for name in names
+            for replica in range(self.virtual_nodes)
+        )
+        self._ring_hashes = [point for point, _ in points]
+        self._ring_owners = [name for _, name in points]
+        self._ring_nodes = names
+
+    def _load(self, node: IngestNodeDto) -> int:
+        heartbeat_at, pending = self._pending.get(node.node, (node.heartbeat_at, 0))
+        return node.publishers + (pending if heartbeat_at == node.heartbeat_at else 0)
+
+    def place(self, *, key: str) -> IngestNodeDto | None:
+        nodes = self.live_nodes()
+        if not nodes:
+            return None
+        with self._lock:
+            names = frozenset(nodes)
+            if names != self._ring_nodes:
+                self._rebuild_ring(names)
+            loads = {name: self._load(node) for name, node in nodes.items()}
+            capacity = math.ceil((sum(loads.values()) + 1) / len(nodes) * self.balance_factor)
+            chosen = None
+            start = bisect.bisect(self._ring_hashes, ingest__hash(key))
+            seen = set()
+            for offset in range(len(self._ring_owners)):
+                name = self._ring_owners[(start + offset) % len(self._ring_owners)]
+                if name in seen:
+                    continue
+                seen.add(name)
+                if loads[name] + 1 <= capacity and nodes[name].cpu < self.max_cpu:
+                    chosen = nodes[name]
+                    break
+                if len(seen) == len(nodes):
+                    break
+            if chosen is None:
+                # everything is above the bound, the least loaded node that is not cpu bound
+                chosen = min(
+                    nodes.values(), key=lambda node: (node.cpu >= self.max_cpu, loads[node.node], node.cpu)
+                )
+            self._pending[chosen.node] = (chosen.heartbeat_at, loads[chosen.node] - chosen.publishers + 1)
+            return chosen
+
+
+ingest_placement = IngestPlacement(
+    virtual_nodes=settings.INGEST_VIRTUAL_NODES,
+    balance_factor=settings.INGEST_BALANCE_FACTOR,
+    node_ttl=settings.INGEST_NODE_TTL,
+    max_cpu=settings.INGEST_NODE_MAX_CPU,
+)
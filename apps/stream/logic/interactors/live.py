@@ -0,0 +1,54 @@
+import time
+
+from django_redis import get_redis_connection
+
+from apps.stream.constants import (
+    LIVE_FINISHED_KEY, LIVE_SESSIONS_KEY, LIVE_STREAMS_KEY, LIVE_VIEWERS_KEY, SESSION_KIND_PLAY,
+    SESSION_KIND_PUBLISH
+)
+from apps.stream.dto.session import LiveSessionDto
+
+# pops the session, updates the counters and queues it for the flush atomically,
+# duplicate done-callbacks become no-ops; live sessions are stored without finished_at, it is appended here
+PLAY_FINISHED_SCRIPT = """
+local session = redis.call('HGET', KEYS[1], ARGV[1])
+if not session then return false end
+redis.call('HDEL', KEYS[1], ARGV[1])
+if redis.call('HINCRBY', KEYS[2], ARGV[2], -1) <= 0 then
+    redis.call('HDEL', KEYS[2], ARGV[2])
+end
+local finished = string.sub(session, 1, -2) .. ', "finished_at": ' .. ARGV[3] .. '}'
+redis.call('RPUSH', KEYS[4], finished)
+return finished
+"""
+PUBLISH_FINISHED_SCRIPT = """
+local session = redis.call('HGET', KEYS[1], ARGV[1])
+if not session then return false end
+redis.call('HDEL', KEYS[1], ARGV[1])
+redis.call('SREM', KEYS[3], ARGV[2])
+redis.call('HDEL', KEYS[2], ARGV[2])
+local finished = string.sub(session, 1, -2) .. ', "finished_at": ' .. ARGV[3] .. '}'
+redis.call('RPUSH', KEYS[4], finished)
+return finished
+"""
+
+
+def live__session_started(*, session: LiveSessionDto) -> None:
+    pipeline = get_redis_connection('redis').pipeline(transaction=True)
+    pipeline.hset(LIVE_SESSIONS_KEY, session.session_key, session.json(exclude={'finished_at'}))
+    if session.kind == SESSION_KIND_PUBLISH:
+        pipeline.sadd(LIVE_STREAMS_KEY, session.stream)
+    else:
+        pipeline.hincrby(LIVE_VIEWERS_KEY, session.stream, 1)
+    pipeline.execute()
+
+
+def live__session_finished(*, kind: str, stream: str, node: str, client_id: str) -> LiveSessionDto | None:
+    script = PLAY_FINISHED_SCRIPT if kind == SESSION_KIND_PLAY else PUBLISH_FINISHED_SCRIPT
+    raw_session = get_redis_connection('redis').eval(
+        script, 4, LIVE_SESSIONS_KEY, LIVE_VIEWERS_KEY, LIVE_STREAMS_KEY, LIVE_FINISHED_KEY,
+        f'{node}:{client_id}', stream, repr(time.time()),
+    )
+    if raw_session is None:
+        return None
+    return LiveSessionDto.parse_raw(raw_session)
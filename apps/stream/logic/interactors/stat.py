@@ -0,0 +1,68 @@
+import json
+import typing
+import urllib.request
+from xml.etree import ElementTree
+
+from django_redis import get_redis_connection
+
+from apps.stream.constants import RTMP_STAT_SNAPSHOT_KEY, RTMP_STAT_VERSION_KEY
+from apps.stream.dto.ingest import IngestNodeDto, StreamStatDto
+
+STREAM_STAT_FIELDS = ('bytes_in', 'bytes_out', 'bw_in', 'bw_out', 'nclients')
+
+
+def stat__parse(*, source: typing.BinaryIO, node: str) -> list[StreamStatDto]:
+    """
+    Per-stream records of an nginx-rtmp /stat document. Parsed incrementally: every stream
+    and client element is cleared once read, so memory stays flat with thousands of players.
+    Raises ElementTree.ParseError.
+    """
+    streams = []
+    path: list[str] = []
+    app = ''
+    for event, element in ElementTree.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            path.append(element.tag)
+            continue
+        path.pop()
+        if element.tag == 'name' and path and path[-1] == 'application':
+            app = element.text or ''
+        elif element.tag == 'client':
+            element.clear()
+        elif element.tag == 'stream':
+            values = {field: int(element.findtext(field) or 0) for field in STREAM_STAT_FIELDS}
+            streams.append(StreamStatDto(
+                node=node,
+                app=app,
+                stream=element.findtext('name') or '',
+                publishing=element.find('publishing') is not None,
+                clients=values['nclients'],
+                bytes_in=values['bytes_in'],
+                bytes_out=values['bytes_out'],
+                bw_in=values['bw_in'],
+                bw_out=values['bw_out'],
+            ))
+            element.clear()
+    return streams
+
+
+def stat__poll_node(*, node: IngestNodeDto, timeout: float) -> list[StreamStatDto]:
+    """Raises OSError and ElementTree.ParseError."""
+    with urllib.request.urlopen(node.stat_url, timeout=timeout) as response:
+        return stat__parse(source=response, node=node.node)
+
+
+def stat__publish_snapshot(*, streams: list[StreamStatDto], version: int, polled_at: float, ttl: int) -> None:
+    """
+    Stores the snapshot under its own version and only then moves the version pointer,
+    readers holding the previous version keep serving it until the new one is complete.
+    """
+    body = json.dumps({
+        'version': version,
+        'polled_at': polled_at,
+        'data': [stream.dict() for stream in streams],
+    }).encode()
+    pipeline = get_redis_connection('redis').pipeline()
+    pipeline.set(RTMP_STAT_SNAPSHOT_KEY.format(version=version), body, ex=ttl)
+    pipeline.set(RTMP_STAT_VERSION_KEY, version)
+    pipeline.execute()
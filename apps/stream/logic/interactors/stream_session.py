@@ -0,0 +1,81 @@
+import contextlib
+import datetime
+import typing
+
+import pgbulk
+from django.db import connection, transaction
+from django_redis import get_redis_connection
+
+from apps.stream.constants import LIVE_FINISHED_KEY, STREAM_SESSION_FLUSH_LOCK_ID, STREAM_SESSION_LOCK_ID
+from apps.stream.dto.session import LiveSessionDto
+from apps.stream.logic.selectors.live import live__finished_sessions
+from apps.stream.models import StreamSession
+from utils.partitions import partition__ensure_range
+
+
+def stream_session__from_dto(*, session: LiveSessionDto) -> StreamSession:
+    return StreamSession(
+        session_id=session.session_id,
+        kind=session.kind,
+        stream=session.stream,
+        user_id=session.user_id,
+        node=session.node,
+        addr=session.addr,
+        started_at=datetime.datetime.fromtimestamp(session.started_at, tz=datetime.timezone.utc),
+        finished_at=datetime.datetime.fromtimestamp(session.finished_at, tz=datetime.timezone.utc),
+    )
+
+
+def stream_session__lock() -> None:
+    """Serializes session writers and the usage rollup until the end of the transaction."""
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_advisory_xact_lock(%s)', [STREAM_SESSION_LOCK_ID])
+
+
+@contextlib.contextmanager
+def stream_session__flush_lock() -> typing.Iterator[bool]:
+    """Session advisory lock held by a single flusher, yields False when another flusher holds it."""
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_try_advisory_lock(%s)', [STREAM_SESSION_FLUSH_LOCK_ID])
+        acquired = cursor.fetchone()[0]
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_unlock(%s)', [STREAM_SESSION_FLUSH_LOCK_ID])
+
+
+def stream_session__flush(*, batch_size: int = 1000) -> int:
+    """
+    Moves finished sessions from redis into postgres, one multi-row upsert per batch.
+    Each batch is read, written and trimmed from redis under the flush lock, so concurrent flushers
+    never trim a batch twice. A batch is trimmed only after it is committed, when the trim is lost
+    the next flush writes it again and the upsert skips the existing rows.
+    """
+    flushed = 0
+    with stream_session__flush_lock() as acquired:
+        if not acquired:
+            return flushed
+        while True:
+            sessions = live__finished_sessions(limit=batch_size)
+            if not sessions:
+                return flushed
+            model_objs = [stream_session__from_dto(session=session) for session in sessions]
+            partition__ensure_range(
+                table=StreamSession._meta.db_table,
+                started_from=min(session.started_at for session in model_objs),
+                started_to=max(session.started_at for session in model_objs),
+            )
+            with transaction.atomic():
+                stream_session__lock()
+                pgbulk.upsert(
+                    queryset=StreamSession,
+                    model_objs=model_objs,
+                    unique_fields=['session_id', 'started_at'],
+                    update_fields=[],
+                )
+            get_redis_connection('redis').ltrim(LIVE_FINISHED_KEY, len(sessions), -1)
+            flushed += len(sessions)
+            if len(sessions) < batch_size:
+                return flushed
@@ -0,0 +1,126 @@
+import datetime
+
+from django.db import connection, transaction
+
+from apps.stream.constants import SESSION_KIND_PLAY, SESSION_KIND_PUBLISH, STREAM_USAGE_WATERMARK
+from apps.stream.logic.interactors.stream_session import stream_session__lock
+from apps.stream.models import RollupWatermark, StreamSession, StreamUsageDay, StreamUsageHour, StreamUsageMinute
+from utils.partitions import partition__ensure_range
+
+# sessions split into the minutes they overlap; the minute rows are added to, so every session counts once
+MINUTE_ROLLUP_SQL = f"""
+INSERT INTO {StreamUsageMinute._meta.db_table} AS rollup
+    (bucket, stream, user_id, publish_seconds, view_seconds, play_sessions)
+SELECT
+    minute.bucket,
+    stream_session.stream,
+    max(stream_session.user_id) FILTER (WHERE stream_session.kind = '{SESSION_KIND_PUBLISH}'),
+    coalesce(sum(overlap.seconds) FILTER (WHERE stream_session.kind = '{SESSION_KIND_PUBLISH}'), 0),
+    coalesce(sum(overlap.seconds) FILTER (WHERE stream_session.kind = '{SESSION_KIND_PLAY}'), 0),
+    count(*) FILTER (
+        WHERE stream_session.kind = '{SESSION_KIND_PLAY}'
+            AND minute.bucket = date_trunc('minute', stream_session.started_at)
+    )
+FROM {StreamSession._meta.db_table} AS stream_session
+CROSS JOIN LATERAL generate_series(
+    date_trunc('minute', stream_session.started_at),
+    greatest(stream_session.finished_at, stream_session.started_at),
+    interval '1 minute'
+) AS minute (bucket)
+CROSS JOIN LATERAL (
+    SELECT greatest(extract(epoch FROM
+        least(stream_session.finished_at, minute.bucket + interval '1 minute')
+        - greatest(stream_session.started_at, minute.bucket)
+    ), 0) AS seconds
+) AS overlap
+WHERE stream_session.id > %(since)s AND stream_session.id <= %(until)s
+    AND (
+        minute.bucket < stream_session.finished_at
+        OR minute.bucket = date_trunc('minute', stream_session.started_at)
+    )
+GROUP BY minute.bucket, stream_session.stream
+ON CONFLICT (bucket, stream) DO UPDATE SET
+    user_id = coalesce(rollup.user_id, EXCLUDED.user_id),
+    publish_seconds = rollup.publish_seconds + EXCLUDED.publish_seconds,
+    view_seconds = rollup.view_seconds + EXCLUDED.view_seconds,
+    play_sessions = rollup.play_sessions + EXCLUDED.play_sessions
+"""
+
+# coarser buckets are recomputed from the finer rollup, only for the streams and the range a batch touched
+COARSE_ROLLUP_SQL = """
+INSERT INTO {target} AS rollup (bucket, stream, user_id, publish_seconds, view_seconds, play_sessions)
+SELECT
+    date_trunc('{unit}', bucket AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+    stream,
+    max(user_id),
+    sum(publish_seconds),
+    sum(view_seconds),
+    sum(play_sessions)
+FROM {source}
+WHERE stream = ANY(%(streams)s) AND bucket >= %(started_from)s AND bucket < %(started_to)s
+GROUP BY 1, stream
+ON CONFLICT (bucket, stream) DO UPDATE SET
+    user_id = EXCLUDED.user_id,
+    publish_seconds = EXCLUDED.publish_seconds,
+    view_seconds = EXCLUDED.view_seconds,
+    play_sessions = EXCLUDED.play_sessions
+"""
+HOUR_ROLLUP_SQL = COARSE_ROLLUP_SQL.format(
+    target=StreamUsageHour._meta.db_table, source=StreamUsageMinute._meta.db_table, unit='hour'
+)
+DAY_ROLLUP_SQL = COARSE_ROLLUP_SQL.format(
+    target=StreamUsageDay._meta.db_table, source=StreamUsageHour._meta.db_table, unit='day'
+)
+
+
+def stream_usage__floor(value: datetime.datetime, *, unit: datetime.timedelta) -> datetime.datetime:
+    seconds = unit.total_seconds()
+    return datetime.datetime.fromtimestamp(value.timestamp() // seconds * seconds, tz=datetime.timezone.utc)
+
+
+def stream_usage__rollup_batch(*, batch_size: int) -> int:
+    """
+    Rolls up the sessions written since the watermark, in one transaction with the watermark move.
+    The session write lock guarantees that no lower id can still commit after the batch is read.
+    """
+    with transaction.atomic():
+        stream_session__lock()
+        watermark, _ = RollupWatermark.objects.select_for_update().get_or_create(name=STREAM_USAGE_WATERMARK)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT count(*), max(id), min(started_at), max(finished_at), array_agg(DISTINCT stream)'
+                f' FROM (SELECT id, started_at, finished_at, stream FROM {StreamSession._meta.db_table}'
+                f' WHERE id > %s ORDER BY id LIMIT %s) AS batch',
+                [watermark.value, batch_size],
+            )
+            count, until, started_from, finished_to, streams = cursor.fetchone()
+            if not count:
+                return 0
+            partition__ensure_range(
+                table=StreamUsageMinute._meta.db_table, started_from=started_from, started_to=finished_to
+            )
+            cursor.execute(MINUTE_ROLLUP_SQL, {'since': watermark.value, 'until': until})
+            hour = datetime.timedelta(hours=1)
+            cursor.execute(HOUR_ROLLUP_SQL, {
+                'streams': streams,
+                'started_from': stream_usage__floor(started_from, unit=hour),
+                'started_to': stream_usage__floor(finished_to, unit=hour) + hour,
+            })
+            day = datetime.timedelta(days=1)
+            cursor.execute(DAY_ROLLUP_SQL, {
+                'streams': streams,
+                'started_from': stream_usage__floor(started_from, unit=day),
+                'started_to': stream_usage__floor(finished_to, unit=day) + day,
+            })
+        watermark.value = until
+        watermark.save(update_fields=['value'])
+    return count
+
+
+def stream_usage__rollup(*, batch_size: int = 10000) -> int:
+    rolled_up = 0
+    while True:
+        count = stream_usage__rollup_batch(batch_size=batch_size)
+        rolled_up += count
+        if count < batch_size:
+            return rolled_up
@@ -0,0 +1,20 @@
+from django_redis import get_redis_connection
+
+from apps.stream.constants import LIVE_FINISHED_KEY, LIVE_STREAMS_KEY, LIVE_VIEWERS_KEY
+from apps.stream.dto.session import LiveSessionDto, LiveStreamDto
+
+
+def live__streams() -> list[LiveStreamDto]:
+    pipeline = get_redis_connection('redis').pipeline(transaction=False)
+    pipeline.smembers(LIVE_STREAMS_KEY)
+    pipeline.hgetall(LIVE_VIEWERS_KEY)
+    streams, viewers = pipeline.execute()
+    return [
+        LiveStreamDto(stream=stream.decode(), viewers=max(int(viewers.get(stream, 0)), 0))
+        for stream in sorted(streams)
+    ]
+
+
+def live__finished_sessions(*, limit: int) -> list[LiveSessionDto]:
+    raw_sessions = get_redis_connection('redis').lrange(LIVE_FINISHED_KEY, 0, limit - 1)
+    return [LiveSessionDto.parse_raw(raw_session) for raw_session in raw_sessions]
@@ -0,0 +1,43 @@
+import threading
+
+from django_redis import get_redis_connection
+
+from apps.stream.constants import RTMP_STAT_SNAPSHOT_KEY, RTMP_STAT_VERSION_KEY
+
+
+class StatSnapshotCache:
+    """
+    Encoded /stat snapshot of this process. A read costs one GET of the version,
+    the snapshot itself is fetched only when the poller has published a new one.
+    """
+
+    def __init__(self) -> None:
+        self._version: int | None = None
+        self._body: bytes | None = None
+        self._lock = threading.Lock()
+
+    def get(self) -> tuple[int, bytes] | None:
+        connection = get_redis_connection('redis')
+        version = connection.get(RTMP_STAT_VERSION_KEY)
+        if version is None:
+            return None
+        version = int(version)
+        with self._lock:
+            if version == self._version:
+                return version, self._body
+        body = connection.get(RTMP_STAT_SNAPSHOT_KEY.format(version=version))
+        if body is None:
+            # the poller stopped long ago and its last snapshot expired
+            return None
+        with self._lock:
+            if self._version is None or version > self._version:
+                self._version, self._body = version, body
+        return version, body
+
+
+stat_snapshot_cache = StatSnapshotCache()
+
+
+def stat__snapshot() -> tuple[int, bytes] | None:
+    """(version, snapshot json) of the latest nginx-rtmp /stat poll."""
+    return stat_snapshot_cache.get()
@@ -0,0 +1,78 @@
+import datetime
+
+from django.db.models import Q, QuerySet, Sum
+
+from apps.stream.dto.usage import StreamUsageDto
+from apps.stream.models import AbstractStreamUsage, StreamUsageDay, StreamUsageHour, StreamUsageMinute
+
+# coarsest first, with the bucket size in seconds
+STREAM_USAGE_ROLLUPS: list[tuple[type[AbstractStreamUsage], int]] = [
+    (StreamUsageDay, 24 * 3600),
+    (StreamUsageHour, 3600),
+    (StreamUsageMinute, 60),
+]
+
+
+def stream_usage__model(*, started_from: datetime.datetime, started_to: datetime.datetime) -> type[AbstractStreamUsage]:
+    """Coarsest rollup whose buckets tile the window exactly, minutes answer anything at minute precision."""
+    for model, bucket_size in STREAM_USAGE_ROLLUPS:
+        if started_from.timestamp() % bucket_size == 0 and started_to.timestamp() % bucket_size == 0:
+            return model
+    return StreamUsageMinute
+
+
+def stream_usage__window(
+        *,
+        started_from: datetime.datetime,
+        started_to: datetime.datetime,
+        user_id: int | None = None,
+        stream: str | None = None,
+) -> QuerySet[AbstractStreamUsage]:
+    model = stream_usage__model(started_from=started_from, started_to=started_to)
+    condition = Q(bucket__gte=started_from, bucket__lt=started_to)
+    if user_id is not None:
+        condition &= Q(user_id=user_id)
+    if stream is not None:
+        condition &= Q(stream=stream)
+    return model.objects.filter(condition)
+
+
+def stream_usage__totals(
+        *,
+        started_from: datetime.datetime,
+        started_to: datetime.datetime,
+        user_id: int | None = None,
+        stream: str | None = None,
+) -> StreamUsageDto:
+    """Totals of the window, e.g. hours streamed by a user last month come from ~30 daily rows."""
+    totals = stream_usage__window(
+        started_from=started_from, started_to=started_to, user_id=user_id, stream=stream
+    ).aggregate(
+        publish_seconds=Sum('publish_seconds'),
+        view_seconds=Sum('view_seconds'),
+        play_sessions=Sum('play_sessions'),
+    )
+    return StreamUsageDto(
+        bucket=None,
+        publish_seconds=totals['publish_seconds'] or 0,
+        view_seconds=totals['view_seconds'] or 0,
+        play_sessions=totals['play_sessions'] or 0,
+    )
+
+
+def stream_usage__buckets(
+        *,
+        started_from: datetime.datetime,
+        started_to: datetime.datetime,
+        user_id: int | None = None,
+        stream: str | None = None,
+) -> list[StreamUsageDto]:
+    """Per-bucket series of the window at the granularity of the rollup that answers it."""
+    rows = stream_usage__window(
+        started_from=started_from, started_to=started_to, user_id=user_id, stream=stream
+    ).values('bucket').annotate(
+        publish_seconds=Sum('publish_seconds'),
+        view_seconds=Sum('view_seconds'),
+        play_sessions=Sum('play_sessions'),
+    ).order_by('bucket')
+    return [StreamUsageDto(**row) for row in rows]
@@ -0,0 +1,54 @@
+import os
+import socket
+import time
+import typing
+import urllib.request
+from urllib.parse import urlsplit
+from xml.etree import ElementTree
+
+import structlog
+from django.core.management.base import BaseCommand
+
+from apps.stream.dto.ingest import IngestNodeDto
+from apps.stream.logic.interactors.ingest import ingest_node__heartbeat
+from apps.stream.logic.interactors.stat import stat__parse
+
+logger = structlog.get_logger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Публикует нагрузку узла nginx-rtmp (публикации, входящий трафик, CPU) в реестр ingest узлов'
+
+    def add_arguments(self, parser: typing.Any) -> None:
+        parser.add_argument('--node', required=True, help='Имя узла')
+        parser.add_argument('--url', required=True, help='rtmp://host:port/app, куда перенаправлять публикации')
+        parser.add_argument('--stat-url', help='Адрес rtmp_stat узла, например http://rtmp:8081/stat')
+        parser.add_argument('--addr', help='Адрес, с которого узел вызывает колбэки, по умолчанию из --url')
+        parser.add_argument('--interval', type=float, default=2.0)
+
+    def handle(self, *args: typing.Any, **options: typing.Any) -> None:
+        while True:
+            started_at = time.monotonic()
+            try:
+                publishers, bandwidth = self._stat(options['stat_url'])
+                ingest_node__heartbeat(node=IngestNodeDto(
+                    node=options['node'],
+                    url=options['url'].rstrip('/'),
+                    addr=options['addr'] or socket.gethostbyname(urlsplit(options['url']).hostname),
+                    publishers=publishers,
+                    bandwidth=bandwidth,
+                    cpu=os.getloadavg()[0] / (os.cpu_count() or 1),
+                    heartbeat_at=time.time(),
+                    stat_url=options['stat_url'] or '',
+                ))
+            except (OSError, ElementTree.ParseError) as error:
+                logger.warning('ingest_heartbeat.failed', node=options['node'], error=str(error))
+            time.sleep(max(options['interval'] - (time.monotonic() - started_at), 0))
+
+    def _stat(self, stat_url: str | None) -> tuple[int, int]:
+        if not stat_url:
+            return 0, 0
+        with urllib.request.urlopen(stat_url, timeout=1) as response:
+            streams = stat__parse(source=response, node='')
+        publishing = [stream for stream in streams if stream.publishing]
+        return len(publishing), sum(stream.bw_in for stream in publishing)
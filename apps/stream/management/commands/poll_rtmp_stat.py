@@ -0,0 +1,51 @@
+import time
+import typing
+from concurrent.futures import ThreadPoolExecutor
+from xml.etree import ElementTree
+
+import structlog
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.stream.dto.ingest import IngestNodeDto, StreamStatDto
+from apps.stream.logic.interactors.ingest import ingest_placement
+from apps.stream.logic.interactors.stat import stat__poll_node, stat__publish_snapshot
+
+logger = structlog.get_logger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Опрашивает rtmp_stat всех живых ingest узлов и публикует версионированный снимок статистики трансляций'
+
+    def add_arguments(self, parser: typing.Any) -> None:
+        parser.add_argument('--interval', type=float, default=settings.RTMP_STAT_INTERVAL)
+        parser.add_argument('--timeout', type=float, default=1.0, help='Таймаут запроса к узлу, секунд')
+
+    def handle(self, *args: typing.Any, **options: typing.Any) -> None:
+        interval = options['interval']
+        with ThreadPoolExecutor(max_workers=settings.RTMP_STAT_WORKERS) as executor:
+            while True:
+                started_at = time.monotonic()
+                nodes = [node for node in ingest_placement.live_nodes().values() if node.stat_url]
+                streams = []
+                for node_streams in executor.map(lambda node: self._poll(node, options['timeout']), nodes):
+                    streams.extend(node_streams)
+                polled_at = time.time()
+                try:
+                    stat__publish_snapshot(
+                        streams=streams,
+                        version=int(polled_at * 1000),
+                        polled_at=polled_at,
+                        # a few missed polls are served stale rather than not at all
+                        ttl=max(int(interval * 10), 10),
+                    )
+                except Exception:
+                    logger.exception('rtmp_stat.publish_failed', streams=len(streams))
+                time.sleep(max(interval - (time.monotonic() - started_at), 0))
+
+    def _poll(self, node: IngestNodeDto, timeout: float) -> list[StreamStatDto]:
+        try:
+            return stat__poll_node(node=node, timeout=timeout)
+        except (OSError, ElementTree.ParseError) as error:
+            logger.warning('rtmp_stat.poll_failed', node=node.node, error=str(error))
+            return []
@@ -0,0 +1,102 @@
+# Generated by Django 4.2.8 on 2026-10-18 11:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StreamSession",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "session_id",
+                    models.CharField(
+                        help_text="Узел, clientid nginx-rtmp и время начала",
+                        max_length=255,
+                        unique=True,
+                        verbose_name="Идентификатор сессии",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("publish", "Публикация"), ("play", "Просмотр")],
+                        help_text="Тип сессии",
+                        max_length=16,
+                        verbose_name="Тип сессии",
+                    ),
+                ),
+                (
+                    "stream",
+                    models.CharField(
+                        db_index=True,
+                        help_text="Имя потока nginx-rtmp",
+                        max_length=512,
+                        verbose_name="Трансляция",
+                    ),
+                ),
+                (
+                    "node",
+                    models.CharField(
+                        help_text="Адрес узла nginx-rtmp",
+                        max_length=255,
+                        verbose_name="Узел",
+                    ),
+                ),
+                (
+                    "addr",
+                    models.CharField(
+                        blank=True,
+                        help_text="Адрес клиента",
+                        max_length=255,
+                        null=True,
+                        verbose_name="Адрес клиента",
+                    ),
+                ),
+                (
+                    "started_at",
+                    models.DateTimeField(
+                        help_text="Начало сессии", verbose_name="Начало"
+                    ),
+                ),
+                (
+                    "finished_at",
+                    models.DateTimeField(
+                        help_text="Окончание сессии", verbose_name="Окончание"
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Автор трансляции",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Пользователь",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Сессия трансляции",
+                "verbose_name_plural": "Сессии трансляций",
+            },
+        ),
+    ]
@@ -0,0 +1,408 @@
+# Generated by Django 4.2.8 on 2026-10-18 16:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+# PostgreSQL declarative partitioning by month. Django has no notion of it, so the tables are
+# created here and the model state is kept in sync separately. Identity columns are not allowed
+# on partitioned tables before PostgreSQL 17, ids come from plain sequences. Unique keys must
+# contain the partition key, the primary keys become (id, <partition key>).
+# Further partitions are created by utils.partitions, ahead of time and on first use.
+
+PARTITIONS_AHEAD = """
+DO $$
+DECLARE
+    month timestamptz;
+BEGIN
+    FOR month IN
+        SELECT generate_series(
+            date_trunc('month', COALESCE(%(since)s, now()) AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+            date_trunc('month', now() AT TIME ZONE 'UTC') AT TIME ZONE 'UTC' + interval '2 months',
+            interval '1 month'
+        )
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %%I PARTITION OF %%I FOR VALUES FROM (%%L) TO (%%L)',
+            '%(table)s_p' || to_char(month AT TIME ZONE 'UTC', 'YYYYMM'),
+            '%(table)s',
+            month,
+            month + interval '1 month'
+        );
+    END LOOP;
+END $$;
+"""
+
+STREAM_SESSION_PARTITION_SQL = [
+    "ALTER TABLE stream_streamsession RENAME TO stream_streamsession_unpartitioned",
+    # the rename keeps constraint names, free the primary key name for the partitioned table
+    "ALTER TABLE stream_streamsession_unpartitioned RENAME CONSTRAINT stream_streamsession_pkey "
+    "TO stream_streamsession_unpartitioned_pkey",
+    "CREATE SEQUENCE stream_streamsession_pk_seq",
+    """
+    CREATE TABLE stream_streamsession (
+        id bigint NOT NULL DEFAULT nextval('stream_streamsession_pk_seq'),
+        session_id varchar(255) NOT NULL,
+        kind varchar(16) NOT NULL,
+        stream varchar(512) NOT NULL,
+        user_id bigint NULL REFERENCES user_user (id) DEFERRABLE INITIALLY DEFERRED,
+        node varchar(255) NOT NULL,
+        addr varchar(255) NULL,
+        started_at timestamptz NOT NULL,
+        finished_at timestamptz NOT NULL,
+        PRIMARY KEY (id, started_at),
+        CONSTRAINT stream_session_session_id_started_unique UNIQUE (session_id, started_at)
+    ) PARTITION BY RANGE (started_at)
+    """,
+    "ALTER SEQUENCE stream_streamsession_pk_seq OWNED BY stream_streamsession.id",
+    "CREATE INDEX stream_streamsession_stream_idx ON stream_streamsession (stream)",
+    "CREATE INDEX stream_streamsession_user_idx ON stream_streamsession (user_id)",
+    PARTITIONS_AHEAD % {
+        'table': 'stream_streamsession',
+        'since': '(SELECT min(started_at) FROM stream_streamsession_unpartitioned)',
+    },
+    "INSERT INTO stream_streamsession SELECT id, session_id, kind, stream, user_id, node, addr, started_at, "
+    "finished_at FROM stream_streamsession_unpartitioned",
+    "SELECT setval('stream_streamsession_pk_seq', COALESCE(max(id), 0) + 1, false) FROM stream_streamsession",
+    "DROP TABLE stream_streamsession_unpartitioned",
+]
+
+STREAM_USAGE_MINUTE_SQL = [
+    "CREATE SEQUENCE stream_streamusageminute_pk_seq",
+    """
+    CREATE TABLE stream_streamusageminute (
+        id bigint NOT NULL DEFAULT nextval('stream_streamusageminute_pk_seq'),
+        bucket timestamptz NOT NULL,
+        stream varchar(512) NOT NULL,
+        user_id bigint NULL REFERENCES user_user (id) DEFERRABLE INITIALLY DEFERRED,
+        publish_seconds double precision NOT NULL DEFAULT 0,
+        view_seconds double precision NOT NULL DEFAULT 0,
+        play_sessions integer NOT NULL DEFAULT 0,
+        PRIMARY KEY (id, bucket),
+        CONSTRAINT stream_usage_minute_bucket_stream_unique UNIQUE (bucket, stream)
+    ) PARTITION BY RANGE (bucket)
+    """,
+    "ALTER SEQUENCE stream_streamusageminute_pk_seq OWNED BY stream_streamusageminute.id",
+    "CREATE INDEX stream_usage_minute_user_idx ON stream_streamusageminute (user_id, bucket)",
+    PARTITIONS_AHEAD % {'table': 'stream_streamusageminute', 'since': 'NULL::timestamptz'},
+]
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("stream", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name="streamsession",
+                    name="session_id",
+                    field=models.CharField(
+                        help_text="Узел, clientid nginx-rtmp и время начала",
+                        max_length=255,
+                        verbose_name="Идентификатор сессии",
+                    ),
+                ),
+                migrations.AddConstraint(
+                    model_name="streamsession",
+                    constraint=models.UniqueConstraint(
+                        fields=("session_id", "started_at"),
+                        name="stream_session_session_id_started_unique",
+                    ),
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(sql=STREAM_SESSION_PARTITION_SQL, reverse_sql=migrations.RunSQL.noop),
+            ],
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name="StreamUsageMinute",
+                    fields=[
+                        (
+                            "id",
+                            models.BigAutoField(
+                                auto_created=True,
+                                primary_key=True,
+                                serialize=False,
+                                verbose_name="ID",
+                            ),
+                        ),
+                        (
+                            "bucket",
+                            models.DateTimeField(
+                                help_text="Начало интервала", verbose_name="Интервал"
+                            ),
+                        ),
+                        (
+                            "stream",
+                            models.CharField(
+                                help_text="Имя потока nginx-rtmp",
+                                max_length=512,
+                                verbose_name="Трансляция",
+                            ),
+                        ),
+                        (
+                            "publish_seconds",
+                            models.FloatField(
+                                default=0,
+                                help_text="Длительность публикации в интервале",
+                                verbose_name="Секунд в эфире",
+                            ),
+                        ),
+                        (
+                            "view_seconds",
+                            models.FloatField(
+                                default=0,
+                                help_text="Суммарная длительность просмотров в интервале",
+                                verbose_name="Секунд просмотра",
+                            ),
+                        ),
+                        (
+                            "play_sessions",
+                            models.IntegerField(
+                                default=0,
+                                help_text="Сессий просмотра, начатых в интервале",
+                                verbose_name="Просмотры",
+                            ),
+                        ),
+                        (
+                            "user",
+                            models.ForeignKey(
+                                blank=True,
+                                help_text="Автор трансляции",
+                                null=True,
+                                on_delete=django.db.models.deletion.SET_NULL,
+                                related_name="+",
+                                to=settings.AUTH_USER_MODEL,
+                                verbose_name="Пользователь",
+                            ),
+                        ),
+                    ],
+                    options={
+                        "verbose_name": "Поминутная статистика трансляции",
+                        "verbose_name_plural": "Поминутная статистика трансляций",
+                    },
+                ),
+                migrations.AddConstraint(
+                    model_name="streamusageminute",
+                    constraint=models.UniqueConstraint(
+                        fields=("bucket", "stream"), name="stream_usage_minute_bucket_stream_unique"
+                    ),
+                ),
+                migrations.AddIndex(
+                    model_name="streamusageminute",
+                    index=models.Index(
+                        fields=["user", "bucket"], name="stream_usage_minute_user_idx"
+                    ),
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(
+                    sql=STREAM_USAGE_MINUTE_SQL,
+                    reverse_sql=[
+                        "DROP TABLE stream_streamusageminute",
+                    ],
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="StreamUsageHour",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "bucket",
+                    models.DateTimeField(
+                        help_text="Начало интервала", verbose_name="Интервал"
+                    ),
+                ),
+                (
+                    "stream",
+                    models.CharField(
+                        help_text="Имя потока nginx-rtmp",
+                        max_length=512,
+                        verbose_name="Трансляция",
+                    ),
+                ),
+                (
+                    "publish_seconds",
+                    models.FloatField(
+                        default=0,
+                        help_text="Длительность публикации в интервале",
+                        verbose_name="Секунд в эфире",
+                    ),
+                ),
+                (
+                    "view_seconds",
+                    models.FloatField(
+                        default=0,
+                        help_text="Суммарная длительность просмотров в интервале",
+                        verbose_name="Секунд просмотра",
+                    ),
+                ),
+                (
+                    "play_sessions",
+                    models.IntegerField(
+                        default=0,
+                        help_text="Сессий просмотра, начатых в интервале",
+                        verbose_name="Просмотры",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Автор трансляции",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Пользователь",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Почасовая статистика трансляции",
+                "verbose_name_plural": "Почасовая статистика трансляций",
+            },
+        ),
+        migrations.CreateModel(
+            name="StreamUsageDay",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "bucket",
+                    models.DateTimeField(
+                        help_text="Начало интервала", verbose_name="Интервал"
+                    ),
+                ),
+                (
+                    "stream",
+                    models.CharField(
+                        help_text="Имя потока nginx-rtmp",
+                        max_length=512,
+                        verbose_name="Трансляция",
+                    ),
+                ),
+                (
+                    "publish_seconds",
+                    models.FloatField(
+                        default=0,
+                        help_text="Длительность публикации в интервале",
+                        verbose_name="Секунд в эфире",
+                    ),
+                ),
+                (
+                    "view_seconds",
+                    models.FloatField(
+                        default=0,
+                        help_text="Суммарная длительность просмотров в интервале",
+                        verbose_name="Секунд просмотра",
+                    ),
+                ),
+                (
+                    "play_sessions",
+                    models.IntegerField(
+                        default=0,
+                        help_text="Сессий просмотра, начатых в интервале",
+                        verbose_name="Просмотры",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Автор трансляции",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Пользователь",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Дневная статистика трансляции",
+                "verbose_name_plural": "Дневная статистика трансляций",
+            },
+        ),
+        migrations.CreateModel(
+            name="RollupWatermark",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        help_text="Имя агрегации",
+                        max_length=64,
+                        unique=True,
+                        verbose_name="Агрегация",
+                    ),
+                ),
+                (
+                    "value",
+                    models.BigIntegerField(
+                        default=0,
+                        help_text="Последний агрегированный id исходной таблицы",
+                        verbose_name="Отметка",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Отметка агрегации",
+                "verbose_name_plural": "Отметки агрегации",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="streamusagehour",
+            constraint=models.UniqueConstraint(
+                fields=("bucket", "stream"), name="stream_usage_hour_bucket_stream_unique"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="streamusagehour",
+            index=models.Index(
+                fields=["user", "bucket"], name="stream_usage_hour_user_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="streamusageday",
+            constraint=models.UniqueConstraint(
+                fields=("bucket", "stream"), name="stream_usage_day_bucket_stream_unique"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="streamusageday",
+            index=models.Index(
+                fields=["user", "bucket"], name="stream_usage_day_user_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,167 @@
+from django.db import models
+
+from apps.stream.constants import SESSION_KIND_PLAY, SESSION_KIND_PUBLISH
+from apps.user.models import User
+from utils.abstractions.model import AbstractBaseModel
+
+
+class StreamSession(AbstractBaseModel):
+    """Partitioned by month of started_at (migration 0002), the primary key is (id, started_at) in the database."""
+
+    class Meta:
+        verbose_name = 'Сессия трансляции'
+        verbose_name_plural = 'Сессии трансляций'
+        constraints = [
+            # unique keys of a partitioned table must contain the partition key
+            models.UniqueConstraint(
+                fields=['session_id', 'started_at'], name='stream_session_session_id_started_unique'
+            ),
+        ]
+
+    KIND_CHOICES = (
+        (SESSION_KIND_PUBLISH, 'Публикация'),
+        (SESSION_KIND_PLAY, 'Просмотр'),
+    )
+
+    session_id = models.CharField(
+        max_length=255,
+        verbose_name='Идентификатор сессии',
+        help_text='Узел, clientid nginx-rtmp и время начала'
+    )
+    kind = models.CharField(
+        max_length=16,
+        choices=KIND_CHOICES,
+        verbose_name='Тип сессии',
+        help_text='Тип сессии'
+    )
+    stream = models.CharField(
+        max_length=512,
+        db_index=True,
+        verbose_name='Трансляция',
+        help_text='Имя потока nginx-rtmp'
+    )
+    user = models.ForeignKey(
+        to=User,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        verbose_name='Пользователь',
+        help_text='Автор трансляции'
+    )
+    node = models.CharField(
+        max_length=255,
+        verbose_name='Узел',
+        help_text='Адрес узла nginx-rtmp'
+    )
+    addr = models.CharField(
+        max_length=255,
+        null=True,
+        blank=True,
+        verbose_name='Адрес клиента',
+        help_text='Адрес клиента'
+    )
+    started_at = models.DateTimeField(
+        verbose_name='Начало',
+        help_text='Начало сессии'
+    )
+    finished_at = models.DateTimeField(
+        verbose_name='Окончание',
+        help_text='Окончание сессии'
+    )
+
+
+class AbstractStreamUsage(AbstractBaseModel):
+    """Stream time of one bucket, rollups of StreamSession maintained by stream_usage__rollup."""
+
+    class Meta:
+        abstract = True
+
+    bucket = models.DateTimeField(
+        verbose_name='Интервал',
+        help_text='Начало интервала'
+    )
+    stream = models.CharField(
+        max_length=512,
+        verbose_name='Трансляция',
+        help_text='Имя потока nginx-rtmp'
+    )
+    user = models.ForeignKey(
+        to=User,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='+',
+        verbose_name='Пользователь',
+        help_text='Автор трансляции'
+    )
+    publish_seconds = models.FloatField(
+        default=0,
+        verbose_name='Секунд в эфире',
+        help_text='Длительность публикации в интервале'
+    )
+    view_seconds = models.FloatField(
+        default=0,
+        verbose_name='Секунд просмотра',
+        help_text='Суммарная длительность просмотров в интервале'
+    )
+    play_sessions = models.IntegerField(
+        default=0,
+        verbose_name='Просмотры',
+        help_text='Сессий просмотра, начатых в интервале'
+    )
+
+
+class StreamUsageMinute(AbstractStreamUsage):
+    """Partitioned by month of bucket (migration 0002), the primary key is (id, bucket) in the database."""
+
+    class Meta:
+        verbose_name = 'Поминутная статистика трансляции'
+        verbose_name_plural = 'Поминутная статистика трансляций'
+        constraints = [
+            models.UniqueConstraint(fields=['bucket', 'stream'], name='stream_usage_minute_bucket_stream_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'bucket'], name='stream_usage_minute_user_idx'),
+        ]
+
+
+class StreamUsageHour(AbstractStreamUsage):
+    class Meta:
+        verbose_name = 'Почасовая статистика трансляции'
+        verbose_name_plural = 'Почасовая статистика трансляций'
+        constraints = [
+            models.UniqueConstraint(fields=['bucket', 'stream'], name='stream_usage_hour_bucket_stream_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'bucket'], name='stream_usage_hour_user_idx'),
+        ]
+
+
+class StreamUsageDay(AbstractStreamUsage):
+    class Meta:
+        verbose_name = 'Дневная статистика трансляции'
+        verbose_name_plural = 'Дневная статистика трансляций'
+        constraints = [
+            models.UniqueConstraint(fields=['bucket', 'stream'], name='stream_usage_day_bucket_stream_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'bucket'], name='stream_usage_day_user_idx'),
+        ]
+
+
+class RollupWatermark(AbstractBaseModel):
+    class Meta:
+        verbose_name = 'Отметка агрегации'
+        verbose_name_plural = 'Отметки агрегации'
+
+    name = models.CharField(
+        max_length=64,
+        unique=True,
+        verbose_name='Агрегация',
+        help_text='Имя агрегации'
+    )
+    value = models.BigIntegerField(
+        default=0,
+        verbose_name='Отметка',
+        help_text='Последний агрегированный id исходной таблицы'
+    )
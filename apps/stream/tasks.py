@@ -0,0 +1,30 @@
+from django.conf import settings
+
+from config.celery import app
+from apps.stream.logic.interactors.stream_session import stream_session__flush
+from apps.stream.logic.interactors.stream_usage import stream_usage__rollup
+from apps.stream.models import StreamSession, StreamUsageMinute
+from utils.celery.constant import QUEUE_HEAVY_LONG, QUEUE_LIGHT_LONG
+from utils.partitions import partition__maintain
+
+
+@app.task(queue=QUEUE_LIGHT_LONG, ignore_result=True)
+def stream_session__flush_task() -> int:
+    return stream_session__flush()
+
+
+@app.task(queue=QUEUE_HEAVY_LONG, ignore_result=True)
+def stream_usage__rollup_task() -> int:
+    return stream_usage__rollup()
+
+
+@app.task(queue=QUEUE_HEAVY_LONG, ignore_result=True)
+def stream_partitions__maintain_task() -> list[str]:
+    return [
+        *partition__maintain(
+            table=StreamSession._meta.db_table, retention_months=settings.STREAM_SESSION_RETENTION_MONTHS
+        ),
+        *partition__maintain(
+            table=StreamUsageMinute._meta.db_table, retention_months=settings.STREAM_USAGE_MINUTE_RETENTION_MONTHS
+        ),
+    ]
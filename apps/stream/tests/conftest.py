@@ -0,0 +1,5 @@
+from apps.user.tests.factories import UserFactory
+from pytest_factoryboy import register
+
+
+register(UserFactory)
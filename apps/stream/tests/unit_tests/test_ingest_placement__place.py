@@ -0,0 +1,51 @@
+import time
+
+from apps.stream.dto.ingest import IngestNodeDto
+from apps.stream.logic.interactors.ingest import IngestPlacement
+
+
+def _node(name: str, *, publishers: int = 0, cpu: float = 0.1, heartbeat_at: float | None = None) -> IngestNodeDto:
+    return IngestNodeDto(
+        node=name,
+        url=f'rtmp://{name}:1935/live',
+        addr=f'10.0.0.{name[-1]}',
+        publishers=publishers,
+        bandwidth=0,
+        cpu=cpu,
+        heartbeat_at=time.time() if heartbeat_at is None else heartbeat_at,
+    )
+
+
+def _placement() -> IngestPlacement:
+    return IngestPlacement(virtual_nodes=64, balance_factor=1.25, node_ttl=10, max_cpu=0.9)
+
+
+def test__ingest_placement__place__sticky_case(mocker):
+    nodes = {name: _node(name) for name in ('node1', 'node2', 'node3')}
+    mocker.patch('apps.stream.logic.interactors.ingest.ingest_nodes.items', return_value=list(nodes.items()))
+
+    first = _placement().place(key='42')
+
+    assert _placement().place(key='42').node == first.node
+
+
+def test__ingest_placement__place__bounded_load_case(mocker):
+    nodes = {name: _node(name) for name in ('node1', 'node2')}
+    mocker.patch('apps.stream.logic.interactors.ingest.ingest_nodes.items', return_value=list(nodes.items()))
+    placement = _placement()
+
+    placed = [placement.place(key=str(user_id)).node for user_id in range(100)]
+
+    # pending placements count as load until the next heartbeat, no node takes more than its bound
+    assert max(placed.count('node1'), placed.count('node2')) <= 63
+
+
+def test__ingest_placement__place__stale_and_busy_case(mocker):
+    nodes = {
+        'node1': _node('node1', heartbeat_at=time.time() - 60),
+        'node2': _node('node2', cpu=0.95),
+        'node3': _node('node3', publishers=3),
+    }
+    mocker.patch('apps.stream.logic.interactors.ingest.ingest_nodes.items', return_value=list(nodes.items()))
+
+    assert _placement().place(key='42').node == 'node3'
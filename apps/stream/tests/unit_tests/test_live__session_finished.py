@@ -0,0 +1,35 @@
+import time
+
+from django_redis import get_redis_connection
+
+from apps.stream.constants import LIVE_FINISHED_KEY, LIVE_VIEWERS_KEY, SESSION_KIND_PLAY
+from apps.stream.dto.session import LiveSessionDto
+from apps.stream.logic.interactors.live import live__session_finished, live__session_started
+
+
+def test__live__session_finished__success_case():
+    connection = get_redis_connection('redis')
+    connection.delete(LIVE_FINISHED_KEY)
+    session = LiveSessionDto(
+        kind=SESSION_KIND_PLAY,
+        stream='finished_stream',
+        node='10.0.0.1',
+        client_id='7',
+        addr='127.0.0.1',
+        user_id=None,
+        started_at=time.time(),
+        finished_at=None,
+    )
+    live__session_started(session=session)
+
+    finished = live__session_finished(
+        kind=SESSION_KIND_PLAY, stream='finished_stream', node='10.0.0.1', client_id='7'
+    )
+
+    assert finished.started_at == session.started_at
+    assert finished.finished_at >= session.started_at
+    assert connection.hget(LIVE_VIEWERS_KEY, 'finished_stream') is None
+    assert [LiveSessionDto.parse_raw(raw) for raw in connection.lrange(LIVE_FINISHED_KEY, 0, -1)] == [finished]
+    assert live__session_finished(
+        kind=SESSION_KIND_PLAY, stream='finished_stream', node='10.0.0.1', client_id='7'
+    ) is None
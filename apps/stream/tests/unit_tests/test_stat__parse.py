@@ -0,0 +1,53 @@
+import io
+
+from apps.stream.logic.interactors.stat import stat__parse
+
+STAT_XML = b'''<?xml version="1.0" encoding="utf-8" ?>
+<rtmp>
+  <uptime>120</uptime>
+  <bw_in>2000000</bw_in>
+  <server>
+    <application>
+      <name>live</name>
+      <live>
+        <stream>
+          <name>alice</name>
+          <time>60000</time>
+          <bw_in>1500000</bw_in>
+          <bytes_in>11250000</bytes_in>
+          <bw_out>3000000</bw_out>
+          <bytes_out>22500000</bytes_out>
+          <client><id>1</id><address>10.0.0.2</address><publishing/><active/></client>
+          <client><id>2</id><address>10.0.0.3</address><active/></client>
+          <client><id>3</id><address>10.0.0.4</address><active/></client>
+          <meta><video><width>1280</width></video></meta>
+          <nclients>3</nclients>
+          <publishing/>
+          <active/>
+        </stream>
+        <stream>
+          <name>bob</name>
+          <bw_in>0</bw_in>
+          <bytes_in>0</bytes_in>
+          <bw_out>0</bw_out>
+          <bytes_out>0</bytes_out>
+          <nclients>1</nclients>
+        </stream>
+        <nclients>4</nclients>
+      </live>
+    </application>
+  </server>
+</rtmp>
+'''
+
+
+def test__stat__parse__streams_case():
+    streams = stat__parse(source=io.BytesIO(STAT_XML), node='rtmp')
+
+    assert [(stream.app, stream.stream, stream.publishing, stream.clients) for stream in streams] == [
+        ('live', 'alice', True, 3),
+        ('live', 'bob', False, 1),
+    ]
+    assert streams[0].bytes_in == 11250000
+    assert streams[0].bw_out == 3000000
+    assert streams[0].node == 'rtmp'
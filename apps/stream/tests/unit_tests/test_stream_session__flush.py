@@ -0,0 +1,34 @@
+import time
+
+import pytest
+
+from apps.stream.constants import SESSION_KIND_PLAY
+from apps.stream.dto.session import LiveSessionDto
+from apps.stream.logic.interactors.stream_session import stream_session__flush
+from apps.stream.models import StreamSession
+
+
+@pytest.mark.django_db()
+def test__stream_session__flush__success_case(mocker):
+    started_at = time.time()
+    sessions = [
+        LiveSessionDto(
+            kind=SESSION_KIND_PLAY,
+            stream='stream_key',
+            node='10.0.0.1',
+            client_id=str(client_id),
+            addr='127.0.0.1',
+            user_id=None,
+            started_at=started_at,
+            finished_at=started_at + 60,
+        )
+        for client_id in range(3)
+    ]
+    mocker.patch(
+        'apps.stream.logic.interactors.stream_session.live__finished_sessions',
+        side_effect=[sessions, sessions, []],
+    )
+    redis_connection = mocker.patch('apps.stream.logic.interactors.stream_session.get_redis_connection')
+    assert stream_session__flush(batch_size=3) == 6
+    assert StreamSession.objects.count() == 3
+    redis_connection.return_value.ltrim.assert_called_with('live:finished', 3, -1)
@@ -0,0 +1,51 @@
+import datetime
+
+import pytest
+
+from apps.stream.constants import SESSION_KIND_PLAY, SESSION_KIND_PUBLISH
+from apps.stream.logic.interactors.stream_usage import stream_usage__rollup
+from apps.stream.logic.selectors.stream_usage import stream_usage__model, stream_usage__totals
+from apps.stream.models import StreamSession, StreamUsageDay, StreamUsageHour, StreamUsageMinute
+from utils.partitions import partition__ensure
+
+STARTED_AT = datetime.datetime(2026, 10, 18, 11, 59, 30, tzinfo=datetime.timezone.utc)
+
+
+def make_session(*, kind: str, client_id: str, started_at: datetime.datetime, seconds: int) -> StreamSession:
+    return StreamSession.objects.create(
+        session_id=f'node:{client_id}:{started_at.timestamp():.3f}',
+        kind=kind,
+        stream='stream_key',
+        node='node',
+        started_at=started_at,
+        finished_at=started_at + datetime.timedelta(seconds=seconds),
+    )
+
+
+@pytest.mark.django_db()
+def test__stream_usage__rollup__success_case():
+    partition__ensure(table=StreamSession._meta.db_table, month=STARTED_AT)
+    make_session(kind=SESSION_KIND_PUBLISH, client_id='1', started_at=STARTED_AT, seconds=120)
+    make_session(kind=SESSION_KIND_PLAY, client_id='2', started_at=STARTED_AT, seconds=60)
+
+    assert stream_usage__rollup(batch_size=1) == 2
+    # nothing new, the watermark keeps sessions from being counted twice
+    assert stream_usage__rollup() == 0
+
+    assert StreamUsageMinute.objects.count() == 3
+    assert StreamUsageHour.objects.count() == 2
+    assert StreamUsageDay.objects.get().publish_seconds == 120
+    totals = stream_usage__totals(
+        started_from=STARTED_AT.replace(hour=0, minute=0, second=0),
+        started_to=STARTED_AT.replace(hour=0, minute=0, second=0) + datetime.timedelta(days=1),
+        stream='stream_key',
+    )
+    assert (totals.publish_seconds, totals.view_seconds, totals.play_sessions) == (120, 60, 1)
+
+
+def test__stream_usage__model__coarsest_case():
+    day = datetime.datetime(2026, 10, 1, tzinfo=datetime.timezone.utc)
+
+    assert stream_usage__model(started_from=day, started_to=day + datetime.timedelta(days=31)) is StreamUsageDay
+    assert stream_usage__model(started_from=day, started_to=day + datetime.timedelta(hours=5)) is StreamUsageHour
+    assert stream_usage__model(started_from=day, started_to=day + datetime.timedelta(seconds=90)) is StreamUsageMinute
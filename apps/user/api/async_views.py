@@ -0,0 +1,68 @@
+"""
+Async counterparts of UserViewSet.login / UserViewSet.registration for ASGI deployments:
+password hashing is awaited on the hashing executor instead of blocking the sync view thread.
+"""
+import json
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import login
+from django.http import HttpRequest, HttpResponse, HttpResponseNotAllowed, JsonResponse
+from pydantic import ValidationError
+
+from apps.user.dto.authenticate import LoginDto, RegistrationDto
+from apps.user.logic.facades.user import user__issue_missing_stream_key
+from apps.user.logic.interactors.stream_key import stream_key__rotate
+from apps.user.logic.interactors.user import user__aauthenticate, user__acreate
+from apps.user.models import User
+from utils.exeption import BadRequest, BusinessLogicException
+from utils.hashing import PasswordHashingOverloaded
+
+
+def _error_response(error: BadRequest | BusinessLogicException | PasswordHashingOverloaded) -> JsonResponse:
+    return JsonResponse({'detail': str(error.detail)}, status=error.status_code)
+
+
+def _user_response(*, user: User, stream_key: str | None) -> JsonResponse:
+    response = JsonResponse({'data': {'username': user.username, 'email': user.email}})
+    if stream_key is not None:
+        response['access-control-expose-headers'] = 'Set-Cookie'
+        response['Set-Cookie'] = f"stream_key={stream_key}; Path=/; Same-site=Lax"
+    return response
+
+
+def _parse(request: HttpRequest, dto_class: type[LoginDto] | type[RegistrationDto]) -> LoginDto | RegistrationDto:
+    try:
+        return dto_class(**json.loads(request.body or b'{}'))
+    except (ValueError, TypeError, ValidationError):
+        raise BadRequest()
+
+
+async def login_view(request: HttpRequest) -> HttpResponse:
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+    try:
+        login_dto = _parse(request, LoginDto)
+        user = await user__aauthenticate(login_dto=login_dto)
+    except (BadRequest, BusinessLogicException, PasswordHashingOverloaded) as error:
+        return _error_response(error)
+    await sync_to_async(login, thread_sensitive=False)(request, user)
+    stream_key = await sync_to_async(user__issue_missing_stream_key, thread_sensitive=False)(user=user)
+    return _user_response(user=user, stream_key=stream_key)
+
+
+async def registration_view(request: HttpRequest) -> HttpResponse:
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+    try:
+        registration_dto = _parse(request, RegistrationDto)
+        user = await user__acreate(validated_data=registration_dto)
+    except (BadRequest, BusinessLogicException, PasswordHashingOverloaded) as error:
+        return _error_response(error)
+    stream_key = await sync_to_async(stream_key__rotate, thread_sensitive=False)(user=user)
+    await sync_to_async(login, thread_sensitive=False)(request, user)
+    return _user_response(user=user, stream_key=stream_key)
+
+
+# django 4.2 csrf_exempt / require_POST wrap views synchronously, so the flag is set directly
+login_view.csrf_exempt = True
+registration_view.csrf_exempt = True
@@ -0,0 +1,126 @@
+import time
+
+from asgiref.sync import sync_to_async
+
+from apps.stream.constants import SESSION_KIND_PLAY, SESSION_KIND_PUBLISH
+from apps.stream.dto.ingest import IngestNodeDto
+from apps.stream.dto.session import LiveSessionDto
+from apps.stream.logic.interactors.ingest import ingest_nodes, ingest_placement
+from apps.stream.logic.interactors.live import live__session_finished, live__session_started
+from apps.user.logic.interactors.stream_key import (
+    stream_key__decode, stream_key__hash, stream_key__user_id, stream_key__verify_stateless, stream_key_cache,
+    stream_key_epochs
+)
+from utils.asgi import Request, Response, Router
+
+
+def rtmp__stream_name(form: dict[str, str]) -> str | None:
+    # nginx-rtmp posts the stream name as `name`, the DRF endpoint expects `key`
+    return form.get('name') or form.get('key')
+
+
+def rtmp__node(request: Request) -> str:
+    client = request.scope.get('client')
+    return client[0] if client else 'unknown'
+
+
+def rtmp__session(*, request: Request, form: dict[str, str], kind: str, user_id: int | None = None) -> LiveSessionDto:
+    return LiveSessionDto(
+        kind=kind,
+        stream=rtmp__stream_name(form),
+        node=rtmp__node(request),
+        client_id=form.get('clientid', ''),
+        addr=form.get('addr'),
+        user_id=user_id,
+        started_at=time.time(),
+        finished_at=None,
+    )
+
+
+def rtmp__redirect_node(*, request: Request, form: dict[str, str], placement_key: str) -> IngestNodeDto | None:
+    """
+    Ingest node the publish should move to, None to accept it where it is:
+    when the calling node is not registered (single node setups) or the publisher
+    is another ingest node relaying an already placed stream.
+    """
+    current = ingest_placement.node_by_addr(rtmp__node(request))
+    if current is None or ingest_placement.node_by_addr(form.get('addr', '')) is not None:
+        return None
+    node = ingest_placement.place(key=placement_key)
+    return node if node is not None and node.node != current.node else None
+
+
+async def stream_key__averify(*, key: str) -> bool:
+    # stateless keys are verified inline once the epoch table is loaded, legacy keys may need the database
+    if stream_key_epochs.loaded:
+        is_valid = stream_key__verify_stateless(key=key)
+        if is_valid is not None:
+            return is_valid
+    if stream_key_cache.get_local(stream_key__hash(key=key)) is not None:
+        return True
+    return await sync_to_async(stream_key__decode, thread_sensitive=False)(key=key)
+
+
+async def on_publish(request: Request) -> Response:
+    form = request.form()
+    key = rtmp__stream_name(form)
+    if not key or not await stream_key__averify(key=key):
+        return Response(status=401)
+    user_id = stream_key__user_id(key=key)
+    # sticky per user, so a reconnect with a rotated key lands on the same node
+    placement_key = str(user_id or key)
+    if ingest_nodes.loaded:
+        node = rtmp__redirect_node(request=request, form=form, placement_key=placement_key)
+    else:
+        # loading the node table is blocking redis I/O, keep it off the event loop
+        node = await sync_to_async(rtmp__redirect_node, thread_sensitive=False)(
+            request=request, form=form, placement_key=placement_key
+        )
+    if node is not None:
+        # nginx-rtmp relays the stream to an rtmp:// location, the session is recorded there
+        return Response(status=302, headers=[('location', f'{node.url}/{key}')])
+    session = rtmp__session(request=request, form=form, kind=SESSION_KIND_PUBLISH, user_id=user_id)
+    await sync_to_async(live__session_started, thread_sensitive=False)(session=session)
+    return Response(status=200)
+
+
+async def on_play(request: Request) -> Response:
+    form = request.form()
+    if not rtmp__stream_name(form):
+        return Response(status=404)
+    session = rtmp__session(request=request, form=form, kind=SESSION_KIND_PLAY)
+    await sync_to_async(live__session_started, thread_sensitive=False)(session=session)
+    return Response(status=200)
+
+
+async def _session_done(request: Request, kind: str) -> Response:
+    form = request.form()
+    await sync_to_async(live__session_finished, thread_sensitive=False)(
+        kind=kind,
+        stream=rtmp__stream_name(form) or '',
+        node=rtmp__node(request),
+        client_id=form.get('clientid', ''),
+    )
+    return Response(status=200)
+
+
+async def on_play_done(request: Request) -> Response:
+    return await _session_done(request, SESSION_KIND_PLAY)
+
+
+async def on_publish_done(request: Request) -> Response:
+    return await _session_done(request, SESSION_KIND_PUBLISH)
+
+
+async def on_done(request: Request) -> Response:
+    # sessions are closed by the dedicated on_play_done / on_publish_done callbacks
+    return Response(status=200)
+
+
+rtmp_router = Router([
+    ('POST', r'/rtmp/on_publish/?', on_publish),
+    ('POST', r'/rtmp/on_play/?', on_play),
+    ('POST', r'/rtmp/on_play_done/?', on_play_done),
+    ('POST', r'/rtmp/on_publish_done/?', on_publish_done),
+    ('POST', r'/rtmp/on_done/?', on_done),
+])
@@ -1,7 +1,7 @@
 from apps.user.models import User
 from restdoctor.rest_framework.serializers import PydanticSerializer
 
-from apps.user.dto.authenticate import RegistrationDto, LoginDto
+from apps.user.dto.authenticate import RegistrationDto, LoginDto, StreamKeysDto, StreamKeyVerdictDto
 from rest_framework import serializers
 
 
@@ -19,3 +19,13 @@ class RegistrationSerializer(PydanticSerializer):
 class LoginSerializer(PydanticSerializer):
     class Meta:
         pydantic_model = LoginDto
+
+
+class StreamKeysSerializer(PydanticSerializer):
+    class Meta:
+        pydantic_model = StreamKeysDto
+
+
+class StreamKeyVerdictSerializer(PydanticSerializer):
+    class Meta:
+        pydantic_model = StreamKeyVerdictDto
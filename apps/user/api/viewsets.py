@@ -5,11 +5,15 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from restdoctor.rest_framework import viewsets
 
-from apps.user.api.serializers import RegistrationSerializer, UserSerializer, LoginSerializer
-from apps.user.dto.authenticate import LoginDto
-from apps.user.logic.facades.user import user__registration
-from apps.user.logic.interactors.stream_key import stream_key__decode
-from apps.user.logic.interactors.user import user__generate_stream_key, user__authenticate
+from apps.user.api.serializers import (
+    RegistrationSerializer, UserSerializer, LoginSerializer, StreamKeysSerializer, StreamKeyVerdictSerializer
+)
+from apps.user.dto.authenticate import LoginDto, StreamKeyVerdictDto
+from apps.user.logic.facades.user import user__issue_missing_stream_key, user__registration
+from apps.user.logic.interactors.stream_key import (
+    stream_key__decode, stream_key__decode_many, stream_key__revoke, stream_key__rotate
+)
+from apps.user.logic.interactors.user import user__authenticate
 from apps.user.models import User
 from apps.widget_settings.api.serializers import WidgetSettingsPydanticSerializer
 
@@ -21,7 +25,8 @@ class UserViewSet(viewsets.ModelViewSet):
         'login': [permissions.AllowAny],
         'registration': [permissions.AllowAny],
         'logout': [permissions.IsAuthenticated],
-        'auth': [permissions.AllowAny]
+        'auth': [permissions.AllowAny],
+        'auth_batch': [permissions.AllowAny],
     }
     serializer_class_map = {
         'default': UserSerializer,
@@ -33,6 +38,10 @@ class UserViewSet(viewsets.ModelViewSet):
         },
         'settings': {
             'request': WidgetSettingsPydanticSerializer
+        },
+        'auth_batch': {
+            'request': StreamKeysSerializer,
+            'response': StreamKeyVerdictSerializer,
         }
     }
 
@@ -64,16 +73,19 @@ class UserViewSet(viewsets.ModelViewSet):
             )
         )
         login(request, user)
-        stream_key = user__generate_stream_key(user=user)
+        stream_key = user__issue_missing_stream_key(user=user)
         response_serializer = self.get_response_serializer(
             instance=user
         )
-        return Response(
-            data=response_serializer.data,
-            headers={
+        headers = {}
+        if stream_key is not None:
+            headers = {
                 'access-control-expose-headers': 'Set-Cookie',
                 'Set-Cookie': f"stream_key={stream_key}; Path=/; Same-site=Lax",
             }
+        return Response(
+            data=response_serializer.data,
+            headers=headers
         )
 
     @action(detail=False, methods=['post'])
@@ -89,14 +101,34 @@ class UserViewSet(viewsets.ModelViewSet):
             return Response(status=200)
         return Response(status=401)
 
+    @action(detail=False, methods=['post'])
+    def auth_batch(self, request: Request) -> Response:
+        request_serializer = self.get_request_serializer(data=request.data)
+        request_serializer.is_valid(raise_exception=True)
+        verdicts = stream_key__decode_many(keys=request_serializer.pydantic_instance.keys)
+        response_serializer = self.get_response_serializer(
+            instance=[StreamKeyVerdictDto(key=key, is_valid=is_valid) for key, is_valid in verdicts.items()],
+            many=True,
+        )
+        return Response(response_serializer.data)
+
+    @action(detail=False, methods=['post'])
+    def revoke_stream_key(self, request: Request) -> Response:
+        stream_key__revoke(user=request.user)
+        return Response(status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post'])
+    def rotate_stream_key(self, request: Request) -> Response:
+        stream_key = stream_key__rotate(user=request.user)
+        return Response(
+            status=status.HTTP_200_OK,
+            headers={
+                'access-control-expose-headers': 'Set-Cookie',
+                'Set-Cookie': f"stream_key={stream_key}; Path=/; Same-site=Lax",
+            }
+        )
+
     @action(detail=False, methods=['get'])
     def me(self, request: Request) -> Response:
         return Response(self.get_response_serializer(instance=request.user).data, status=status.HTTP_200_OK)
 
-
-
-        # @action(detail=True, methods=['get'])
-        # def get_chunk(self, request: Request, client_id: typing.Any) -> Response:
-        #     global some_dict[client_id] = stream_id
-        #     data = requests.get(f'http://127.0.0.1:8000/hls/{chank_id}').data
-        #     return Response(data)
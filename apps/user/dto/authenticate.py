@@ -1,3 +1,5 @@
+from pydantic import conlist
+
 from utils.dto import BaseDto
 
 
@@ -11,3 +13,12 @@ class RegistrationDto(BaseDto):
 class LoginDto(BaseDto):
     username: str
     password: str
+
+
+class StreamKeysDto(BaseDto):
+    keys: conlist(str, min_items=1, max_items=1000)
+
+
+class StreamKeyVerdictDto(BaseDto):
+    key: str
+    is_valid: bool
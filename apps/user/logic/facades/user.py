@@ -1,9 +1,18 @@
 from apps.user.dto.authenticate import RegistrationDto
-from apps.user.logic.interactors.user import user__create, user__generate_stream_key
+from apps.user.logic.interactors.stream_key import stream_key__rotate
+from apps.user.logic.interactors.user import user__create
+from apps.user.logic.selectors.stream_key import stream_key__find_by_user
 from apps.user.models import User
 
 
 def user__registration(*, validated_data: RegistrationDto) -> tuple[User, str]:
     user = user__create(validated_data=validated_data)
-    stream_key = user__generate_stream_key(user=user)
+    stream_key = stream_key__rotate(user=user)
     return user, stream_key
+
+
+def user__issue_missing_stream_key(*, user: User) -> str | None:
+    """Issues a key for users without an active one, issued keys can not be shown again."""
+    if stream_key__find_by_user(user=user).exists():
+        return None
+    return stream_key__rotate(user=user)
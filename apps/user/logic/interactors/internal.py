@@ -0,0 +1,25 @@
+import hmac
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http.cookie import parse_cookie
+
+from apps.user.logic.selectors.session import session__user
+from utils.asgi import Request
+
+
+async def internal__authorized(*, request: Request) -> bool:
+    """
+    Monitoring endpoints list live stream names, and a stream name is its publish key:
+    they need the INTERNAL_API_TOKEN bearer token (scrapers, dashboards) or a staff session.
+    """
+    scheme, _, token = request.headers.get('authorization', '').partition(' ')
+    if settings.INTERNAL_API_TOKEN and scheme.lower() == 'bearer' and hmac.compare_digest(
+        token.encode(), settings.INTERNAL_API_TOKEN.encode()
+    ):
+        return True
+    session_key = parse_cookie(request.headers.get('cookie', '')).get(settings.SESSION_COOKIE_NAME)
+    if not session_key:
+        return False
+    user = await sync_to_async(session__user, thread_sensitive=False)(session_key=session_key)
+    return user is not None and user.is_staff
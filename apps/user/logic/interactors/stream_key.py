@@ -1,16 +1,187 @@
+import hashlib
+
 import jwt
 from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.user.logic.selectors.stream_key import (
+    STREAM_KEY_EPOCH_REVOKED, stream_key__epochs, stream_key__find_by_user, stream_key__signing_keys
+)
+from apps.user.logic.interactors.user import user__generate_stream_key
+from apps.user.logic.selectors.user import user__find_by_username, user__find_by_usernames, user__filter_active
+from apps.user.models import StreamKey, User
+from utils.cache import TwoTierCache
+from utils.redis import PushedHashTable
+
+stream_key_cache = TwoTierCache(
+    alias=settings.STREAM_KEY_CACHE_ALIAS,
+    prefix='stream_key',
+    max_size=settings.STREAM_KEY_CACHE_SIZE,
+    local_ttl=settings.STREAM_KEY_CACHE_LOCAL_TTL,
+    shared_ttl=settings.STREAM_KEY_CACHE_TTL,
+)
+stream_key_epochs = PushedHashTable(
+    name='stream_key:epochs',
+    alias=settings.STREAM_KEY_CACHE_ALIAS,
+    loader=stream_key__epochs,
+)
+
 
-from apps.user.logic.selectors.user import user__find_by_username, user__exists
+def stream_key__hash(*, key: str) -> str:
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def stream_key__verify_stateless(*, key: str) -> bool | None:
+    """
+    Verifies keys carrying user id, issue time and key epoch without touching the database.
+    Returns None for legacy (username/email payload) keys, they need a lookup.
+    """
+    token = key.partition('_')[2]
+    try:
+        kid = jwt.get_unverified_header(token).get('kid')
+        if kid is None:
+            return None
+        secret = stream_key__signing_keys().get(kid)
+        if secret is None:
+            return False
+        payload = jwt.decode(
+            jwt=token,
+            key=secret,
+            algorithms=['HS256'],
+            options={'require': ['sub', 'iat', 'ep']},
+        )
+    except jwt.InvalidTokenError:
+        return False
+    return payload['ep'] >= stream_key_epochs.get(int(payload['sub']))
 
 
 def stream_key__decode(key):
-    stream_key = key.split('_')[1]
-    user_payload = jwt.decode(
-        jwt=stream_key,
+    is_valid = stream_key__verify_stateless(key=key)
+    if is_valid is not None:
+        return is_valid
+    key_hash = stream_key__hash(key=key)
+    if stream_key_cache.get(key_hash) is not None:
+        return True
+    try:
+        user_payload = jwt.decode(
+            jwt=key.partition('_')[2],
+            key=settings.STREAM_KEY,
+            algorithms=['HS256']
+        )
+    except jwt.InvalidTokenError:
+        return False
+    # legacy keys carry no epoch, they stop working once the user revokes keys
+    user = user__filter_active(
+        queryset=user__find_by_username(username=user_payload.get('username'))
+    ).filter(stream_key_epoch=0).values_list('pk', flat=True).first()
+    if user is None:
+        return False
+    stream_key_cache.set(key_hash, user)
+    return True
+
+
+def stream_key__decode_many(*, keys: list[str]) -> dict[str, bool]:
+    """
+    Verdicts for a batch of keys: stateless keys are checked in memory,
+    uncached legacy keys are decoded in one pass and resolved with a single query.
+    """
+    verdicts = {}
+    legacy_usernames = {}
+    for key in keys:
+        is_valid = stream_key__verify_stateless(key=key)
+        if is_valid is not None:
+            verdicts[key] = is_valid
+            continue
+        key_hash = stream_key__hash(key=key)
+        if stream_key_cache.get(key_hash) is not None:
+            verdicts[key] = True
+            continue
+        try:
+            user_payload = jwt.decode(jwt=key.partition('_')[2], key=settings.STREAM_KEY, algorithms=['HS256'])
+        except jwt.InvalidTokenError:
+            verdicts[key] = False
+            continue
+        legacy_usernames[key] = user_payload.get('username')
+    if legacy_usernames:
+        users = dict(
+            user__filter_active(
+                queryset=user__find_by_usernames(usernames=set(legacy_usernames.values()))
+            ).filter(stream_key_epoch=0).values_list('username', 'pk')
+        )
+        for key, username in legacy_usernames.items():
+            user = users.get(username)
+            verdicts[key] = user is not None
+            if user is not None:
+                stream_key_cache.set(stream_key__hash(key=key), user)
+    return verdicts
+
+
+def stream_key__user_id(*, key: str) -> int | None:
+    """User id of an already verified key, without touching the database."""
+    token = key.partition('_')[2]
+    try:
+        payload = jwt.decode(jwt=token, options={'verify_signature': False})
+    except jwt.InvalidTokenError:
+        return None
+    if 'sub' in payload:
+        return int(payload['sub'])
+    return stream_key_cache.get_local(stream_key__hash(key=key))
+
+
+def stream_key__invalidate(*, key: str) -> None:
+    stream_key_cache.delete(stream_key__hash(key=key))
+
+
+def stream_key__legacy(*, user: User) -> str:
+    return "stream_" + jwt.encode(
+        payload={'username': user.username, 'email': user.email},
         key=settings.STREAM_KEY,
-        algorithms=['HS256']
+        algorithm='HS256',
     )
-    user = user__find_by_username(username=user_payload.get('username'))
-    is_user_exists = user__exists(queryset=user)
-    return is_user_exists
+
+
+def stream_key__invalidate_for_user(*, user: User) -> None:
+    stream_key__invalidate(key=stream_key__legacy(user=user))
+
+
+def stream_key__publish_epoch(*, user: User) -> None:
+    stream_key_epochs.set(
+        user.pk, user.stream_key_epoch if user.is_active else STREAM_KEY_EPOCH_REVOKED
+    )
+
+
+def stream_key__revoke_stored(*, user: User) -> None:
+    stream_key__find_by_user(user=user).update(revoked_at=timezone.now())
+
+
+def _stream_key__revoke(*, user: User) -> None:
+    # the user row lock serializes concurrent rotations, so one key at most stays active
+    list(User.objects.select_for_update().filter(pk=user.pk).values_list('pk', flat=True))
+    stream_key__revoke_stored(user=user)
+    User.objects.filter(pk=user.pk).update(stream_key_epoch=F('stream_key_epoch') + 1)
+    user.refresh_from_db(fields=['stream_key_epoch'])
+
+
+def stream_key__rotate(*, user: User) -> str:
+    """
+    Revokes every key of the user and issues a new stateless one, the plain key is only returned here.
+    The epoch bump retires the previous key without a lookup, the stored hash records the active key.
+    """
+    with transaction.atomic():
+        _stream_key__revoke(user=user)
+        stream_key = user__generate_stream_key(user=user)
+        StreamKey.objects.create(user=user, key_hash=stream_key__hash(key=stream_key))
+    stream_key__publish_epoch(user=user)
+    stream_key__invalidate_for_user(user=user)
+    return stream_key
+
+
+def stream_key__revoke(*, user: User) -> int:
+    """Revokes every key of the user: stored rows, stateless keys (epoch bump) and legacy ones."""
+    with transaction.atomic():
+        _stream_key__revoke(user=user)
+    stream_key__publish_epoch(user=user)
+    stream_key__invalidate_for_user(user=user)
+    return user.stream_key_epoch
@@ -1,40 +1,89 @@
+import time
+
 import jwt
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from django.contrib.auth import authenticate
-from django.contrib.auth.hashers import make_password
+from django.contrib.auth.hashers import identify_hasher
 from apps.user.models import User
 
 from apps.user.dto.authenticate import RegistrationDto, LoginDto
+from apps.user.logic.selectors.stream_key import stream_key__signing_keys
+from apps.user.logic.selectors.user import user__find_by_username
 from utils.exeption import BusinessLogicException
+from utils.hashing import password__acheck, password__amake, password__check, password__make
 
+MODEL_BACKEND = 'django.contrib.auth.backends.ModelBackend'
 
-def user__create(*, validated_data: RegistrationDto) -> User:
-    username = validated_data.username
-    password = validated_data.password
-    email = validated_data.email
-    re_password = validated_data.re_password
-    if password != re_password:
+
+def user__validate_registration(*, validated_data: RegistrationDto) -> None:
+    if validated_data.password != validated_data.re_password:
         raise BusinessLogicException('Пароли не совпадают')
-    hashed_password = make_password(password)
-    user = User.objects.create(username=username, password=hashed_password)
+
+
+def user__create(*, validated_data: RegistrationDto) -> User:
+    user__validate_registration(validated_data=validated_data)
+    hashed_password = password__make(validated_data.password)
+    user = User.objects.create(username=validated_data.username, password=hashed_password)
+    return user
+
+
+async def user__acreate(*, validated_data: RegistrationDto) -> User:
+    user__validate_registration(validated_data=validated_data)
+    hashed_password = await password__amake(validated_data.password)
+    user = await sync_to_async(User.objects.create, thread_sensitive=False)(
+        username=validated_data.username, password=hashed_password,
+    )
     return user
 
 
 def user__generate_stream_key(*, user: User) -> str:
+    kid = settings.STREAM_KEY_ACTIVE_KID
     stream_key = "stream_" + jwt.encode(
-        payload={'username': user.username, 'email': user.email},
-        key=settings.STREAM_KEY,
+        payload={'sub': str(user.pk), 'iat': int(time.time()), 'ep': user.stream_key_epoch},
+        key=stream_key__signing_keys()[kid],
         algorithm='HS256',
+        headers={'kid': kid},
     )
     return stream_key
 
 
-def user__authenticate(login_dto: LoginDto):
-    user = authenticate(
-        username=login_dto.username,
-        password=login_dto.password
-    )
-    if not user:
+def user__password_needs_rehash(*, user: User) -> bool:
+    try:
+        return identify_hasher(user.password).must_update(user.password)
+    except ValueError:
+        return False
+
+
+def user__authenticated(*, user: User | None, is_password_valid: bool) -> User:
+    if user is None or not is_password_valid or not user.is_active:
         raise BusinessLogicException('Пользователь не найден')
+    user.backend = MODEL_BACKEND
+    return user
+
+
+def user__authenticate(login_dto: LoginDto):
+    """Same checks as ModelBackend, with the hashing done on the hashing executor."""
+    user = user__find_by_username(username=login_dto.username).first()
+    if user is None:
+        # hash anyway, so unknown usernames can not be told apart by response time
+        password__make(login_dto.password)
+        return user__authenticated(user=None, is_password_valid=False)
+    is_password_valid = password__check(login_dto.password, user.password)
+    user = user__authenticated(user=user, is_password_valid=is_password_valid)
+    if user__password_needs_rehash(user=user):
+        user.password = password__make(login_dto.password)
+        user.save(update_fields=['password'])
     return user
 
+
+async def user__aauthenticate(login_dto: LoginDto) -> User:
+    user = await sync_to_async(user__find_by_username(username=login_dto.username).first, thread_sensitive=False)()
+    if user is None:
+        await password__amake(login_dto.password)
+        return user__authenticated(user=None, is_password_valid=False)
+    is_password_valid = await password__acheck(login_dto.password, user.password)
+    user = user__authenticated(user=user, is_password_valid=is_password_valid)
+    if user__password_needs_rehash(user=user):
+        user.password = await password__amake(login_dto.password)
+        await sync_to_async(user.save, thread_sensitive=False)(update_fields=['password'])
+    return user
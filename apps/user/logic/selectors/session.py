@@ -0,0 +1,28 @@
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth import HASH_SESSION_KEY, SESSION_KEY
+from django.utils.crypto import constant_time_compare
+
+from apps.user.logic.selectors.user import user__filter_active, user__find_by_pk
+from apps.user.models import User
+
+
+def session__user(*, session_key: str) -> User | None:
+    """Active user logged in with the session, the same checks django.contrib.auth.get_user applies."""
+    session = import_module(settings.SESSION_ENGINE).SessionStore(session_key=session_key)
+    user_id = session.get(SESSION_KEY)
+    if user_id is None:
+        return None
+    user = user__find_by_pk(pk=user_id, queryset=user__filter_active())
+    if user is None:
+        return None
+    session_hash = session.get(HASH_SESSION_KEY)
+    if not session_hash or not constant_time_compare(session_hash, user.get_session_auth_hash()):
+        return None
+    return user
+
+
+def session__user_id(*, session_key: str) -> int | None:
+    user = session__user(session_key=session_key)
+    return user.pk if user is not None else None
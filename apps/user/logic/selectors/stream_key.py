@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.db.models import QuerySet
+
+from apps.user.logic.selectors.user import user__all
+from apps.user.models import StreamKey, User
+
+STREAM_KEY_EPOCH_REVOKED = 2 ** 31 - 1
+
+
+def stream_key__signing_keys() -> dict[str, str]:
+    return {'default': settings.STREAM_KEY, **settings.STREAM_KEY_SIGNING_KEYS}
+
+
+def stream_key__epochs(queryset: QuerySet[User] | None = None) -> dict[int, int]:
+    if queryset is None:
+        queryset = user__all()
+    epochs = dict(queryset.filter(is_active=True, stream_key_epoch__gt=0).values_list('pk', 'stream_key_epoch'))
+    epochs.update(
+        (pk, STREAM_KEY_EPOCH_REVOKED) for pk in queryset.filter(is_active=False).values_list('pk', flat=True)
+    )
+    return epochs
+
+
+def stream_key__all() -> QuerySet[StreamKey]:
+    return StreamKey.objects.all()
+
+
+def stream_key__filter_active(queryset: QuerySet[StreamKey] | None = None) -> QuerySet[StreamKey]:
+    if queryset is None:
+        queryset = stream_key__all()
+    return queryset.filter(revoked_at__isnull=True)
+
+
+def stream_key__find_by_user(user: User, queryset: QuerySet[StreamKey] | None = None) -> QuerySet[StreamKey]:
+    return stream_key__filter_active(queryset=queryset).filter(user=user)
@@ -1,3 +1,5 @@
+import typing
+
 from django.db.models import QuerySet
 
 from apps.user.models import User
@@ -19,7 +21,22 @@ def user__find_by_username(username: str, queryset: QuerySet[User] | None = None
     return queryset.filter(username=username)
 
 
+def user__find_by_usernames(
+        usernames: typing.Iterable[str],
+        queryset: QuerySet[User] | None = None
+) -> QuerySet[User]:
+    if queryset is None:
+        queryset = user__all()
+    return queryset.filter(username__in=usernames)
+
+
 def user__exists(queryset: QuerySet[User]) -> bool:
     if queryset is None:
         queryset = user__all()
     return queryset.exists()
+
+
+def user__filter_active(queryset: QuerySet[User] | None = None) -> QuerySet[User]:
+    if queryset is None:
+        queryset = user__all()
+    return queryset.filter(is_active=True)
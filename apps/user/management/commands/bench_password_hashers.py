@@ -0,0 +1,57 @@
+import time
+import typing
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, get_hashers
+from django.core.management.base import BaseCommand
+
+from utils.hashing import HashingExecutor
+
+
+class Command(BaseCommand):
+    help = 'Измеряет пропускную способность логина (проверок пароля в секунду) на один процесс для разных хешеров'
+
+    def add_arguments(self, parser: typing.Any) -> None:
+        parser.add_argument('--logins', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=16, help='Одновременных логинов')
+        parser.add_argument(
+            '--workers', type=int, nargs='+', default=[1, settings.PASSWORD_HASHING_WORKERS],
+            help='Размеры пула хеширования',
+        )
+        parser.add_argument(
+            '--hashers', nargs='+', default=None,
+            help='Алгоритмы (pbkdf2_sha256, argon2, bcrypt_sha256, ...), по умолчанию все из PASSWORD_HASHERS',
+        )
+
+    def handle(self, *args: typing.Any, **options: typing.Any) -> None:
+        hashers = [
+            hasher for hasher in get_hashers()
+            if options['hashers'] is None or hasher.algorithm in options['hashers']
+        ]
+        for hasher in hashers:
+            try:
+                encoded = hasher.encode('benchmark-password', hasher.salt())
+            except ValueError as error:
+                # optional hasher libraries (argon2-cffi, bcrypt) may be missing
+                self.stdout.write(f'{hasher.algorithm}: пропущен ({error})')
+                continue
+            for workers in options['workers']:
+                rate = self._logins_per_second(
+                    encoded=encoded,
+                    logins=options['logins'],
+                    concurrency=options['concurrency'],
+                    workers=workers,
+                )
+                self.stdout.write(f'{hasher.algorithm}: workers={workers} logins/sec={rate:.1f}')
+
+    def _logins_per_second(self, *, encoded: str, logins: int, concurrency: int, workers: int) -> float:
+        executor = HashingExecutor(max_workers=workers, max_pending=concurrency)
+        # request threads submit to the hashing pool and wait, as the sync interactors do
+        with ThreadPoolExecutor(max_workers=concurrency) as requests:
+            started_at = time.perf_counter()
+            list(requests.map(
+                lambda _: executor.run(check_password, 'benchmark-password', encoded), range(logins)
+            ))
+            elapsed = time.perf_counter() - started_at
+        return logins / elapsed
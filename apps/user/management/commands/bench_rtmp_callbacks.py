@@ -0,0 +1,77 @@
+import asyncio
+import statistics
+import time
+import typing
+from urllib.parse import urlencode
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from apps.user.api.rtmp import rtmp_router
+from apps.user.logic.interactors.stream_key import stream_key_cache
+from apps.user.logic.interactors.user import user__generate_stream_key
+from apps.user.logic.selectors.user import user__find_by_username
+
+
+class Command(BaseCommand):
+    help = 'Сравнивает p50/p99 задержки DRF эндпоинта /api/users/auth/ и ASGI колбэка /rtmp/on_publish/'
+
+    def add_arguments(self, parser: typing.Any) -> None:
+        parser.add_argument('--username', required=True)
+        parser.add_argument('--key', help='Ключ пользователя, по умолчанию выпускается stateless ключ')
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument('--cold', action='store_true', help='Сбрасывать кеш ключей перед каждым запросом')
+
+    def handle(self, *args: typing.Any, **options: typing.Any) -> None:
+        user = user__find_by_username(username=options['username']).first()
+        if user is None:
+            raise CommandError('Пользователь не найден')
+        key = options['key'] or user__generate_stream_key(user=user)
+        requests_count = options['requests']
+        cold = options['cold']
+
+        client = Client()
+        drf_timings = []
+        for _ in range(requests_count):
+            if cold:
+                stream_key_cache.local.clear()
+            started_at = time.perf_counter()
+            client.post('/api/users/auth/', data={'key': key})
+            drf_timings.append(time.perf_counter() - started_at)
+
+        asgi_timings = asyncio.run(self._bench_asgi(key=key, requests_count=requests_count, cold=cold))
+
+        self._report(name='DRF /api/users/auth/', timings=drf_timings)
+        self._report(name='ASGI /rtmp/on_publish/', timings=asgi_timings)
+
+    async def _bench_asgi(self, *, key: str, requests_count: int, cold: bool) -> list[float]:
+        body = urlencode({'call': 'publish', 'app': 'live', 'name': key}).encode()
+        scope = {
+            'type': 'http',
+            'method': 'POST',
+            'path': '/rtmp/on_publish',
+            'query_string': b'',
+            'headers': [(b'content-type', b'application/x-www-form-urlencoded')],
+        }
+
+        async def receive() -> dict:
+            return {'type': 'http.request', 'body': body, 'more_body': False}
+
+        async def send(message: dict) -> None:
+            pass
+
+        timings = []
+        for _ in range(requests_count):
+            if cold:
+                stream_key_cache.local.clear()
+            started_at = time.perf_counter()
+            await rtmp_router(scope, receive, send)
+            timings.append(time.perf_counter() - started_at)
+        return timings
+
+    def _report(self, *, name: str, timings: list[float]) -> None:
+        percentiles = statistics.quantiles(timings, n=100)
+        self.stdout.write(
+            f'{name}: p50={percentiles[49] * 1000:.3f}ms p99={percentiles[98] * 1000:.3f}ms '
+            f'n={len(timings)}'
+        )
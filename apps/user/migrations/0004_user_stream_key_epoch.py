@@ -0,0 +1,21 @@
+# Generated by Django 4.2.8 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("user", "0003_user_avatar"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="stream_key_epoch",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="Увеличивается при отзыве ключей трансляции",
+                verbose_name="Эпоха ключа трансляции",
+            ),
+        ),
+    ]
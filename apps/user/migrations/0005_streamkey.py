@@ -0,0 +1,68 @@
+# Generated by Django 4.2.8 on 2026-10-18 12:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("user", "0004_user_stream_key_epoch"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StreamKey",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "key_hash",
+                    models.CharField(
+                        help_text="sha256 ключа трансляции, сам ключ не хранится",
+                        max_length=64,
+                        unique=True,
+                        verbose_name="Хеш ключа",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        help_text="Дата создания",
+                        verbose_name="Дата создания",
+                    ),
+                ),
+                (
+                    "revoked_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="Дата отзыва",
+                        null=True,
+                        verbose_name="Дата отзыва",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        help_text="Пользователь",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stream_keys",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Пользователь",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Ключ трансляции",
+                "verbose_name_plural": "Ключи трансляции",
+            },
+        ),
+    ]
@@ -13,3 +13,39 @@ class User(AbstractUser):
         null=True,
         blank=True
     )
+    stream_key_epoch = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Эпоха ключа трансляции',
+        help_text='Увеличивается при отзыве ключей трансляции'
+    )
+
+
+class StreamKey(models.Model):
+    class Meta:
+        verbose_name = "Ключ трансляции"
+        verbose_name_plural = "Ключи трансляции"
+
+    user = models.ForeignKey(
+        to=User,
+        related_name='stream_keys',
+        on_delete=models.CASCADE,
+        verbose_name='Пользователь',
+        help_text='Пользователь'
+    )
+    key_hash = models.CharField(
+        max_length=64,
+        unique=True,
+        verbose_name='Хеш ключа',
+        help_text='sha256 ключа трансляции, сам ключ не хранится'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата создания',
+        help_text='Дата создания'
+    )
+    revoked_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Дата отзыва',
+        help_text='Дата отзыва'
+    )
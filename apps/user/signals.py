@@ -0,0 +1,25 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.user.logic.interactors.stream_key import (
+    stream_key__invalidate_for_user, stream_key__publish_epoch, stream_key__revoke_stored, stream_key_epochs
+)
+from apps.user.logic.selectors.stream_key import STREAM_KEY_EPOCH_REVOKED
+from apps.user.models import User
+
+
+@receiver(post_save, sender=User)
+def user__post_save(sender: type[User], instance: User, update_fields: frozenset | None = None, **kwargs) -> None:
+    if update_fields == frozenset({'last_login'}):
+        return
+    stream_key__publish_epoch(user=instance)
+    if not instance.is_active:
+        stream_key__revoke_stored(user=instance)
+        stream_key__invalidate_for_user(user=instance)
+
+
+@receiver(post_delete, sender=User)
+def user__post_delete(sender: type[User], instance: User, **kwargs) -> None:
+    stream_key_epochs.set(instance.pk, STREAM_KEY_EPOCH_REVOKED)
+    stream_key__invalidate_for_user(user=instance)
+
@@ -12,11 +12,13 @@ def test__generate_stream_key__success_case(user_factory):
         username='some_username'
     )
     key = user__generate_stream_key(user=user)
-    stream_key = key.split('_')[1]
+    stream_key = key.partition('_')[2]
     user_payload = jwt.decode(
         jwt=stream_key,
         key=settings.STREAM_KEY,
         algorithms=['HS256']
     )
-    assert user_payload.get('email') == user.email
-    assert user_payload.get('username') == user.username
\ No newline at end of file
+    assert jwt.get_unverified_header(stream_key).get('kid') == settings.STREAM_KEY_ACTIVE_KID
+    assert user_payload.get('sub') == str(user.pk)
+    assert user_payload.get('ep') == user.stream_key_epoch
+    assert 'iat' in user_payload
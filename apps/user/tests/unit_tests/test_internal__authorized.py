@@ -0,0 +1,20 @@
+import asyncio
+
+from apps.user.logic.interactors.internal import internal__authorized
+from utils.asgi import Request
+
+
+def _request(headers: list[tuple[bytes, bytes]]) -> Request:
+    return Request({'type': 'http', 'method': 'GET', 'path': '/streams/live/', 'query_string': b'', 'headers': headers})
+
+
+def test__internal__authorized__token_case(settings):
+    settings.INTERNAL_API_TOKEN = 'monitoring'
+    assert asyncio.run(internal__authorized(request=_request([(b'authorization', b'Bearer monitoring')]))) is True
+    assert asyncio.run(internal__authorized(request=_request([(b'authorization', b'Bearer other')]))) is False
+
+
+def test__internal__authorized__anonymous_case(settings):
+    settings.INTERNAL_API_TOKEN = ''
+    assert asyncio.run(internal__authorized(request=_request([(b'authorization', b'Bearer ')]))) is False
+    assert asyncio.run(internal__authorized(request=_request([]))) is False
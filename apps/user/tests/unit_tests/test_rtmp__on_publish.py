@@ -0,0 +1,27 @@
+import asyncio
+
+from apps.user.api.rtmp import rtmp_router
+
+
+def _call(path: str, body: bytes) -> list[dict]:
+    scope = {'type': 'http', 'method': 'POST', 'path': path, 'query_string': b'', 'headers': []}
+    messages = []
+
+    async def receive() -> dict:
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    async def send(message: dict) -> None:
+        messages.append(message)
+
+    asyncio.run(rtmp_router(scope, receive, send))
+    return messages
+
+
+def test__rtmp__on_publish__invalid_key_case():
+    messages = _call('/rtmp/on_publish', b'call=publish&app=live&name=stream_invalid')
+    assert messages[0]['status'] == 401
+
+
+def test__rtmp__on_publish__missing_key_case():
+    messages = _call('/rtmp/on_publish', b'call=publish&app=live')
+    assert messages[0]['status'] == 401
@@ -1,6 +1,6 @@
 import pytest
 
-from apps.user.logic.interactors.stream_key import stream_key__decode
+from apps.user.logic.interactors.stream_key import stream_key__decode, stream_key__legacy
 from apps.user.logic.interactors.user import user__generate_stream_key
 
 
@@ -13,3 +13,35 @@ def test__stream_key__decode__success_case(user_factory):
     key = user__generate_stream_key(user=user)
     is_user_exists = stream_key__decode(key=key)
     assert is_user_exists is True
+
+
+@pytest.mark.django_db()
+def test__stream_key__decode__cached_case(user_factory, django_assert_num_queries):
+    user = user_factory(
+        email='cached@example.com',
+        username='cached_user'
+    )
+    key = user__generate_stream_key(user=user)
+    legacy_key = stream_key__legacy(user=user)
+    assert stream_key__decode(key=key) is True
+    assert stream_key__decode(key=legacy_key) is True
+    with django_assert_num_queries(0):
+        assert stream_key__decode(key=key) is True
+        assert stream_key__decode(key=legacy_key) is True
+
+
+@pytest.mark.django_db()
+def test__stream_key__decode__deactivated_case(user_factory):
+    user = user_factory(
+        email='inactive@example.com',
+        username='inactive_user'
+    )
+    key = user__generate_stream_key(user=user)
+    assert stream_key__decode(key=key) is True
+    user.is_active = False
+    user.save()
+    assert stream_key__decode(key=key) is False
+
+
+def test__stream_key__decode__invalid_case():
+    assert stream_key__decode(key='stream_invalid') is False
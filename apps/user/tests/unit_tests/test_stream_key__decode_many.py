@@ -0,0 +1,17 @@
+import pytest
+
+from apps.user.logic.interactors.stream_key import stream_key__decode_many, stream_key__legacy, stream_key_cache
+from apps.user.logic.interactors.user import user__generate_stream_key
+
+
+@pytest.mark.django_db()
+def test__stream_key__decode_many__success_case(user_factory, django_assert_max_num_queries):
+    users = [user_factory(email=f'batch_{index}@example.com') for index in range(5)]
+    stream_key__decode_many(keys=[user__generate_stream_key(user=users[0])])  # loads the epoch table
+    legacy_keys = [stream_key__legacy(user=user) for user in users]
+    stateless_keys = [user__generate_stream_key(user=user) for user in users]
+    stream_key_cache.local.clear()
+    with django_assert_max_num_queries(1):
+        verdicts = stream_key__decode_many(keys=legacy_keys + stateless_keys + ['stream_invalid'])
+    assert all(verdicts[key] for key in legacy_keys + stateless_keys)
+    assert verdicts['stream_invalid'] is False
@@ -0,0 +1,40 @@
+import pytest
+from django_redis import get_redis_connection
+
+from apps.user.logic.interactors.stream_key import (
+    stream_key__decode, stream_key__legacy, stream_key__revoke, stream_key_epochs
+)
+from apps.user.logic.interactors.user import user__generate_stream_key
+from apps.user.logic.selectors.stream_key import stream_key__epochs
+from utils.redis import PushedHashTable
+
+
+@pytest.mark.django_db()
+def test__stream_key__revoke__success_case(user_factory):
+    user = user_factory(
+        email='revoke@example.com',
+        username='revoke_user'
+    )
+    key = user__generate_stream_key(user=user)
+    legacy_key = stream_key__legacy(user=user)
+    assert stream_key__decode(key=key) is True
+    assert stream_key__decode(key=legacy_key) is True
+    epoch = stream_key__revoke(user=user)
+    assert epoch == 1
+    assert stream_key__decode(key=key) is False
+    assert stream_key__decode(key=legacy_key) is False
+    assert stream_key__decode(key=user__generate_stream_key(user=user)) is True
+
+
+@pytest.mark.django_db()
+def test__stream_key__revoke__flushed_case(user_factory):
+    user = user_factory(
+        email='flushed@example.com',
+        username='flushed_user'
+    )
+    stream_key__revoke(user=user)
+    connection = get_redis_connection(stream_key_epochs.alias)
+    connection.delete(stream_key_epochs.name)
+    epochs = PushedHashTable(name=stream_key_epochs.name, alias=stream_key_epochs.alias, loader=stream_key__epochs)
+    assert epochs.get(user.pk) == 1
+    assert connection.hget(stream_key_epochs.name, user.pk) == b'1'
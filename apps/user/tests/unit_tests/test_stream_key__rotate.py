@@ -0,0 +1,26 @@
+import pytest
+
+from apps.user.logic.interactors.stream_key import stream_key__decode, stream_key__revoke, stream_key__rotate
+from apps.user.models import StreamKey
+
+
+@pytest.mark.django_db()
+def test__stream_key__rotate__success_case(user_factory, django_assert_num_queries):
+    user = user_factory()
+    key = stream_key__rotate(user=user)
+    assert stream_key__decode(key=key) is True
+    with django_assert_num_queries(0):
+        assert stream_key__decode(key=key) is True
+    new_key = stream_key__rotate(user=user)
+    assert stream_key__decode(key=key) is False
+    assert stream_key__decode(key=new_key) is True
+    assert StreamKey.objects.filter(user=user, revoked_at__isnull=True).count() == 1
+
+
+@pytest.mark.django_db()
+def test__stream_key__rotate__revoke_case(user_factory):
+    user = user_factory()
+    key = stream_key__rotate(user=user)
+    assert stream_key__decode(key=key) is True
+    stream_key__revoke(user=user)
+    assert stream_key__decode(key=key) is False
@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+from django.contrib.auth.hashers import make_password
+
+from apps.user.dto.authenticate import LoginDto
+from apps.user.logic.interactors.user import user__aauthenticate, user__authenticate
+from utils.exeption import BusinessLogicException
+
+
+@pytest.mark.django_db(transaction=True)
+def test__user__aauthenticate__success_case(user_factory):
+    user = user_factory(
+        username='async_user',
+        password=make_password('password')
+    )
+    authenticated_user = asyncio.run(
+        user__aauthenticate(login_dto=LoginDto(username=user.username, password='password'))
+    )
+    assert authenticated_user == user
+
+
+@pytest.mark.django_db(transaction=True)
+def test__user__aauthenticate__error_case(user_factory):
+    user = user_factory(
+        username='async_user_error',
+        password=make_password('password')
+    )
+    with pytest.raises(BusinessLogicException):
+        asyncio.run(user__aauthenticate(login_dto=LoginDto(username=user.username, password='wrong')))
+
+
+@pytest.mark.django_db()
+def test__user__authenticate__valid_password_case(user_factory):
+    user = user_factory(
+        username='sync_user',
+        password=make_password('password')
+    )
+    assert user__authenticate(login_dto=LoginDto(username=user.username, password='password')) == user
@@ -2,6 +2,7 @@ import pytest
 
 from apps.user.dto.authenticate import RegistrationDto
 from apps.user.logic.facades.user import user__registration
+from apps.user.logic.interactors.stream_key import stream_key__decode
 
 
 @pytest.mark.django_db()
@@ -12,7 +13,8 @@ def test__user_registration__success_case():
         password='testTest',
         re_password='testTest',
     )
-    user__registration(
+    user, stream_key = user__registration(
         validated_data=dto
     )
+    assert stream_key__decode(key=stream_key) is True
 
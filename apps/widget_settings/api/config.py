@@ -0,0 +1,106 @@
+import asyncio
+import typing
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from apps.widget_settings.logic.events import WidgetEventHub, WidgetSubscription
+from apps.widget_settings.logic.interactors.widget_config import widget_config__get, widget_config_cache
+from apps.widget_settings.logic.interactors.widget_fragment import widget_fragment__get, widget_fragment_cache
+from utils.asgi import EventStreamResponse, Request, Response, Router
+from utils.cache import MISSING
+
+# retry is the reconnect delay of EventSource, in milliseconds
+EVENTS_RETRY = b'retry: 3000\n\n'
+EVENTS_HEARTBEAT = b': heartbeat\n\n'
+
+widget_event_hub = WidgetEventHub(url=settings.WIDGET_EVENTS_REDIS_URL)
+
+
+async def widget_config__find(*, code: str) -> tuple[str, bytes] | None:
+    """A local cache hit is answered without leaving the event loop, only a miss of both tiers reaches the database."""
+    config = widget_config_cache.get_local(code, MISSING)
+    if config is MISSING:
+        config = await sync_to_async(widget_config__get, thread_sensitive=False)(code=code)
+    return config
+
+
+async def widget_config(request: Request, code: str) -> Response:
+    """Public widget settings by code for overlays, no session."""
+    config = await widget_config__find(code=code)
+    if config is None:
+        return Response(status=404)
+    etag, body = config
+    headers = [
+        ('etag', etag),
+        ('cache-control', f'public, max-age={settings.WIDGET_CONFIG_MAX_AGE}'),
+        # overlays are embedded into pages of any origin
+        ('access-control-allow-origin', '*'),
+    ]
+    if etag == request.headers.get('if-none-match'):
+        return Response(status=304, headers=headers)
+    return Response(body=body, headers=headers, content_type='application/json')
+
+
+async def widget_events__stream(
+        *,
+        subscription: WidgetSubscription,
+        config: bytes,
+) -> typing.AsyncGenerator[bytes, None]:
+    try:
+        yield EVENTS_RETRY + b'event: settings\ndata: ' + config + b'\n\n'
+        while True:
+            try:
+                await asyncio.wait_for(subscription.changed.wait(), timeout=settings.WIDGET_EVENTS_HEARTBEAT)
+            except asyncio.TimeoutError:
+                yield EVENTS_HEARTBEAT
+                continue
+            subscription.changed.clear()
+            yield b'id: %d\nevent: settings\ndata: %s\n\n' % (subscription.version, subscription.config)
+    finally:
+        await widget_event_hub.unsubscribe(subscription)
+
+
+async def widget_events(request: Request, code: str) -> Response:
+    """
+    Settings of a widget as server-sent events: the current ones on connect, then every save.
+    Subscribed before the config is read, a save in between is pushed rather than lost.
+    """
+    subscription = await widget_event_hub.subscribe(code)
+    config = await widget_config__find(code=code)
+    if config is None:
+        await widget_event_hub.unsubscribe(subscription)
+        return Response(status=404)
+    return EventStreamResponse(
+        widget_events__stream(subscription=subscription, config=config[1]),
+        headers=[('access-control-allow-origin', '*')],
+    )
+
+
+async def widget_fragment(request: Request, digest: str) -> Response:
+    """Rendered widget HTML by content hash: it never changes, so browsers and CDNs keep it for good."""
+    etag = f'"{digest}"'
+    headers = [
+        ('etag', etag),
+        ('cache-control', 'public, max-age=31536000, immutable'),
+        ('access-control-allow-origin', '*'),
+    ]
+    if etag == request.headers.get('if-none-match'):
+        return Response(status=304, headers=headers)
+    html = widget_fragment_cache.get_local(digest)
+    if html is None:
+        html = await sync_to_async(widget_fragment__get, thread_sensitive=False)(digest=digest)
+    if html is None:
+        return Response(status=404)
+    return Response(body=html.encode(), headers=headers, content_type='text/html; charset=utf-8')
+
+
+async def widget__shutdown() -> None:
+    await widget_event_hub.close()
+
+
+widget_router = Router([
+    ('GET', r'/widgets/(?P<code>[A-Za-z0-9_-]{1,255})/?', widget_config),
+    ('GET', r'/widgets/(?P<code>[A-Za-z0-9_-]{1,255})/events/?', widget_events),
+    ('GET', r'/widgets/fragments/(?P<digest>[0-9a-f]{32})\.html', widget_fragment),
+])
@@ -6,11 +6,10 @@ from restdoctor.rest_framework import viewsets
 from silk.profiling.profiler import silk_profile
 
 from apps.widget_settings.api.serializers import WidgetSettingsSerializer, WidgetSettingsPydanticSerializer
-from apps.widget_settings.dto.settings import SettingsDto
 from apps.widget_settings.logic.facades.widget_settings import create_widget_settings
 from apps.widget_settings.logic.selectors.widget_settings import widget_settings__find_by_user_and_code
 from apps.widget_settings.models import WidgetSettings
-from utils.exeption import BusinessLogicException
+from utils.exeption import BadRequest, BusinessLogicException
 
 
 class WidgetSettingsViewSet(viewsets.ModelViewSet):
@@ -28,18 +27,34 @@ class WidgetSettingsViewSet(viewsets.ModelViewSet):
         'default': [permissions.IsAuthenticated, ]
     }
 
+    @staticmethod
+    def get_expected_version(request: Request) -> int | None:
+        """Version from If-Match, the ETag save_settings responds with; `*` or no header saves unconditionally."""
+        if_match = request.headers.get('If-Match', '*').strip()
+        if if_match == '*':
+            return None
+        version = if_match.removeprefix('W/').strip('"')
+        if not version.isdigit():
+            raise BadRequest('Некорректный заголовок If-Match')
+        return int(version)
+
     @action(detail=False, methods=['post'])
     def save_settings(self, request: Request) -> Response:
         request_serializer = self.get_request_serializer(
             data=request.data
         )
         request_serializer.is_valid(raise_exception=True)
-        code = create_widget_settings(
+        code, version = create_widget_settings(
             user=request.user,
-            settings_dto=request_serializer.pydantic_instance
+            settings_dto=request_serializer.pydantic_instance,
+            expected_version=self.get_expected_version(request)
         )
 
-        return Response(data={'code': code}, status=status.HTTP_201_CREATED)
+        return Response(
+            data={'code': code, 'version': version},
+            status=status.HTTP_201_CREATED,
+            headers={'ETag': f'"{version}"'}
+        )
 
     @action(detail=False, methods=['get'])
     def get_settings(self, request: Request) -> Response:
@@ -52,6 +67,6 @@ class WidgetSettingsViewSet(viewsets.ModelViewSet):
         if settings is None:
             raise BusinessLogicException('Настройки не найдены')
         response_serializer = self.get_response_serializer(
-            instance=SettingsDto(**settings.settings.dict())
+            instance=settings.settings_dto
         )
-        return Response(response_serializer.data)
+        return Response(response_serializer.data, headers={'ETag': f'"{settings.version}"'})
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class WidgetSettingsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.widget_settings"
+
+    def ready(self) -> None:
+        from apps.widget_settings import signals  # noqa: F401
@@ -0,0 +1,2 @@
+# `<version>\n<config json>` of a saved widget, published after commit
+WIDGET_EVENTS_CHANNEL = 'widget_settings:events:{code}'
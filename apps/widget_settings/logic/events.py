@@ -0,0 +1,110 @@
+import asyncio
+
+import structlog
+from redis import asyncio as redis
+from redis.exceptions import RedisError
+
+from apps.widget_settings.constants import WIDGET_EVENTS_CHANNEL
+
+logger = structlog.get_logger(__name__)
+
+CHANNEL_PREFIX = WIDGET_EVENTS_CHANNEL.format(code='')
+
+
+class WidgetSubscription:
+    """
+    One SSE stream. Keeps only the latest config, a slow client skips the saves in between
+    instead of queueing them; versions never go back when publishes arrive out of order.
+    """
+
+    __slots__ = ('code', 'version', 'config', 'changed')
+
+    def __init__(self, *, code: str) -> None:
+        self.code = code
+        self.version = 0
+        self.config = b''
+        self.changed = asyncio.Event()
+
+    def push(self, *, version: int, config: bytes) -> None:
+        if version > self.version:
+            self.version = version
+            self.config = config
+            self.changed.set()
+
+
+class WidgetEventHub:
+    """
+    Fans the saves published over redis out to the SSE streams of this process: one pub/sub
+    connection, subscribed to the channel of a code while at least one stream watches it.
+    """
+
+    retry_interval = 1.0
+
+    def __init__(self, *, url: str) -> None:
+        self.url = url
+        self._subscriptions: dict[str, set[WidgetSubscription]] = {}
+        self._client: redis.Redis | None = None
+        self._pubsub: redis.client.PubSub | None = None
+        self._reader: asyncio.Task | None = None
+
+    async def subscribe(self, code: str) -> WidgetSubscription:
+        subscription = WidgetSubscription(code=code)
+        subscriptions = self._subscriptions.get(code)
+        if subscriptions is None:
+            subscriptions = self._subscriptions[code] = set()
+            subscriptions.add(subscription)
+            await self._channel(subscribe=True, code=code)
+        else:
+            subscriptions.add(subscription)
+        return subscription
+
+    async def unsubscribe(self, subscription: WidgetSubscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.code)
+        if subscriptions is None:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscriptions[subscription.code]
+            await self._channel(subscribe=False, code=subscription.code)
+
+    async def close(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+            self._reader = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _channel(self, *, subscribe: bool, code: str) -> None:
+        if self._pubsub is None:
+            self._client = redis.from_url(self.url)
+            self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        channel = WIDGET_EVENTS_CHANNEL.format(code=code)
+        try:
+            if subscribe:
+                await self._pubsub.subscribe(channel)
+            else:
+                await self._pubsub.unsubscribe(channel)
+        except RedisError as error:
+            # the pub/sub connection resubscribes its channels once it reconnects
+            logger.warning('widget_events.subscribe_failed', code=code, error=str(error))
+        if self._reader is None:
+            self._reader = asyncio.create_task(self._read())
+
+    async def _read(self) -> None:
+        while True:
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except RedisError as error:
+                logger.warning('widget_events.read_failed', error=str(error))
+                await asyncio.sleep(self.retry_interval)
+                continue
+            if message is None or message['type'] != 'message':
+                continue
+            code = message['channel'].decode()[len(CHANNEL_PREFIX):]
+            version, _, config = message['data'].partition(b'\n')
+            for subscription in self._subscriptions.get(code, ()):
+                subscription.push(version=int(version), config=config)
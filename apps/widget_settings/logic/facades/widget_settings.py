@@ -1,26 +1,57 @@
+from django.db import transaction
 from python_random_strings import random_strings
 
 from apps.user.models import User
 from apps.widget_settings.dto.settings import SettingsDto
+from apps.widget_settings.logic.interactors.widget_config import widget_config__invalidate, widget_config__publish
+from apps.widget_settings.logic.interactors.widget_fragment import widget_fragment__build
+from apps.widget_settings.logic.interactors.widget_settings import (
+    widget_settings__update_fragment, widget_settings__upsert
+)
 from apps.widget_settings.logic.selectors.widget_settings import widget_settings__find_by_user
-from apps.widget_settings.models import WidgetSettings
+from utils.exeption import PreconditionFailed
 
 
 def create_widget_settings(
         *,
         user: User,
-        settings_dto: SettingsDto
-):
-    widget = widget_settings__find_by_user(
-        user=user
+        settings_dto: SettingsDto,
+        expected_version: int | None = None,
+) -> tuple[str, int]:
+    fragment = widget_fragment__build(settings_dto=settings_dto, user=user)
+    saved = widget_settings__upsert(
+        user=user,
+        settings_dto=settings_dto,
+        code=random_strings.random_letters(20),
+        fragment=fragment,
+        expected_version=expected_version,
     )
+    if saved is None:
+        raise PreconditionFailed()
+    code, version = saved
+    transaction.on_commit(lambda: widget_settings__committed(
+        code=code, version=version, settings_dto=settings_dto, fragment=fragment[0]
+    ))
+    return code, version
+
+
+def refresh_widget_fragment(*, user: User) -> None:
+    """Re-renders the widget of a user after the user data it shows has changed."""
+    widget = widget_settings__find_by_user(user=user)
     if widget is None:
-        widget, created = WidgetSettings.objects.update_or_create(
-            settings=settings_dto.dict(),
-            user=user
-        )
-        if created:
-            widget.code = random_strings.random_letters(20)
-            widget.save()
+        return
+    settings_dto = widget.settings_dto
+    fragment = widget_fragment__build(settings_dto=settings_dto, user=user)
+    saved = widget_settings__update_fragment(widget=widget, fragment=fragment)
+    if saved is None:
+        return
+    code, version = saved
+    transaction.on_commit(lambda: widget_settings__committed(
+        code=code, version=version, settings_dto=settings_dto, fragment=fragment[0]
+    ))
+
 
-    return widget.code
+def widget_settings__committed(*, code: str, version: int, settings_dto: SettingsDto, fragment: str) -> None:
+    # raw SQL sends no post_save, the public config is dropped here
+    widget_config__invalidate(code=code)
+    widget_config__publish(code=code, version=version, settings_dto=settings_dto, fragment=fragment)
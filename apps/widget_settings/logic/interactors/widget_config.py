@@ -0,0 +1,59 @@
+import hashlib
+
+import orjson
+import structlog
+from django.conf import settings
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+
+from apps.widget_settings.constants import WIDGET_EVENTS_CHANNEL
+from apps.widget_settings.dto.settings import SettingsDto
+from apps.widget_settings.logic.interactors.widget_fragment import widget_fragment__url
+from apps.widget_settings.logic.selectors.widget_settings import widget_settings__find_by_code
+from utils.cache import MISSING, TwoTierCache
+
+logger = structlog.get_logger(__name__)
+
+# code -> (etag, json body) of the public widget config, None for an unknown code
+widget_config_cache = TwoTierCache(
+    alias=settings.WIDGET_CONFIG_CACHE_ALIAS,
+    prefix='widget_config',
+    max_size=settings.WIDGET_CONFIG_CACHE_SIZE,
+    local_ttl=settings.WIDGET_CONFIG_CACHE_LOCAL_TTL,
+    shared_ttl=settings.WIDGET_CONFIG_CACHE_TTL,
+)
+
+
+def widget_config__encode(*, settings_dto: SettingsDto, fragment: str | None) -> tuple[str, bytes]:
+    """
+    The body get_settings responds with plus the URL of the rendered fragment, serialized once;
+    the strong ETag is a digest of the exact bytes.
+    """
+    body = orjson.dumps({'data': {**settings_dto.dict(), 'fragment_url': widget_fragment__url(digest=fragment)}})
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"', body
+
+
+def widget_config__get(*, code: str) -> tuple[str, bytes] | None:
+    config = widget_config_cache.get(code, MISSING)
+    if config is not MISSING:
+        return config
+    widget = widget_settings__find_by_code(code=code)
+    # unknown codes are cached too, so guessing codes does not reach the database either
+    config = None
+    if widget is not None:
+        config = widget_config__encode(settings_dto=widget.settings_dto, fragment=widget.fragment)
+    widget_config_cache.set(code, config)
+    return config
+
+
+def widget_config__invalidate(*, code: str) -> None:
+    widget_config_cache.delete(code)
+
+
+def widget_config__publish(*, code: str, version: int, settings_dto: SettingsDto, fragment: str | None) -> None:
+    """Pushes a committed save to the SSE streams of the code in every web worker."""
+    _, body = widget_config__encode(settings_dto=settings_dto, fragment=fragment)
+    try:
+        get_redis_connection('redis').publish(WIDGET_EVENTS_CHANNEL.format(code=code), b'%d\n%s' % (version, body))
+    except RedisError:
+        logger.warning('widget_config.publish_failed', code=code)
@@ -0,0 +1,69 @@
+import datetime
+import hashlib
+
+from django.conf import settings
+from django.db import connection
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from apps.user.models import User
+from apps.widget_settings.dto.settings import SettingsDto
+from apps.widget_settings.logic.selectors.widget_fragment import widget_fragment__find_html
+from apps.widget_settings.models import WidgetFragment, WidgetSettings
+from utils.cache import MISSING, TwoTierCache
+
+WIDGET_FRAGMENT_URL = '/widgets/fragments/{digest}.html'
+
+# digest -> html, entries never go stale, the content is addressed by its hash
+widget_fragment_cache = TwoTierCache(
+    alias=settings.WIDGET_CONFIG_CACHE_ALIAS,
+    prefix='widget_fragment',
+    max_size=settings.WIDGET_FRAGMENT_CACHE_SIZE,
+    local_ttl=settings.WIDGET_CONFIG_CACHE_TTL,
+    shared_ttl=settings.WIDGET_CONFIG_CACHE_TTL,
+)
+
+# a fragment written by a save that is not current any more is kept for the pages still showing it
+UNREFERENCED_FRAGMENTS_SQL = f"""
+DELETE FROM {WidgetFragment._meta.db_table} AS fragment
+WHERE fragment.created_at < %(created_before)s
+    AND NOT EXISTS (
+        SELECT FROM {WidgetSettings._meta.db_table} AS widget WHERE widget.fragment = fragment.digest
+    )
+"""
+
+
+def widget_fragment__render(*, settings_dto: SettingsDto, user: User) -> str:
+    return render_to_string('widget_settings/fragment.html', {
+        'settings': settings_dto,
+        'username': settings_dto.username or user.username,
+        'avatar_url': user.avatar.url if user.avatar else None,
+    })
+
+
+def widget_fragment__build(*, settings_dto: SettingsDto, user: User) -> tuple[str, str]:
+    """(digest, html) of the widget, rendered from the settings and the user without a query."""
+    html = widget_fragment__render(settings_dto=settings_dto, user=user)
+    return hashlib.blake2b(html.encode(), digest_size=16).hexdigest(), html
+
+
+def widget_fragment__url(*, digest: str | None) -> str | None:
+    return WIDGET_FRAGMENT_URL.format(digest=digest) if digest else None
+
+
+def widget_fragment__get(*, digest: str) -> str | None:
+    html = widget_fragment_cache.get(digest, MISSING)
+    if html is not MISSING:
+        return html
+    html = widget_fragment__find_html(digest=digest)
+    if html is not None:
+        # an unknown digest is not cached, the save writing it may not have committed yet
+        widget_fragment_cache.set(digest, html)
+    return html
+
+
+def widget_fragment__collect(*, keep: datetime.timedelta = datetime.timedelta(days=1)) -> int:
+    """Deletes the fragments no widget points to any more, autosaving editors leave one per save."""
+    with connection.cursor() as cursor:
+        cursor.execute(UNREFERENCED_FRAGMENTS_SQL, {'created_before': timezone.now() - keep})
+        return cursor.rowcount
@@ -0,0 +1,82 @@
+import orjson
+from django.db import connection
+
+from apps.user.models import User
+from apps.widget_settings.dto.settings import SettingsDto
+from apps.widget_settings.models import WidgetFragment, WidgetSettings
+
+# the rendered fragment is stored in the same round trip, content addressed rows are only ever inserted
+FRAGMENT_CTE = f"""
+WITH stored_fragment AS (
+    INSERT INTO {WidgetFragment._meta.db_table} (digest, html, created_at)
+    VALUES (%(fragment)s, %(html)s, now())
+    ON CONFLICT (digest) DO NOTHING
+)
+"""
+
+# the code is only taken by a new row or a row that has none yet, saving never changes a published code
+UPSERT_SQL = FRAGMENT_CTE + f"""
+INSERT INTO {WidgetSettings._meta.db_table} AS widget (user_id, settings, code, version, fragment)
+VALUES (%(user_id)s, %(settings)s::jsonb, %(code)s, 1, %(fragment)s)
+ON CONFLICT (user_id) DO UPDATE SET
+    settings = EXCLUDED.settings,
+    code = coalesce(widget.code, EXCLUDED.code),
+    version = widget.version + 1,
+    fragment = EXCLUDED.fragment
+RETURNING code, version
+"""
+
+# If-Match: only the version the editor has seen is overwritten
+UPDATE_VERSION_SQL = FRAGMENT_CTE + f"""
+UPDATE {WidgetSettings._meta.db_table} AS widget SET
+    settings = %(settings)s::jsonb,
+    code = coalesce(widget.code, %(code)s),
+    version = widget.version + 1,
+    fragment = %(fragment)s
+WHERE widget.user_id = %(user_id)s AND widget.version = %(version)s
+RETURNING code, version
+"""
+
+# user data shown by the widget changed, the settings stay
+UPDATE_FRAGMENT_SQL = FRAGMENT_CTE + f"""
+UPDATE {WidgetSettings._meta.db_table} AS widget SET
+    version = widget.version + 1,
+    fragment = %(fragment)s
+WHERE widget.id = %(id)s AND widget.fragment IS DISTINCT FROM %(fragment)s
+RETURNING code, version
+"""
+
+
+def widget_settings__upsert(
+        *,
+        user: User,
+        settings_dto: SettingsDto,
+        code: str,
+        fragment: tuple[str, str],
+        expected_version: int | None = None,
+) -> tuple[str, int] | None:
+    """
+    Saves the widget of a user and its rendered (digest, html) fragment in one statement,
+    without a read or full_clean before it. Returns (code, version), None when
+    expected_version is given and is not the stored one.
+    """
+    params = {
+        'user_id': user.pk,
+        'settings': orjson.dumps(settings_dto.dict()).decode(),
+        'code': code,
+        'version': expected_version,
+        'fragment': fragment[0],
+        'html': fragment[1],
+    }
+    with connection.cursor() as cursor:
+        cursor.execute(UPSERT_SQL if expected_version is None else UPDATE_VERSION_SQL, params)
+        row = cursor.fetchone()
+    return (row[0], row[1]) if row is not None else None
+
+
+def widget_settings__update_fragment(*, widget: WidgetSettings, fragment: tuple[str, str]) -> tuple[str, int] | None:
+    """(code, version) after pointing the widget to another fragment, None when it already shows this one."""
+    with connection.cursor() as cursor:
+        cursor.execute(UPDATE_FRAGMENT_SQL, {'id': widget.pk, 'fragment': fragment[0], 'html': fragment[1]})
+        row = cursor.fetchone()
+    return (row[0], row[1]) if row is not None else None
@@ -0,0 +1,5 @@
+from apps.widget_settings.models import WidgetFragment
+
+
+def widget_fragment__find_html(*, digest: str) -> str | None:
+    return WidgetFragment.objects.filter(digest=digest).values_list('html', flat=True).first()
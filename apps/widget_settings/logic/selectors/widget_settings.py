@@ -25,3 +25,40 @@ def widget_settings__find_by_user_and_code(
     if not queryset:
         queryset = widget_settings__all()
     return queryset.filter(user=user, code=code).first()
+
+
+def widget_settings__find_by_code(
+        code: str,
+        queryset: QuerySet[WidgetSettings] | None = None
+) -> WidgetSettings | None:
+    if queryset is None:
+        queryset = widget_settings__all()
+    return queryset.filter(code=code).first()
+
+
+def widget_settings__filter_by_settings(
+        *,
+        contains: dict | None = None,
+        jsonpath: str | None = None,
+        queryset: QuerySet[WidgetSettings] | None = None
+) -> QuerySet[WidgetSettings]:
+    """
+    Widgets by settings attributes, filtered in SQL on the GIN index: `contains` is matched
+    with @> (`{'avatar': True}`), `jsonpath` is a predicate matched with @@ (`$.width > 800`).
+    """
+    if queryset is None:
+        queryset = widget_settings__all()
+    if contains:
+        queryset = queryset.filter(settings__contains=contains)
+    if jsonpath:
+        queryset = queryset.filter(settings__jsonpath_match=jsonpath)
+    return queryset
+
+
+def widget_settings__with_avatar_wider_than(
+        width: int,
+        queryset: QuerySet[WidgetSettings] | None = None
+) -> QuerySet[WidgetSettings]:
+    return widget_settings__filter_by_settings(
+        contains={'avatar': True}, jsonpath=f'$.width > {int(width)}', queryset=queryset
+    )
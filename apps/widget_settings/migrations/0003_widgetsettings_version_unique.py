@@ -0,0 +1,41 @@
+# Generated by Django 4.2.8 on 2026-10-18 18:00
+
+from django.db import migrations, models
+
+# concurrent saves could create several rows per user, the latest one is what get_settings served
+DEDUPLICATE_SQL = """
+DELETE FROM widget_settings_widgetsettings AS widget
+USING widget_settings_widgetsettings AS newer
+WHERE newer.user_id = widget.user_id AND newer.id > widget.id
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("widget_settings", "0002_widgetsettings_code"),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=DEDUPLICATE_SQL, reverse_sql=migrations.RunSQL.noop),
+        migrations.AddField(
+            model_name="widgetsettings",
+            name="version",
+            field=models.PositiveIntegerField(
+                default=1,
+                help_text="Растёт с каждым сохранением, передаётся в ETag и проверяется по If-Match",
+                verbose_name="Версия",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="widgetsettings",
+            constraint=models.UniqueConstraint(
+                fields=("user",), name="widget_settings_user_unique"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="widgetsettings",
+            constraint=models.UniqueConstraint(
+                fields=("code",), name="widget_settings_code_unique"
+            ),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.8 on 2026-10-18 19:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("widget_settings", "0003_widgetsettings_version_unique"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WidgetFragment",
+            fields=[
+                (
+                    "digest",
+                    models.CharField(
+                        help_text="blake2b содержимого фрагмента",
+                        max_length=32,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="Хеш",
+                    ),
+                ),
+                (
+                    "html",
+                    models.TextField(
+                        help_text="Готовый к встраиванию HTML фрагмент",
+                        verbose_name="HTML",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        help_text="Дата создания",
+                        verbose_name="Дата создания",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Фрагмент виджета",
+                "verbose_name_plural": "Фрагменты виджета",
+            },
+        ),
+        migrations.AddField(
+            model_name="widgetsettings",
+            name="fragment",
+            field=models.CharField(
+                blank=True,
+                help_text="Хеш отрендеренного HTML фрагмента виджета",
+                max_length=32,
+                null=True,
+                verbose_name="Фрагмент",
+            ),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.8 on 2026-10-18 20:00
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # the GIN index is built without blocking saves
+    atomic = False
+
+    dependencies = [
+        ("widget_settings", "0004_widgetfragment"),
+    ]
+
+    operations = [
+        # the pydantic schema field was already stored as jsonb, only the python side changes
+        migrations.AlterField(
+            model_name="widgetsettings",
+            name="settings",
+            field=models.JSONField(
+                help_text="Настройки окна траснляции, поля SettingsDto",
+                verbose_name="Настройки окна траснляции",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="widgetsettings",
+            index=GinIndex(
+                fields=["settings"],
+                name="widget_settings_settings_gin",
+                opclasses=["jsonb_path_ops"],
+            ),
+        ),
+    ]
@@ -1,19 +1,32 @@
+import pydantic
+from django.contrib.postgres.indexes import GinIndex
+from django.core.exceptions import ValidationError
 from django.db import models
-import django_pydantic_field
 
 from apps.widget_settings.dto.settings import SettingsDto
 from utils.abstractions.model import AbstractBaseModel
 from apps.user.models import User
+from utils import lookups  # noqa: F401 - jsonpath lookups of the settings selectors
 
 
 class WidgetSettings(AbstractBaseModel):
     class Meta:
         verbose_name = 'Настройки виджета'
         verbose_name_plural = 'Настройки виджета'
+        constraints = [
+            # one widget per user, the conflict target of widget_settings__upsert
+            models.UniqueConstraint(fields=['user'], name='widget_settings_user_unique'),
+            # public configs are looked up by code
+            models.UniqueConstraint(fields=['code'], name='widget_settings_code_unique'),
+        ]
+        indexes = [
+            # containment and jsonpath queries on the settings (@>, @?, @@)
+            GinIndex(fields=['settings'], opclasses=['jsonb_path_ops'], name='widget_settings_settings_gin'),
+        ]
 
-    settings: SettingsDto = django_pydantic_field.SchemaField(
+    settings = models.JSONField(
         verbose_name='Настройки окна траснляции',
-        help_text='Настройки окна траснляции'
+        help_text='Настройки окна траснляции, поля SettingsDto'
     )
     user = models.ForeignKey(
         to=User,
@@ -28,3 +41,56 @@ class WidgetSettings(AbstractBaseModel):
         blank=True,
         null=True
     )
+    version = models.PositiveIntegerField(
+        default=1,
+        verbose_name='Версия',
+        help_text='Растёт с каждым сохранением, передаётся в ETag и проверяется по If-Match'
+    )
+    fragment = models.CharField(
+        max_length=32,
+        null=True,
+        blank=True,
+        verbose_name='Фрагмент',
+        help_text='Хеш отрендеренного HTML фрагмента виджета'
+    )
+
+    @property
+    def settings_dto(self) -> SettingsDto:
+        """
+        Parsed on first access, rows loaded for listings keep the plain dict.
+        Parsed again once settings is assigned another dict, in-place changes are not seen.
+        """
+        cached = self.__dict__.get('_settings_dto')
+        if cached is None or cached[0] is not self.settings:
+            cached = self.__dict__['_settings_dto'] = (self.settings, SettingsDto(**self.settings))
+        return cached[1]
+
+    def clean(self) -> None:
+        try:
+            self.settings = SettingsDto(**self.settings).dict()
+        except (TypeError, pydantic.ValidationError) as error:
+            raise ValidationError({'settings': str(error)}) from error
+
+
+class WidgetFragment(models.Model):
+    """Rendered widget HTML stored under the hash of its content, never changes once written."""
+
+    class Meta:
+        verbose_name = 'Фрагмент виджета'
+        verbose_name_plural = 'Фрагменты виджета'
+
+    digest = models.CharField(
+        max_length=32,
+        primary_key=True,
+        verbose_name='Хеш',
+        help_text='blake2b содержимого фрагмента'
+    )
+    html = models.TextField(
+        verbose_name='HTML',
+        help_text='Готовый к встраиванию HTML фрагмент'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата создания',
+        help_text='Дата создания'
+    )
@@ -0,0 +1,27 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.user.models import User
+from apps.widget_settings.logic.facades.widget_settings import refresh_widget_fragment
+from apps.widget_settings.logic.interactors.widget_config import widget_config__invalidate
+from apps.widget_settings.models import WidgetSettings
+
+
+@receiver(post_save, sender=WidgetSettings)
+@receiver(post_delete, sender=WidgetSettings)
+def widget_settings__changed(sender: type[WidgetSettings], instance: WidgetSettings, **kwargs) -> None:
+    if instance.code:
+        # after commit, a reader in between would cache the old settings again
+        code = instance.code
+        transaction.on_commit(lambda: widget_config__invalidate(code=code))
+
+
+@receiver(post_save, sender=User)
+def widget_settings__user_changed(
+        sender: type[User], instance: User, created: bool = False, update_fields: frozenset | None = None, **kwargs
+) -> None:
+    # the fragment shows the username and the avatar, saves of other fields (login, password rehash) keep it
+    if created or (update_fields is not None and not {'username', 'avatar'} & update_fields):
+        return
+    refresh_widget_fragment(user=instance)
@@ -0,0 +1,8 @@
+from config.celery import app
+from apps.widget_settings.logic.interactors.widget_fragment import widget_fragment__collect
+from utils.celery.constant import QUEUE_HEAVY_LONG
+
+
+@app.task(queue=QUEUE_HEAVY_LONG, ignore_result=True)
+def widget_fragment__collect_task() -> int:
+    return widget_fragment__collect()
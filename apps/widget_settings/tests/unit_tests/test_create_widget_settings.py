@@ -0,0 +1,35 @@
+import pytest
+
+from apps.widget_settings.dto.settings import SettingsDto
+from apps.widget_settings.logic.facades.widget_settings import create_widget_settings
+from apps.widget_settings.models import WidgetFragment, WidgetSettings
+from utils.exeption import PreconditionFailed
+
+
+@pytest.mark.django_db()
+def test__create_widget_settings__success_case(user_factory, django_assert_num_queries):
+    user = user_factory()
+    with django_assert_num_queries(1):
+        code, version = create_widget_settings(user=user, settings_dto=SettingsDto(width=300))
+    assert version == 1
+
+    assert create_widget_settings(user=user, settings_dto=SettingsDto(width=400)) == (code, 2)
+    widget = WidgetSettings.objects.get(user=user)
+    assert widget.code == code
+    assert widget.settings_dto.width == 400
+    # the fragment is written by the same statement
+    assert WidgetFragment.objects.get(digest=widget.fragment).html.startswith('<div class="stream-widget"')
+
+
+@pytest.mark.django_db()
+def test__create_widget_settings__if_match_case(user_factory):
+    user = user_factory()
+    code, version = create_widget_settings(user=user, settings_dto=SettingsDto(width=300))
+
+    assert create_widget_settings(
+        user=user, settings_dto=SettingsDto(width=400), expected_version=version
+    ) == (code, version + 1)
+    with pytest.raises(PreconditionFailed):
+        # a stale editor does not overwrite the newer save
+        create_widget_settings(user=user, settings_dto=SettingsDto(width=500), expected_version=version)
+    assert WidgetSettings.objects.get(user=user).settings['width'] == 400
@@ -0,0 +1,30 @@
+import orjson
+import pytest
+
+from apps.widget_settings.logic.interactors.widget_config import widget_config__get, widget_config_cache
+from apps.widget_settings.models import WidgetSettings
+
+
+@pytest.mark.django_db(transaction=True)
+def test__widget_config__get__success_case(user_factory, django_assert_num_queries):
+    widget_config_cache.local.clear()
+    widget = WidgetSettings.objects.create(user=user_factory(), code='code', settings={'width': 300, 'avatar': True})
+
+    etag, body = widget_config__get(code='code')
+    assert orjson.loads(body)['data']['width'] == 300
+    with django_assert_num_queries(0):
+        assert widget_config__get(code='code') == (etag, body)
+
+    widget.settings = {'width': 400, 'avatar': True}
+    widget.save()
+    new_etag, body = widget_config__get(code='code')
+    assert new_etag != etag
+    assert orjson.loads(body)['data']['width'] == 400
+
+
+@pytest.mark.django_db()
+def test__widget_config__get__unknown_code_case(django_assert_num_queries):
+    widget_config_cache.local.clear()
+    assert widget_config__get(code='unknown') is None
+    with django_assert_num_queries(0):
+        assert widget_config__get(code='unknown') is None
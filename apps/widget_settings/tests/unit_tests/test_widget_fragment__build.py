@@ -0,0 +1,15 @@
+from apps.widget_settings.dto.settings import SettingsDto
+from apps.widget_settings.logic.interactors.widget_fragment import widget_fragment__build
+
+
+def test__widget_fragment__build__success_case(user_factory):
+    user = user_factory.build(username='alice')
+    settings_dto = SettingsDto(width=300, is_username=True, is_description=True, description='<b>hi</b>')
+
+    digest, html = widget_fragment__build(settings_dto=settings_dto, user=user)
+
+    assert 'width: 300px;' in html
+    assert '>alice<' in html
+    assert '&lt;b&gt;hi&lt;/b&gt;' in html
+    assert widget_fragment__build(settings_dto=settings_dto, user=user) == (digest, html)
+    assert widget_fragment__build(settings_dto=SettingsDto(width=400), user=user)[0] != digest
@@ -0,0 +1,20 @@
+import pytest
+
+from apps.widget_settings.logic.selectors.widget_settings import (
+    widget_settings__filter_by_settings, widget_settings__with_avatar_wider_than
+)
+from apps.widget_settings.models import WidgetSettings
+
+
+@pytest.mark.django_db()
+def test__widget_settings__filter_by_settings__success_case(user_factory):
+    wide = WidgetSettings.objects.create(user=user_factory(), code='wide', settings={'width': 1024, 'avatar': True})
+    WidgetSettings.objects.create(user=user_factory(), code='narrow', settings={'width': 640, 'avatar': True})
+    WidgetSettings.objects.create(user=user_factory(), code='plain', settings={'width': 1920, 'avatar': False})
+
+    assert list(widget_settings__with_avatar_wider_than(800)) == [wide]
+    assert widget_settings__filter_by_settings(contains={'avatar': True}).count() == 2
+    assert widget_settings__filter_by_settings(jsonpath='$.width > 800').count() == 2
+    # clean() stores every SettingsDto field, unset ones as null
+    assert wide.settings['height'] is None
+    assert wide.settings_dto.width == 1024
@@ -0,0 +1,14 @@
+from apps.widget_settings.logic.events import WidgetSubscription
+
+
+def test__widget_subscription__push__latest_wins_case():
+    subscription = WidgetSubscription(code='code')
+
+    subscription.push(version=2, config=b'{"data": {"width": 2}}')
+    subscription.push(version=4, config=b'{"data": {"width": 4}}')
+    # published out of order, an older save never replaces a newer one
+    subscription.push(version=3, config=b'{"data": {"width": 3}}')
+
+    assert subscription.changed.is_set()
+    assert subscription.version == 4
+    assert subscription.config == b'{"data": {"width": 4}}'
@@ -8,4 +8,23 @@ load_dotenv()
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 os.environ.setdefault('DJANGO_CONFIGURATION', 'Development')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# lean endpoints are imported after django setup, they bypass the middleware stack
+from apps.hls.api.routers import hls__shutdown, hls__startup, hls_router  # noqa: E402
+from apps.stream.api.live import stream_router  # noqa: E402
+from apps.user.api.rtmp import rtmp_router  # noqa: E402
+from apps.widget_settings.api.config import widget__shutdown, widget_router  # noqa: E402
+from utils.asgi import PathPrefixDispatcher  # noqa: E402
+
+application = PathPrefixDispatcher(
+    default=django_application,
+    routes={
+        '/rtmp/': rtmp_router,
+        '/streams/': stream_router,
+        '/hls/': hls_router,
+        '/widgets/': widget_router,
+    },
+    on_startup=[hls__startup],
+    on_shutdown=[hls__shutdown, widget__shutdown],
+)
@@ -0,0 +1,15 @@
+import os
+
+from celery import Celery
+from configurations import importer
+from dotenv import load_dotenv
+
+load_dotenv()
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+os.environ.setdefault('DJANGO_CONFIGURATION', 'Development')
+importer.install()
+
+app = Celery('config')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
@@ -33,6 +33,8 @@ class Base(Configuration):
         'pgbulk',
         'apps.widget_settings',
         'apps.user',
+        'apps.stream',
+        'apps.hls',
 
     ]
     SILKY_PYTHON_PROFILER = True
@@ -116,6 +118,9 @@ class Base(Configuration):
         },
     ]
 
+    PASSWORD_HASHING_WORKERS = values.IntegerValue(4)
+    PASSWORD_HASHING_MAX_PENDING = values.IntegerValue(64)
+
     LANGUAGE_CODE = 'ru'
 
     TIME_ZONE = 'UTC'
@@ -153,9 +158,66 @@ class Base(Configuration):
         ]
     )
 
+    # bearer token of the monitoring endpoints listing live stream names, staff sessions are let in without it
+    INTERNAL_API_TOKEN = values.Value('')
+
     REDIS_HOST = values.Value('localhost')
     REDIS_PORT = values.Value('6379')
     STREAM_KEY = values.Value('some_stream_key')
+    # extra {kid: secret} pairs, keep retired kids here until their keys are rotated out
+    STREAM_KEY_SIGNING_KEYS = values.DictValue({})
+    STREAM_KEY_ACTIVE_KID = values.Value('default')
+    STREAM_KEY_CACHE_ALIAS = values.Value('redis')
+    STREAM_KEY_CACHE_SIZE = values.IntegerValue(10000)
+    STREAM_KEY_CACHE_LOCAL_TTL = values.IntegerValue(5)  # seconds, local tier is not invalidated cross-process
+    STREAM_KEY_CACHE_TTL = values.IntegerValue(300)
+
+    WIDGET_CONFIG_CACHE_ALIAS = values.Value('redis')
+    WIDGET_CONFIG_CACHE_SIZE = values.IntegerValue(10000)
+    WIDGET_CONFIG_CACHE_LOCAL_TTL = values.IntegerValue(5)  # seconds, local tier is not invalidated cross-process
+    WIDGET_CONFIG_CACHE_TTL = values.IntegerValue(24 * 60 * 60)
+    WIDGET_FRAGMENT_CACHE_SIZE = values.IntegerValue(10000)
+    WIDGET_CONFIG_MAX_AGE = values.IntegerValue(5)  # seconds browsers and CDNs reuse a config before revalidating
+    # one pub/sub connection per web worker, fanned out to the SSE streams of the codes it serves
+    WIDGET_EVENTS_REDIS_URL = values.Value('redis://localhost:6379/1', environ_name='REDIS_CACHE_URL')
+    WIDGET_EVENTS_HEARTBEAT = values.IntegerValue(15)  # seconds, keeps proxies from closing idle streams
+
+    INGEST_NODE_TTL = values.IntegerValue(10)  # seconds without a heartbeat before a node is skipped
+    INGEST_BALANCE_FACTOR = values.FloatValue(1.25)  # max node load relative to the average
+    INGEST_NODE_MAX_CPU = values.FloatValue(0.9)
+    INGEST_VIRTUAL_NODES = values.IntegerValue(64)
+    RTMP_STAT_INTERVAL = values.FloatValue(2.0)  # seconds between /stat polls of the ingest nodes
+    RTMP_STAT_WORKERS = values.IntegerValue(16)  # nodes polled concurrently
+    # months of monthly partitions kept, older ones are dropped whole
+    STREAM_SESSION_RETENTION_MONTHS = values.IntegerValue(13)
+    STREAM_USAGE_MINUTE_RETENTION_MONTHS = values.IntegerValue(3)  # hourly and daily rollups are kept
+
+    HLS_PATH = values.Value('/tmp/hls')  # nginx-rtmp hls_path, shared with the rtmp container
+    HLS_HOT_SEGMENTS = values.IntegerValue(3)  # segments per stream kept in memory
+    # hls_variant suffixes of rendition streams, only needed where nginx-rtmp writes no master playlist
+    HLS_VARIANT_SUFFIXES = values.ListValue([])
+    # internal nginx location, when set segments are handed to nginx with X-Accel-Redirect
+    HLS_SEGMENT_ACCEL_REDIRECT = values.Value('')
+    HLS_VIEWER_CACHE_SIZE = values.IntegerValue(10000)
+    HLS_VIEWER_CACHE_TTL = values.IntegerValue(30)
+    # segments are hard-linked here, keep it on the filesystem of HLS_PATH
+    HLS_ARCHIVE_PATH = values.Value('/data/archive')
+    HLS_ARCHIVE_ACCEL_REDIRECT = values.Value('')
+    # bytes, 0 - unlimited; hourly buckets are evicted least recently accessed first
+    HLS_ARCHIVE_QUOTA = values.IntegerValue(0)
+    HLS_ARCHIVE_STREAM_QUOTA = values.IntegerValue(0)
+    HLS_ARCHIVE_EVICT_INTERVAL = values.FloatValue(30.0)  # seconds
+    HLS_ARCHIVE_EVICT_MIN_IDLE = values.IntegerValue(15 * 60)  # seconds since the last access of an evicted bucket
+    HLS_DVR_MAX_WINDOW = values.IntegerValue(24 * 60 * 60)  # seconds
+    HLS_PLAYBACK_TOKEN_TTL = values.IntegerValue(120)  # seconds, signed with the STREAM_KEY secrets
+    HLS_PLAYBACK_TOKEN_CACHE_SIZE = values.IntegerValue(100000)
+    HLS_HEALTH_WINDOW = values.IntegerValue(30)  # segments per stream
+    HLS_HEALTH_STALL_FACTOR = values.FloatValue(3.0)  # mean segment durations without a new segment
+    HLS_HEALTH_FORGET_AFTER = values.IntegerValue(600)  # seconds
+    HLS_HEALTH_INTERVAL = values.FloatValue(2.0)  # seconds between redis snapshots
+    HLS_ACCESS_LOG_PATH = values.Value('/data/logs/hls_delivery.log')
+    HLS_DELIVERY_COUNTERS_TTL = values.IntegerValue(2 * 24 * 3600)  # unique viewer windows reach this far back
+    HLS_DELIVERY_RETENTION_MONTHS = values.IntegerValue(6)
 
     # CELERY_LOGGING = {
     #     'version': 1,  # noqa: allowed straight assignment
@@ -257,6 +319,9 @@ class Base(Configuration):
                 'OPTIONS': {  # noqa: static object
                     'CLIENT_CLASS': 'django_redis.client.DefaultClient',
                     'CONNECTION_POOL_KWARGS': {'max_connections': 20, 'health_check_interval': 30},
+                    'SOCKET_CONNECT_TIMEOUT': 0.5,
+                    'SOCKET_TIMEOUT': 0.5,
+                    'IGNORE_EXCEPTIONS': True,
                 },
             },
         }
@@ -294,3 +359,29 @@ class Base(Configuration):
     CELERY_RESULT_EXPIRES = values.Value(None)
     CELERY_TASK_ALWAYS_EAGER = values.BooleanValue(False)
     CELERY_CACHE_BACKEND = values.Value('default')
+    CELERY_BEAT_SCHEDULE = {
+        'stream-session-flush': {
+            'task': 'apps.stream.tasks.stream_session__flush_task',
+            'schedule': 10.0,
+        },
+        'hls-delivery-flush': {
+            'task': 'apps.hls.tasks.delivery__flush_task',
+            'schedule': 60.0,
+        },
+        'stream-usage-rollup': {
+            'task': 'apps.stream.tasks.stream_usage__rollup_task',
+            'schedule': 60.0,
+        },
+        'stream-partitions-maintain': {
+            'task': 'apps.stream.tasks.stream_partitions__maintain_task',
+            'schedule': 6 * 3600.0,
+        },
+        'hls-delivery-partitions-maintain': {
+            'task': 'apps.hls.tasks.delivery_partitions__maintain_task',
+            'schedule': 6 * 3600.0,
+        },
+        'widget-fragments-collect': {
+            'task': 'apps.widget_settings.tasks.widget_fragment__collect_task',
+            'schedule': 6 * 3600.0,
+        },
+    }
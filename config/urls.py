@@ -2,12 +2,15 @@ from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 from config.routers import router
+from apps.user.api.async_views import login_view, registration_view
 from django.conf.urls.static import static
 
 from config.yasg import schema_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('api/async/users/login/', login_view, name='async-login'),
+    path('api/async/users/registration/', registration_view, name='async-registration'),
     path('api/', include(router.urls)),
     path('docs/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),]
 
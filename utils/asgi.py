@@ -0,0 +1,249 @@
+import asyncio
+import json
+import os
+import re
+import typing
+from urllib.parse import parse_qsl
+
+ASGIApp = typing.Callable[..., typing.Awaitable[None]]
+Handler = typing.Callable[..., typing.Awaitable['Response']]
+
+
+class Request:
+    """
+    Minimal request wrapper for the lean ASGI endpoints,
+    which intentionally bypass the Django middleware stack.
+    """
+
+    __slots__ = ('scope', 'body', '_query', '_headers')
+
+    def __init__(self, scope: dict, body: bytes = b'') -> None:
+        self.scope = scope
+        self.body = body
+        self._query: dict[str, str] | None = None
+        self._headers: dict[str, str] | None = None
+
+    @property
+    def method(self) -> str:
+        return self.scope['method']
+
+    @property
+    def path(self) -> str:
+        return self.scope['path']
+
+    @property
+    def query(self) -> dict[str, str]:
+        if self._query is None:
+            self._query = dict(parse_qsl(self.scope.get('query_string', b'').decode('latin-1')))
+        return self._query
+
+    @property
+    def headers(self) -> dict[str, str]:
+        if self._headers is None:
+            self._headers = {
+                name.decode('latin-1'): value.decode('latin-1')
+                for name, value in self.scope.get('headers', ())
+            }
+        return self._headers
+
+    def form(self) -> dict[str, str]:
+        return dict(parse_qsl(self.body.decode('latin-1')))
+
+    def json(self) -> typing.Any:
+        return json.loads(self.body or b'null')
+
+
+class Response:
+    __slots__ = ('status', 'body', 'headers')
+
+    def __init__(
+            self,
+            status: int = 200,
+            body: bytes = b'',
+            headers: typing.Iterable[tuple[str, str]] = (),
+            content_type: str | None = None,
+    ) -> None:
+        self.status = status
+        self.body = body
+        self.headers = [(name.encode('latin-1'), value.encode('latin-1')) for name, value in headers]
+        if content_type is not None:
+            self.headers.append((b'content-type', content_type.encode('latin-1')))
+
+    async def __call__(self, send: typing.Callable, receive: typing.Callable | None = None) -> None:
+        await send({
+            'type': 'http.response.start',
+            'status': self.status,
+            'headers': self.headers + [(b'content-length', str(len(self.body)).encode())],
+        })
+        await send({'type': 'http.response.body', 'body': self.body})
+
+
+class FileResponse(Response):
+    """
+    Sends a file with the ASGI `http.response.zerocopysend` extension (sendfile) when the server offers it,
+    otherwise reads it off the event loop.
+    """
+
+    __slots__ = ('path', 'zerocopy')
+
+    def __init__(
+            self,
+            path: str,
+            *,
+            zerocopy: bool = False,
+            headers: typing.Iterable[tuple[str, str]] = (),
+            content_type: str | None = None,
+    ) -> None:
+        super().__init__(status=200, headers=headers, content_type=content_type)
+        self.path = path
+        self.zerocopy = zerocopy
+
+    async def __call__(self, send: typing.Callable, receive: typing.Callable | None = None) -> None:
+        if not self.zerocopy:
+            self.body = await asyncio.to_thread(_read_file, self.path)
+            await super().__call__(send)
+            return
+        with open(self.path, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            await send({
+                'type': 'http.response.start',
+                'status': self.status,
+                'headers': self.headers + [(b'content-length', str(size).encode())],
+            })
+            await send({'type': 'http.response.zerocopysend', 'file': file, 'count': size})
+
+
+class EventStreamResponse(Response):
+    """
+    Server-sent events: chunks of the async iterator are sent as they come until it ends or the
+    client goes away. A disconnect is noticed at the next chunk, so idle streams need heartbeats.
+    """
+
+    __slots__ = ('events',)
+
+    def __init__(
+            self,
+            events: typing.AsyncGenerator[bytes, None],
+            *,
+            headers: typing.Iterable[tuple[str, str]] = (),
+    ) -> None:
+        super().__init__(
+            status=200,
+            headers=[
+                *headers,
+                ('cache-control', 'no-cache'),
+                # nginx would otherwise buffer the stream
+                ('x-accel-buffering', 'no'),
+            ],
+            content_type='text/event-stream',
+        )
+        self.events = events
+
+    async def __call__(self, send: typing.Callable, receive: typing.Callable | None = None) -> None:
+        await send({'type': 'http.response.start', 'status': self.status, 'headers': self.headers})
+        disconnected = asyncio.ensure_future(_wait_disconnect(receive)) if receive is not None else None
+        try:
+            async for chunk in self.events:
+                if disconnected is not None and disconnected.done():
+                    break
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            else:
+                await send({'type': 'http.response.body', 'body': b''})
+        finally:
+            if disconnected is not None:
+                disconnected.cancel()
+            await self.events.aclose()
+
+
+async def _wait_disconnect(receive: typing.Callable) -> None:
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, 'rb') as file:
+        return file.read()
+
+
+def json_response(data: typing.Any, status: int = 200) -> Response:
+    return Response(status=status, body=json.dumps(data).encode(), content_type='application/json')
+
+
+async def read_body(receive: typing.Callable) -> bytes:
+    chunks = []
+    more_body = True
+    while more_body:
+        message = await receive()
+        chunks.append(message.get('body', b''))
+        more_body = message.get('more_body', False)
+    return b''.join(chunks)
+
+
+class Router:
+    """Dispatches http requests to `async def handler(request, **path_params) -> Response`."""
+
+    def __init__(self, routes: typing.Iterable[tuple[str, str, Handler]]) -> None:
+        self.routes = [
+            (method, re.compile(pattern), handler) for method, pattern, handler in routes
+        ]
+
+    async def __call__(self, scope: dict, receive: typing.Callable, send: typing.Callable) -> None:
+        method = scope['method']
+        path_matched = False
+        for route_method, pattern, handler in self.routes:
+            match = pattern.fullmatch(scope['path'])
+            if match is None:
+                continue
+            path_matched = True
+            if route_method != method:
+                continue
+            body = await read_body(receive) if method in ('POST', 'PUT', 'PATCH') else b''
+            response = await handler(Request(scope, body), **match.groupdict())
+            await response(send, receive)
+            return
+        await Response(status=405 if path_matched else 404)(send)
+
+
+class PathPrefixDispatcher:
+    """
+    Mounts lean ASGI apps on path prefixes in front of the Django application.
+    Handles the lifespan protocol itself, since Django's ASGI handler does not.
+    """
+
+    def __init__(
+            self,
+            *,
+            default: ASGIApp,
+            routes: dict[str, ASGIApp],
+            on_startup: typing.Iterable[typing.Callable[[], typing.Awaitable[None]]] = (),
+            on_shutdown: typing.Iterable[typing.Callable[[], typing.Awaitable[None]]] = (),
+    ) -> None:
+        self.default = default
+        self.routes = tuple(routes.items())
+        self.on_startup = list(on_startup)
+        self.on_shutdown = list(on_shutdown)
+
+    async def __call__(self, scope: dict, receive: typing.Callable, send: typing.Callable) -> None:
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if scope['type'] == 'http':
+            path = scope['path']
+            for prefix, app in self.routes:
+                if path.startswith(prefix):
+                    await app(scope, receive, send)
+                    return
+        await self.default(scope, receive, send)
+
+    async def lifespan(self, receive: typing.Callable, send: typing.Callable) -> None:
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                for hook in self.on_startup:
+                    await hook()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                for hook in self.on_shutdown:
+                    await hook()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
@@ -0,0 +1,101 @@
+import threading
+import time
+import typing
+from collections import OrderedDict
+
+from django.core.cache import caches
+
+MISSING = object()
+
+
+class LRUCache:
+    """
+    Bounded in-process LRU cache with per-entry TTL.
+    Thread safe, intended to sit in front of a shared cache tier.
+    """
+
+    def __init__(self, *, max_size: int, ttl: float) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: OrderedDict[typing.Hashable, tuple[float, typing.Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: typing.Hashable, default: typing.Any = None) -> typing.Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: typing.Hashable, value: typing.Any, ttl: float | None = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key: typing.Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class TwoTierCache:
+    """
+    In-process LRU (first tier) in front of a shared django cache alias (second tier).
+    The local tier should use a short TTL: it is only invalidated in the current process.
+    """
+
+    def __init__(
+            self,
+            *,
+            alias: str,
+            prefix: str,
+            max_size: int,
+            local_ttl: float,
+            shared_ttl: int,
+    ) -> None:
+        self.alias = alias
+        self.prefix = prefix
+        self.shared_ttl = shared_ttl
+        self.local = LRUCache(max_size=max_size, ttl=local_ttl)
+
+    @property
+    def shared(self) -> typing.Any:
+        return caches[self.alias]
+
+    def _shared_key(self, key: str) -> str:
+        return f'{self.prefix}:{key}'
+
+    def get_local(self, key: str, default: typing.Any = None) -> typing.Any:
+        return self.local.get(key, default)
+
+    def get(self, key: str, default: typing.Any = None) -> typing.Any:
+        value = self.local.get(key, MISSING)
+        if value is not MISSING:
+            return value
+        value = self.shared.get(self._shared_key(key), MISSING)
+        if value is MISSING:
+            return default
+        self.local.set(key, value)
+        return value
+
+    def set(self, key: str, value: typing.Any) -> None:
+        self.local.set(key, value)
+        self.shared.set(self._shared_key(key), value, timeout=self.shared_ttl)
+
+    def delete(self, key: str) -> None:
+        self.local.delete(key)
+        self.shared.delete(self._shared_key(key))
@@ -11,6 +11,12 @@ class BadRequest(APIException):
     default_code = 'bad_request'
 
 
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = 'Данные были изменены, обновите их и повторите запрос.'
+    default_code = 'precondition_failed'
+
+
 class BusinessLogicException(APIException):
     status_code = status.HTTP_418_IM_A_TEAPOT
     default_detail = 'Что-то пошло не так, обратитесь в поддержку.'
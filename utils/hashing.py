@@ -0,0 +1,77 @@
+import asyncio
+import threading
+import typing
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class PasswordHashingOverloaded(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Сервис перегружен, повторите попытку позже.'
+    default_code = 'password_hashing_overloaded'
+
+
+class HashingExecutor:
+    """
+    Bounded thread pool for password hashing.
+    PBKDF2 (hashlib) releases the GIL, so hashing runs in parallel with request handling.
+    At most max_workers + max_pending calls are in flight: sync callers wait for a slot,
+    async callers are rejected, so the event loop never blocks on a full pool.
+    """
+
+    def __init__(self, *, max_workers: int, max_pending: int) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='password-hashing')
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+
+    def submit(self, fn: typing.Callable, *args: typing.Any, block: bool = True) -> Future:
+        if not self._slots.acquire(blocking=block):
+            raise PasswordHashingOverloaded()
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def run(self, fn: typing.Callable, *args: typing.Any) -> typing.Any:
+        return self.submit(fn, *args).result()
+
+    async def arun(self, fn: typing.Callable, *args: typing.Any) -> typing.Any:
+        return await asyncio.wrap_future(self.submit(fn, *args, block=False))
+
+
+_executor: HashingExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_hashing_executor() -> HashingExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = HashingExecutor(
+                    max_workers=settings.PASSWORD_HASHING_WORKERS,
+                    max_pending=settings.PASSWORD_HASHING_MAX_PENDING,
+                )
+    return _executor
+
+
+def password__make(password: str) -> str:
+    return get_hashing_executor().run(make_password, password)
+
+
+async def password__amake(password: str) -> str:
+    return await get_hashing_executor().arun(make_password, password)
+
+
+def password__check(password: str, encoded: str) -> bool:
+    return get_hashing_executor().run(check_password, password, encoded)
+
+
+async def password__acheck(password: str, encoded: str) -> bool:
+    return await get_hashing_executor().arun(check_password, password, encoded)
@@ -0,0 +1,31 @@
+from django.db.models import JSONField, Lookup
+
+
+class JsonPathMatch(Lookup):
+    """
+    `field__jsonpath_match='$.width > 800'`, the jsonb @@ operator: true when the jsonpath
+    predicate holds. A GIN index with jsonb_path_ops narrows the equality parts of it.
+    """
+
+    lookup_name = 'jsonpath_match'
+    prepare_rhs = False
+
+    def as_sql(self, compiler, connection):  # noqa: ANN001, ANN201 - Lookup interface
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} @@ {rhs}::jsonpath', [*lhs_params, *rhs_params]
+
+
+class JsonPathExists(JsonPathMatch):
+    """`field__jsonpath_exists='$.avatar ? (@ == true)'`, the jsonb @? operator: true when the path yields an item."""
+
+    lookup_name = 'jsonpath_exists'
+
+    def as_sql(self, compiler, connection):  # noqa: ANN001, ANN201 - Lookup interface
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} @? {rhs}::jsonpath', [*lhs_params, *rhs_params]
+
+
+JSONField.register_lookup(JsonPathMatch)
+JSONField.register_lookup(JsonPathExists)
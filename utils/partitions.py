@@ -0,0 +1,96 @@
+import datetime
+import re
+
+from django.db import connection, transaction
+
+PARTITION_SUFFIX_PATTERN = re.compile(r'_p(\d{4})(\d{2})$')
+
+# partitions known to exist, CREATE TABLE IF NOT EXISTS still takes a lock on the parent
+_known_partitions: set[str] = set()
+
+
+def partition__month(value: datetime.datetime | datetime.date) -> datetime.datetime:
+    """First instant of the UTC month, partitions are bounded by them."""
+    if isinstance(value, datetime.datetime) and value.tzinfo is not None:
+        value = value.astimezone(datetime.timezone.utc)
+    return datetime.datetime(value.year, value.month, 1, tzinfo=datetime.timezone.utc)
+
+
+def partition__next_month(month: datetime.datetime) -> datetime.datetime:
+    return (month + datetime.timedelta(days=32)).replace(day=1)
+
+
+def partition__name(*, table: str, month: datetime.datetime) -> str:
+    return f'{table}_p{month:%Y%m}'
+
+
+def partition__ensure(*, table: str, month: datetime.datetime) -> str:
+    """Monthly range partition of a table partitioned by a timestamp, created on first use."""
+    month = partition__month(month)
+    name = partition__name(table=table, month=month)
+    if name in _known_partitions:
+        return name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" FOR VALUES FROM (%s) TO (%s)',
+            [month, partition__next_month(month)],
+        )
+    _known_partitions.add(name)
+    return name
+
+
+def partition__ensure_range(*, table: str, started_from: datetime.datetime, started_to: datetime.datetime) -> None:
+    month = partition__month(started_from)
+    while month <= started_to:
+        partition__ensure(table=table, month=month)
+        month = partition__next_month(month)
+
+
+def partition__list(*, table: str) -> list[tuple[str, datetime.datetime]]:
+    """(partition, month) of the monthly partitions of a table, oldest first."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT child.relname FROM pg_inherits'
+            ' JOIN pg_class parent ON parent.oid = pg_inherits.inhparent'
+            ' JOIN pg_class child ON child.oid = pg_inherits.inhrelid'
+            ' WHERE parent.relname = %s',
+            [table],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    partitions = []
+    for name in names:
+        match = PARTITION_SUFFIX_PATTERN.search(name)
+        if match is not None:
+            month = datetime.datetime(int(match[1]), int(match[2]), 1, tzinfo=datetime.timezone.utc)
+            partitions.append((name, month))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def partition__drop_before(*, table: str, month: datetime.datetime) -> list[str]:
+    """
+    Drops whole monthly partitions ending before the month: a metadata change
+    instead of a DELETE that rewrites indexes and leaves the table to vacuum.
+    """
+    dropped = []
+    for name, partition_month in partition__list(table=table):
+        if partition_month >= partition__month(month):
+            break
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"')
+            cursor.execute(f'DROP TABLE "{name}"')
+        _known_partitions.discard(name)
+        dropped.append(name)
+    return dropped
+
+
+def partition__maintain(*, table: str, retention_months: int, ahead_months: int = 2) -> list[str]:
+    """Creates the partitions of the coming months and drops those past retention, returns the dropped ones."""
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
+    month = partition__month(now)
+    for _ in range(ahead_months + 1):
+        partition__ensure(table=table, month=month)
+        month = partition__next_month(month)
+    oldest = partition__month(now)
+    for _ in range(retention_months):
+        oldest = partition__month(oldest - datetime.timedelta(days=1))
+    return partition__drop_before(table=table, month=oldest)
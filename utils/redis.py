@@ -0,0 +1,120 @@
+import threading
+import time
+import typing
+
+import structlog
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+
+logger = structlog.get_logger(__name__)
+
+
+class PushedHashTable:
+    """
+    In-memory mirror of a redis hash, of integers unless other codecs are given.
+    Loaded once with HGETALL and then kept fresh by updates pushed over pub/sub,
+    so reads never leave the process. The optional loader is the source of truth:
+    its values are merged over the hash on every load and written back, so a flushed
+    hash or a lost update is repaired. When redis is unavailable the loader alone is
+    used and the load is retried later.
+    Keys must not contain ':', it separates key and value in update messages.
+    """
+
+    retry_interval = 5
+
+    def __init__(
+            self,
+            *,
+            name: str,
+            alias: str = 'redis',
+            loader: typing.Callable[[], dict[typing.Any, typing.Any]] | None = None,
+            decode_key: typing.Callable[[str], typing.Any] = int,
+            decode_value: typing.Callable[[str], typing.Any] = int,
+            encode_value: typing.Callable[[typing.Any], str] = str,
+    ) -> None:
+        self.name = name
+        self.channel = f'{name}:updates'
+        self.alias = alias
+        self.loader = loader
+        self.decode_key = decode_key
+        self.decode_value = decode_value
+        self.encode_value = encode_value
+        self._data: dict[typing.Any, typing.Any] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._retry_at = 0.0
+        self._listener: typing.Any = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded and (self._listener is not None or time.monotonic() < self._retry_at)
+
+    def get(self, key: typing.Any, default: typing.Any = 0) -> typing.Any:
+        if not self.loaded:
+            self.load()
+        return self._data.get(key, default)
+
+    def items(self) -> list[tuple[typing.Any, typing.Any]]:
+        if not self.loaded:
+            self.load()
+        return list(self._data.items())
+
+    def set(self, key: typing.Any, value: typing.Any) -> None:
+        self._data[key] = value
+        encoded = self.encode_value(value)
+        try:
+            connection = get_redis_connection(self.alias)
+            pipeline = connection.pipeline()
+            pipeline.hset(self.name, key, encoded)
+            pipeline.publish(self.channel, f'{key}:{encoded}')
+            pipeline.execute()
+        except RedisError:
+            # the hash and the other processes missed the update, reload from the loader, which writes it back
+            logger.warning('pushed_hash_table.publish_failed', name=self.name, key=key)
+            self._loaded = False
+
+    def load(self) -> None:
+        with self._lock:
+            if self.loaded:
+                return
+            self._stop_listener()
+            try:
+                connection = get_redis_connection(self.alias)
+                # subscribe first, so updates racing with HGETALL are not lost
+                pubsub = connection.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(**{self.channel: self._on_message})
+                data = {
+                    self.decode_key(key.decode()): self.decode_value(value.decode())
+                    for key, value in connection.hgetall(self.name).items()
+                }
+                if self.loader is not None:
+                    loaded = self.loader()
+                    data.update(loaded)
+                    if loaded:
+                        connection.hset(
+                            self.name, mapping={key: self.encode_value(value) for key, value in loaded.items()}
+                        )
+                self._listener = pubsub.run_in_thread(
+                    sleep_time=1, daemon=True, exception_handler=self._on_listener_error
+                )
+            except RedisError:
+                logger.warning('pushed_hash_table.load_failed', name=self.name)
+                data = self.loader() if self.loader is not None else dict(self._data)
+                self._retry_at = time.monotonic() + self.retry_interval
+            self._data = data
+            self._loaded = True
+
+    def _on_message(self, message: dict) -> None:
+        key, _, value = message['data'].decode().partition(':')
+        self._data[self.decode_key(key)] = self.decode_value(value)
+
+    def _on_listener_error(self, error: Exception, pubsub: typing.Any, thread: typing.Any) -> None:
+        logger.warning('pushed_hash_table.listener_failed', name=self.name, error=str(error))
+        thread.stop()
+        self._listener = None
+        self._loaded = False
+
+    def _stop_listener(self) -> None:
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None